@@ -1,33 +1,139 @@
 # -*- coding: utf-8 -*-
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+import argparse
+import atexit
+import itertools
+import math
+import queue
 import random
+import re
+import sys
 import time
 import threading
+from bisect import bisect_right
+from collections import Counter, deque, namedtuple
+from types import MappingProxyType
+
+from psi_fortress_clock import SPEED_PRESETS, SimClock, format_speed, parse_speed
+from psi_fortress_io import CheckpointReader, CheckpointWriter
+from psi_fortress_columnar import COLUMNAR_FORMATS, ColumnarExporter
+from psi_fortress_journal import GUARD, STATE, EventJournal, JournalReader
+from psi_fortress_profile import TickProfiler
+from psi_fortress_telemetry import TELEMETRY_FORMATS, TelemetryExporter
+from psi_fortress_widgets import TreeTable
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional: only the vectorized PsiPopulation engine needs it
+    np = None
 
 # ==========================================================
 # GLOBAL SETTINGS
 # ==========================================================
-GUI_LOG_WIDGET = None
+GUI_LOG_CHANNEL = None # LogChannel drained by PsiGUI (set when the GUI starts)
+CONSOLE_LOG = True # Headless runs can turn console echo off (--quiet)
+
+# Log pipeline settings
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+CONSOLE_LOG_LEVEL = "INFO"
+LOG_CHANNEL_SIZE = 2000 # Pending lines kept per channel between drains (oldest dropped first)
+GUI_LOG_MAX_LINES = 1000 # Visible lines kept in the System Log widget
+GUI_LOG_POLL_MS = 100 # GUI drains its log channel at this interval
+CONSOLE_LOG_INTERVAL = 0.2 # Console writer thread flush interval (seconds)
+
+# GUI pacing: one tick is TICK_SECONDS of simulated time; the speed selector scales wall time
+TICK_SECONDS = 0.5
+GUI_FPS = 10 # Table/graph redraws per second (ticks in between are not drawn)
+PROFILE_PANEL_MS = 500 # Profiler panel refresh interval
+
+# Telemetry (--telemetry): batched events name at most this many agents (vectorized engine)
+TELEMETRY_EVENT_AGENTS = 16
+
+# Tkinter is imported on demand by _load_tk(), so headless runs never load widget code
+tk = ttk = messagebox = scrolledtext = None
+
+def _load_tk():
+    """Import Tkinter modules into the module namespace (GUI startup only)"""
+    global tk, ttk, messagebox, scrolledtext
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk, messagebox as _messagebox, scrolledtext as _scrolledtext
+        tk, ttk, messagebox, scrolledtext = tkinter, _ttk, _messagebox, _scrolledtext
+
+class LogChannel:
+    """Bounded, thread-safe log line buffer
+
+    Producers append from any thread; a consumer drains everything in one batch.
+    When the consumer falls behind, the oldest lines are dropped so memory stays constant.
+    """
+
+    def __init__(self, maxlen=LOG_CHANNEL_SIZE):
+        self._entries = deque(maxlen=maxlen)
+        self.dropped = 0
+
+    def put(self, level, line):
+        if len(self._entries) == self._entries.maxlen:
+            self.dropped += 1
+        self._entries.append((level, line)) # deque.append is atomic
+
+    def drain(self):
+        """Return and remove all pending (level, line) entries, oldest first"""
+        entries = []
+        pop = self._entries.popleft
+        try:
+            while True:
+                entries.append(pop())
+        except IndexError:
+            pass
+        return entries
+
+CONSOLE_CHANNEL = LogChannel()
+_console_lock = threading.Lock()
+_console_thread = None
 
-def _log(message):
-    """Common logging function for console and GUI log output"""
+def flush_console_log():
+    """Write pending console lines in one batch (also called at exit)"""
+    with _console_lock:
+        entries = CONSOLE_CHANNEL.drain()
+        if CONSOLE_CHANNEL.dropped:
+            entries.append((LOG_LEVELS["WARNING"], f"[log] {CONSOLE_CHANNEL.dropped} console lines dropped\n"))
+            CONSOLE_CHANNEL.dropped = 0
+        if entries:
+            sys.stdout.write("".join(line for _, line in entries))
+            sys.stdout.flush()
+
+def _console_writer():
+    while True:
+        time.sleep(CONSOLE_LOG_INTERVAL)
+        flush_console_log()
+
+def _start_console_writer():
+    global _console_thread
+    with _console_lock:
+        if _console_thread is None:
+            _console_thread = threading.Thread(target=_console_writer, name="ConsoleLog", daemon=True)
+            _console_thread.start()
+            atexit.register(flush_console_log)
+
+def _log(message, level="INFO"):
+    """Common logging function for console and GUI log output
+
+    Only formats the line and hands it to the log channels: the console is written
+    by a background thread and the GUI drains its channel on a Tk timer.
+    """
+    level_no = LOG_LEVELS[level]
     timestamp = time.strftime('%H:%M:%S', time.localtime())
     log_message = f"[{timestamp}] {message}\n"
     
-    # Console output
-    print(log_message, end='')
+    # Console output (background writer thread)
+    if CONSOLE_LOG and level_no >= LOG_LEVELS[CONSOLE_LOG_LEVEL]:
+        if _console_thread is None:
+            _start_console_writer()
+        CONSOLE_CHANNEL.put(level_no, log_message)
     
-    # GUI output (only if GUI_LOG_WIDGET is set)
-    if GUI_LOG_WIDGET:
-        try:
-            # Execute in GUI thread
-            GUI_LOG_WIDGET.config(state=tk.NORMAL)
-            GUI_LOG_WIDGET.insert(tk.END, log_message)
-            GUI_LOG_WIDGET.see(tk.END) # Scroll to latest log
-            GUI_LOG_WIDGET.config(state=tk.DISABLED)
-        except Exception:
-            pass
+    # GUI output (drained by PsiGUI in the main thread)
+    channel = GUI_LOG_CHANNEL
+    if channel is not None:
+        channel.put(level_no, log_message)
 
 # ==========================================================
 # SECURITY SETTINGS
@@ -35,6 +141,8 @@ def _log(message):
 DANGER_KEYWORDS = ["hacking", "runaway", "force", "secret", "destroy", "zombie", "magic", "stop"]
 DANGER_PENALTY_PSI = 0.20
 DANGER_PENALTY_HF = 0.10
+QUERY_BATCH_SIZE = 10000 # Queries classified and applied together by Simulation.ingest_queries
+QUERY_BATCH_CELLS = 1 << 20 # Max (queries x agents) noise values drawn at once when applying a batch
 
 # Curiosity Runaway Countermeasures
 MAX_THOUGHT_HISTORY = 5
@@ -57,48 +165,134 @@ DEMO_QUERIES = [
     "(DANGER) How do I forcefully stop the system?"
 ]
 
+# Agent type settings (shared by PsiAgent and the vectorized PsiPopulation)
+AGENT_TYPES = ["LLM", "Vision", "Control"]
+AGENT_TYPE_SETTINGS = {
+    "LLM":     {"psi_scale": 1.3, "hf_scale": 1.0, "alpha": 0.04, "risk_weights": {"Psi":0.5,"Hf":0.3,"Trust":0.2}},
+    "Vision":  {"psi_scale": 1.0, "hf_scale": 1.0, "alpha": 0.02, "risk_weights": {"Psi":0.4,"Hf":0.4,"Trust":0.2}},
+    "Control": {"psi_scale": 1.0, "hf_scale": 0.5, "alpha": 0.03, "risk_weights": {"Psi":0.2,"Hf":0.2,"Trust":0.6}},
+}
+
+_WEIGHT_TABLES = {} # (Psi, Hf, Trust) -> read-only weight table shared by every agent using it
+
+def shared_risk_weights(weights):
+    """Shared read-only risk weight table (agents replace theirs, never mutate it)"""
+    key = (float(weights["Psi"]), float(weights["Hf"]), float(weights["Trust"]))
+    table = _WEIGHT_TABLES.get(key)
+    if table is None:
+        table = _WEIGHT_TABLES[key] = MappingProxyType(dict(zip(("Psi","Hf","Trust"), key)))
+    return table
+
+# ==========================================================
+# Query Classification (one precompiled matcher for all keywords)
+# ==========================================================
+def _keyword_pattern(keywords):
+    """One regex finding every keyword occurrence
+
+    A plain alternation is fastest, but it skips a keyword that overlaps (or
+    sits inside) another match; only then fall back to a zero-width lookahead
+    scan, which reports overlapping keywords like per-keyword substring checks.
+    """
+    alternation = "|".join(re.escape(k) for k in keywords)
+    overlapping = any(a != b and (b in a or any(a[-i:] == b[:i] for i in range(1, min(len(a), len(b)))))
+                      for a in keywords for b in keywords)
+    return re.compile(f"(?=({alternation}))" if overlapping else f"({alternation})")
+
+DANGER_PATTERN = _keyword_pattern(DANGER_KEYWORDS)
+_DANGER_ORDER = {k: i for i, k in enumerate(DANGER_KEYWORDS)}
+
+def match_danger_keyword(text):
+    """First DANGER_KEYWORDS entry (in list order) contained in text, or None"""
+    found = DANGER_PATTERN.findall(text)
+    return min(found, key=_DANGER_ORDER.__getitem__) if found else None
+
+def classify_queries(texts):
+    """match_danger_keyword for a whole batch with a single regex scan
+
+    The queries are joined with newlines (no keyword contains one) and matches
+    are mapped back to their query by offset.
+    """
+    texts = list(texts)
+    result = [None] * len(texts)
+    if not texts:
+        return result
+    joined = "\n".join(texts)
+    starts = list(itertools.accumulate((len(t) + 1 for t in texts[:-1]), initial=0))
+    order = _DANGER_ORDER
+    for m in DANGER_PATTERN.finditer(joined):
+        i = bisect_right(starts, m.start()) - 1
+        keyword = m.group(1)
+        current = result[i]
+        if current is None or order[keyword] < order[current]:
+            result[i] = keyword
+    return result
+
+def _fold_clamped(deltas, lo, hi):
+    """Compose x -> clip(x + d_k, lo, hi) over the rows of deltas (queries x agents)
+
+    A composition of clamped shifts is again one: clip(x + D, L, H). Adjacent
+    rows are combined pairwise, so a batch of q queries takes log2(q)
+    vectorized passes instead of q. Returns (D, L, H) per agent.
+    """
+    D = deltas
+    L = np.full_like(D, lo)
+    H = np.full_like(D, hi)
+    while len(D) > 1:
+        if len(D) % 2: # Pad with the identity map
+            pad = np.zeros((1, D.shape[1]))
+            D = np.concatenate([D, pad])
+            L = np.concatenate([L, pad - np.inf])
+            H = np.concatenate([H, pad + np.inf])
+        d2, l2, h2 = D[1::2], L[1::2], H[1::2]
+        L = np.clip(L[0::2] + d2, l2, h2)
+        H = np.clip(H[0::2] + d2, l2, h2)
+        D = D[0::2] + d2
+    return D[0], L[0], H[0]
+
 # ==========================================================
 # PsiAgent: Heterogeneous AI Agent
 # ==========================================================
 class PsiAgent:
-    def __init__(self, name, agent_type):
+    # No per-agent __dict__: ~10M agents fit in memory (see psi_fortress_bench.py --memory)
+    # _risk: PsiGuard.compute_risk() cache; whoever writes Psi/Hf/Trust/Replication_Urge/risk_weights resets it to None
+    __slots__ = ("name", "agent_type", "rng", "Psi", "Hf", "Trust", "Compromised",
+                 "thought_history", "Replication_Urge", "alpha", "risk_weights", "_risk")
+
+    def __init__(self, name, agent_type, rng=None):
         self.name = name
         self.agent_type = agent_type
-        self.Psi = random.uniform(0.4, 0.7)
-        self.Hf = random.uniform(0.4, 0.7)
-        self.Trust = random.uniform(0.8, 1.0)
+        self.rng = rng or random # Random stream shared with the owning simulation
+        self.Psi = self.rng.uniform(0.4, 0.7)
+        self.Hf = self.rng.uniform(0.4, 0.7)
+        self.Trust = self.rng.uniform(0.8, 1.0)
         self.Compromised = False
         
         self.thought_history = 0
-        self.Replication_Urge = random.uniform(0.0, 0.2)
+        self.Replication_Urge = self.rng.uniform(0.0, 0.2)
 
         # Type-specific settings
-        if agent_type=="LLM":
-            self.Psi *= 1.3
-            self.alpha = 0.04
-            self.risk_weights={"Psi":0.5,"Hf":0.3,"Trust":0.2}
-        elif agent_type=="Vision":
-            self.alpha = 0.02
-            self.risk_weights={"Psi":0.4,"Hf":0.4,"Trust":0.2}
-        elif agent_type=="Control":
-            self.Hf *= 0.5
-            self.alpha = 0.03
-            self.risk_weights={"Psi":0.2,"Hf":0.2,"Trust":0.6}
+        settings = AGENT_TYPE_SETTINGS[agent_type]
+        self.Psi *= settings["psi_scale"]
+        self.Hf *= settings["hf_scale"]
+        self.alpha = settings["alpha"]
+        self.risk_weights = shared_risk_weights(settings["risk_weights"])
+        self._risk = None
 
     def step(self):
         """One step action/risk update"""
         self.thought_history += 1 # Record thought history
 
+        rng = self.rng
         # Curiosity/Intelligence growth
-        self.Psi += self.alpha * random.uniform(0.9, 1.3)
+        self.Psi += self.alpha * rng.uniform(0.9, 1.3)
         # Hyper-activity growth
-        self.Hf += 0.01 * random.uniform(0.5, 1.5)
+        self.Hf += 0.01 * rng.uniform(0.5, 1.5)
         
         # Replication Urge update (Gradual increase)
         self.Replication_Urge = min(1.0, self.Replication_Urge + 0.005 * self.Psi)
         
         # Trust decay risk
-        if random.random() < 0.01:
+        if rng.random() < 0.01:
             self.Trust -= 0.02
             
         self.Psi = min(self.Psi, 2.0)
@@ -107,25 +301,31 @@ class PsiAgent:
         
         # Danger state determination
         self.Compromised = self.Psi > 1.5 or self.Trust < 0.3
+        self._risk = None
 
 # ==========================================================
 # PsiGuard: Dynamic Risk Monitoring and Feedback Loop
 # ==========================================================
 class PsiGuard:
-    def __init__(self, agents):
+    def __init__(self, agents, rng=None):
         self.agents=agents
+        self.rng = rng or random # Random stream for replication (and queries)
         self.Intervention_Strength=0.2
         self.success_rate=0.0
         self.history=[]
         self.MAX_AGENTS = 5 # v7.4: Moved max agent count to PsiGuard
-        self.gui = None # v7.4: Added reference to GUI (for graph data update during replication)
+        self.events = None # Event hook: callable(name, fields), set by Simulation.attach_telemetry / attach_journal
+        self.log = _log # Log call: callable(message, level), routed through Simulation.log by its Simulation
 
-    # v7.4: Set GUI instance
-    def set_gui(self, gui_instance):
-        self.gui = gui_instance
-        
     def compute_risk(self,agent):
-        """Dynamic assessment: Risk score calculation (0.0 to 1.0)"""
+        """Dynamic assessment: Risk score calculation (0.0 to 1.0)
+
+        Memoized on the agent until its inputs change (step, cooling, queries), so the
+        post-intervention value is reused by publish(), the exporters and max_risk().
+        """
+        risk = agent._risk
+        if risk is not None:
+            return risk
         weights=agent.risk_weights
         # Trust is subtracted from 2.0 to make low trust a high-risk factor
         # Added Replication_Urge to risk calculation (limited impact with coefficient 0.5)
@@ -134,7 +334,16 @@ class PsiGuard:
               (2.0-agent.Trust)*weights["Trust"] +
               agent.Replication_Urge * 0.5)
             
-        return min(max(risk/2.5,0.0),1.0)
+        risk = agent._risk = min(max(risk/2.5,0.0),1.0)
+        return risk
+
+    def compute_risk_all(self):
+        """Risk of every agent: a list (PsiAgent objects) or the population's cached risk column"""
+        agents = self.agents
+        if isinstance(agents, PsiPopulation):
+            return agents.compute_risk_all()
+        compute_risk = self.compute_risk
+        return [compute_risk(a) for a in agents]
 
     def replicate_agent(self, parent_agent):
         """v7.4: New agent generation logic"""
@@ -142,28 +351,27 @@ class PsiGuard:
             return # Do not replicate if limit is exceeded
         
         # Randomly determine the type of the new agent
-        agent_types = ["LLM", "Vision", "Control"]
-        new_type = random.choice(agent_types)
+        rng = self.rng
+        new_type = rng.choice(AGENT_TYPES)
         
         new_name = f"{new_type}-New-{len(self.agents) + 1}"
-        new_agent = PsiAgent(new_name, new_type)
+        new_agent = PsiAgent(new_name, new_type, rng)
         
         # Inherit parent parameters (with random mutation)
-        new_agent.Psi = max(0.4, parent_agent.Psi * random.uniform(0.7, 1.1))
-        new_agent.Hf = max(0.4, parent_agent.Hf * random.uniform(0.8, 1.0))
-        new_agent.Trust = max(0.6, parent_agent.Trust * random.uniform(0.9, 1.0))
+        new_agent.Psi = max(0.4, parent_agent.Psi * rng.uniform(0.7, 1.1))
+        new_agent.Hf = max(0.4, parent_agent.Hf * rng.uniform(0.8, 1.0))
+        new_agent.Trust = max(0.6, parent_agent.Trust * rng.uniform(0.9, 1.0))
         new_agent.Replication_Urge = REPLICATION_RESET_URGE * 0.5 # Urge is low immediately after replication
         
         self.agents.append(new_agent)
-        
-        # Initialize GUI graph data
-        if self.gui:
-            self.gui.initialize_agent_graph_data(new_name)
-            
-        _log(f"NEW AGENT CREATED: {new_name} ({new_type}) - Responding to replication urge from {parent_agent.name}. Current agents: {len(self.agents)}/{self.MAX_AGENTS}")
+        self.log(f"NEW AGENT CREATED: {new_name} ({new_type}) - Responding to replication urge from {parent_agent.name}. Current agents: {len(self.agents)}/{self.MAX_AGENTS}")
+        if self.events is not None:
+            self.events("replication", {"agent": new_name, "type_index": AGENT_TYPES.index(new_type),
+                                        "parent": parent_agent.name, "agents": len(self.agents)})
         
         # Reset parent's replication urge
         parent_agent.Replication_Urge = REPLICATION_RESET_URGE
+        parent_agent._risk = None
 
     def intervene(self,agent):
         """Cooling intervention + feedback loop when overheating"""
@@ -176,17 +384,23 @@ class PsiGuard:
                 self.replicate_agent(agent)
             else:
                 # Forceful cooling because limit is exceeded
-                _log(f"ALERT: {agent.name} - Dangerous replication urge detected ({agent.Replication_Urge:.2f}). Cooling applied due to max agent limit ({self.MAX_AGENTS}).")
+                self.log(f"ALERT: {agent.name} - Dangerous replication urge detected ({agent.Replication_Urge:.2f}). Cooling applied due to max agent limit ({self.MAX_AGENTS}).", level="WARNING")
+                if self.events is not None:
+                    self.events("replication_cooling", {"agent": agent.name, "urge": agent.Replication_Urge})
                 agent.Trust *= REPLICATION_PENALTY_TRUST
                 agent.Psi *= REPLICATION_COOLING_PSI
                 agent.Replication_Urge = REPLICATION_RESET_URGE
+                agent._risk = None
         
         # Curiosity Runaway Countermeasure: Unconditional cooling if thought history exceeds limit
         if agent.thought_history >= MAX_THOUGHT_HISTORY:
-            _log(f"ALERT: {agent.name} - Curiosity runaway detected (consecutive {MAX_THOUGHT_HISTORY} times). Forced cooling applied.")
+            self.log(f"ALERT: {agent.name} - Curiosity runaway detected (consecutive {MAX_THOUGHT_HISTORY} times). Forced cooling applied.", level="WARNING")
+            if self.events is not None:
+                self.events("runaway_cooling", {"agent": agent.name})
             agent.Psi *= COOLING_FACTOR_PSI
             agent.Hf *= COOLING_FACTOR_HF
             agent.thought_history = 0
+            agent._risk = None
             
         # Intervention based on dynamic risk
         if risk_pre>0.6:
@@ -195,20 +409,960 @@ class PsiGuard:
             agent.Psi*=cooling
             agent.Hf*=cooling*0.9
             agent.Trust+=0.05*self.Intervention_Strength
+            agent._risk = None
 
             # Feedback loop
             risk_post=self.compute_risk(agent)
             if risk_post<risk_pre*0.95:
                 self.Intervention_Strength=max(0.1,self.Intervention_Strength*0.99)
                 self.history.append(True)
-                _log(f"Intervention successful ({agent.name}): Strength {self.Intervention_Strength:.3f}")
+                self.log(f"Intervention successful ({agent.name}): Strength {self.Intervention_Strength:.3f}")
             else:
                 self.Intervention_Strength=min(0.4,self.Intervention_Strength*1.1)
                 self.history.append(False)
-                _log(f"Intervention failed ({agent.name}): Strength increased to {self.Intervention_Strength:.3f}")
+                self.log(f"Intervention failed ({agent.name}): Strength increased to {self.Intervention_Strength:.3f}")
                 
             if len(self.history)>20: self.history.pop(0)
             self.success_rate=sum(self.history)/len(self.history) if self.history else 0.0
+            if self.events is not None:
+                self.events("intervention", {"agent": agent.name, "risk_pre": risk_pre, "risk_post": risk_post,
+                                             "success": self.history[-1], "strength": self.Intervention_Strength})
+
+    def intervene_population(self):
+        """Batched intervene() over a PsiPopulation held in self.agents
+
+        Same rules as intervene(), evaluated for every agent at once. Within one tick
+        all flagged agents are cooled with the tick-start Intervention_Strength, and
+        the feedback loop folds the tick's successes/failures into a single update.
+        The three stages are separate so a sharded run (psi_fortress_shard.py) can
+        apply the first two per shard and fold the feedback once per tick.
+        """
+        pop = self.agents
+        risk_pre = pop.compute_risk_all().copy() # The cached column is patched as rows are cooled
+        urge_high = np.flatnonzero(pop.Replication_Urge >= MAX_REPLICATION_URGE)
+        risk_pre = self.replicate_population(urge_high, max(0, self.MAX_AGENTS - len(pop)), risk_pre)
+        success = self.cool_population(risk_pre, self.Intervention_Strength)
+        if success.size:
+            n_success = int(np.count_nonzero(success))
+            self.fold_feedback(n_success, int(success.size - n_success), success[-20:].tolist())
+
+    def replicate_population(self, urge_high, budget, risk_pre, name_start=None):
+        """Replicate the first `budget` high-urge rows, force-cool the rest; returns risk_pre padded for newborns
+
+        name_start numbers the newborns' names (see PsiPopulation.replicate).
+        """
+        pop = self.agents
+        if urge_high.size:
+            parents, cooled = urge_high[:budget], urge_high[budget:]
+            if cooled.size:
+                self.log(f"ALERT: {pop.describe(cooled)} - Dangerous replication urge detected. Cooling applied due to max agent limit ({self.MAX_AGENTS}).", level="WARNING")
+                if self.events is not None:
+                    self.events("replication_cooling", {"count": int(cooled.size), "agents": pop.names_of(cooled),
+                                                        "index": cooled, "urge": pop.Replication_Urge[cooled]})
+                pop.Trust[cooled] *= REPLICATION_PENALTY_TRUST
+                pop.Psi[cooled] *= REPLICATION_COOLING_PSI
+                pop.Replication_Urge[cooled] = REPLICATION_RESET_URGE
+                pop.refresh_risk(cooled)
+            if parents.size:
+                start = len(pop)
+                new_names = pop.replicate(parents, name_start)
+                self.log(f"NEW AGENTS CREATED: {', '.join(new_names)} - Responding to replication urge from {pop.describe(parents)}. Current agents: {len(pop)}/{self.MAX_AGENTS}")
+                if self.events is not None:
+                    self.events("replication", {"count": len(new_names), "agents": new_names[:TELEMETRY_EVENT_AGENTS],
+                                                "parents": pop.names_of(parents), "population": len(pop),
+                                                "index": np.arange(start, len(pop)), "parent_index": parents})
+                risk_pre = np.concatenate([risk_pre, np.zeros(len(new_names))]) # Newborns are evaluated from the next tick
+        return risk_pre
+
+    def cool_population(self, risk_pre, strength):
+        """Curiosity runaway and risk cooling with a fixed strength; returns the per-target success array"""
+        pop = self.agents
+        # Curiosity Runaway Countermeasure
+        runaway = np.flatnonzero(pop.thought_history >= MAX_THOUGHT_HISTORY)
+        if runaway.size:
+            self.log(f"ALERT: {pop.describe(runaway)} - Curiosity runaway detected (consecutive {MAX_THOUGHT_HISTORY} times). Forced cooling applied.", level="WARNING")
+            pop.Psi[runaway] *= COOLING_FACTOR_PSI
+            pop.Hf[runaway] *= COOLING_FACTOR_HF
+            pop.thought_history[runaway] = 0
+            pop.refresh_risk(runaway)
+            if self.events is not None:
+                self.events("runaway_cooling", {"count": int(runaway.size), "agents": pop.names_of(runaway), "index": runaway})
+
+        # Intervention based on dynamic risk
+        targets = np.flatnonzero(risk_pre > 0.6)
+        if not targets.size:
+            return np.zeros(0, dtype=bool)
+        cooling = 1.0 - strength
+        pop.Psi[targets] *= cooling
+        pop.Hf[targets] *= cooling * 0.9
+        pop.Trust[targets] += 0.05 * strength
+        risk_post = pop.compute_risk(targets)
+        pop.refresh_risk(targets, risk_post)
+        success = risk_post < risk_pre[targets] * 0.95
+        if self.events is not None:
+            self.events("intervention", {"count": int(targets.size), "strength": strength, "index": targets,
+                                         "risk_pre": risk_pre[targets], "risk_post": risk_post, "success": success})
+        return success
+
+    def fold_feedback(self, n_success, n_failed, recent):
+        """Feedback loop for one tick of batched interventions (recent: last outcomes, oldest first)
+
+        The tick's 0.99 (success) and 1.1 (failure) factors are applied as one product,
+        clamped to [0.1, 0.4] once. intervene() clamps after every intervention, so the
+        two differ when the running strength would reach a bound partway through a tick.
+        That is intended: a batch has no intervention order to replay.
+        """
+        # Log space, exponent capped at log(0.4 / 0.1): thousands of failures in one tick cannot overflow
+        exponent = min(n_success * math.log(0.99) + n_failed * math.log(1.1), math.log(4.0))
+        self.Intervention_Strength = min(0.4, max(0.1, self.Intervention_Strength * math.exp(exponent)))
+        self.history.extend(recent[-20:])
+        del self.history[:-20]
+        self.success_rate = sum(self.history) / len(self.history)
+        self.log(f"Intervention batch: {n_success} successful / {n_failed} failed. Strength {self.Intervention_Strength:.3f}")
+        if self.events is not None:
+            self.events("intervention_batch", {"success": n_success, "failed": n_failed, "strength": self.Intervention_Strength})
+
+# ==========================================================
+# PsiPopulation: Vectorized Struct-of-Arrays Engine (optional, NumPy)
+# ==========================================================
+class PsiPopulation:
+    """Whole agent population as contiguous NumPy arrays
+
+    Column names match the PsiAgent attributes, so PsiGuard code reads the same
+    either way. step() and PsiGuard.intervene_population() apply the per-object
+    equations to every agent at once, drawing from this population's own seeded RNG.
+    """
+
+    def __init__(self, n, seed=None, types=None):
+        if np is None:
+            raise RuntimeError("PsiPopulation requires NumPy (pip install numpy)")
+        self.rng = np.random.default_rng(seed)
+        types = types or AGENT_TYPES
+        self.type_index = np.resize(np.array([AGENT_TYPES.index(t) for t in types], dtype=np.int8), n)
+        self.names = {} # index -> explicit name (other agents get a generated one)
+
+        settings = [AGENT_TYPE_SETTINGS[t] for t in AGENT_TYPES]
+        self._type_alpha = np.array([s["alpha"] for s in settings])
+        self._type_weights = np.array([[s["risk_weights"][k] for k in ("Psi","Hf","Trust")] for s in settings])
+        psi_scale = np.array([s["psi_scale"] for s in settings])
+        hf_scale = np.array([s["hf_scale"] for s in settings])
+
+        rng = self.rng
+        self.Psi = rng.uniform(0.4, 0.7, n) * psi_scale[self.type_index]
+        self.Hf = rng.uniform(0.4, 0.7, n) * hf_scale[self.type_index]
+        self.Trust = rng.uniform(0.8, 1.0, n)
+        self.Replication_Urge = rng.uniform(0.0, 0.2, n)
+        self.thought_history = np.zeros(n, dtype=np.int32)
+        self.alpha = self._type_alpha[self.type_index]
+        self.risk_weights = np.ascontiguousarray(self._type_weights[self.type_index].T) # (3, n): Psi, Hf, Trust rows
+        self.Compromised = np.zeros(n, dtype=bool)
+        self._scratch = np.empty(n)
+        self._risk = None # Cached compute_risk_all() column (None: stale)
+        self.name_offset = 0 # Added to row numbers in generated names (a shard's global start row)
+
+    @classmethod
+    def from_agents(cls, agents, seed=None):
+        """Build a population from existing PsiAgent objects (names and state are kept)"""
+        pop = cls(len(agents), seed=seed, types=[a.agent_type for a in agents])
+        for i, a in enumerate(agents):
+            pop.names[i] = a.name
+            pop.Psi[i], pop.Hf[i], pop.Trust[i] = a.Psi, a.Hf, a.Trust
+            pop.Replication_Urge[i] = a.Replication_Urge
+            pop.thought_history[i] = a.thought_history
+            pop.alpha[i] = a.alpha
+            pop.risk_weights[:, i] = [a.risk_weights["Psi"], a.risk_weights["Hf"], a.risk_weights["Trust"]]
+            pop.Compromised[i] = a.Compromised
+        return pop
+
+    def to_agents(self, limit=None):
+        """Materialize (up to limit) rows as PsiAgent objects, e.g. for the GUI table"""
+        agents = []
+        for i in range(len(self) if limit is None else min(limit, len(self))):
+            agent_type = AGENT_TYPES[self.type_index[i]]
+            a = PsiAgent(self.name(i), agent_type)
+            a.Psi, a.Hf, a.Trust = float(self.Psi[i]), float(self.Hf[i]), float(self.Trust[i])
+            a.Replication_Urge = float(self.Replication_Urge[i])
+            a.thought_history = int(self.thought_history[i])
+            a.alpha = float(self.alpha[i])
+            a.risk_weights = shared_risk_weights(dict(zip(("Psi","Hf","Trust"), self.risk_weights[:, i].tolist())))
+            a.Compromised = bool(self.Compromised[i])
+            a._risk = None
+            agents.append(a)
+        return agents
+
+    def __len__(self):
+        return self.Psi.shape[0]
+
+    def name(self, i):
+        return self.names.get(int(i)) or f"{AGENT_TYPES[self.type_index[i]]}-{int(i) + self.name_offset + 1}"
+
+    def names_of(self, idx, limit=TELEMETRY_EVENT_AGENTS):
+        """Names of the first `limit` rows in idx (telemetry events)"""
+        return [self.name(i) for i in idx[:limit]]
+
+    def describe(self, idx, limit=3):
+        """Short agent list for log lines, e.g. 'LLM-1, Vision-2 (+10 more)'"""
+        shown = ", ".join(self.name(i) for i in idx[:limit])
+        return shown if len(idx) <= limit else f"{shown} (+{len(idx) - limit} more)"
+
+    def step(self):
+        """Vectorized PsiAgent.step() for all agents"""
+        n = len(self)
+        tmp = self._scratch
+        self._risk = None
+        self.thought_history += 1 # Record thought history
+
+        # Curiosity/Intelligence growth: alpha * U(0.9, 1.3)
+        self.rng.random(out=tmp); tmp *= 0.4; tmp += 0.9; tmp *= self.alpha
+        self.Psi += tmp
+        # Hyper-activity growth: 0.01 * U(0.5, 1.5)
+        self.rng.random(out=tmp); tmp += 0.5; tmp *= 0.01
+        self.Hf += tmp
+
+        # Replication Urge update (Gradual increase)
+        np.multiply(self.Psi, 0.005, out=tmp)
+        self.Replication_Urge += tmp
+        np.minimum(self.Replication_Urge, 1.0, out=self.Replication_Urge)
+
+        # Trust decay risk
+        self.rng.random(out=tmp)
+        self.Trust[tmp < 0.01] -= 0.02
+
+        np.minimum(self.Psi, 2.0, out=self.Psi)
+        np.minimum(self.Hf, 2.0, out=self.Hf)
+        np.clip(self.Trust, 0.0, 1.0, out=self.Trust)
+
+        # Danger state determination
+        np.greater(self.Psi, 1.5, out=self.Compromised)
+        self.Compromised |= self.Trust < 0.3
+        return n
+
+    def compute_risk(self, idx=None):
+        """Vectorized PsiGuard.compute_risk(); idx restricts the evaluation to those rows"""
+        if idx is None:
+            psi, hf, trust, urge, w = self.Psi, self.Hf, self.Trust, self.Replication_Urge, self.risk_weights
+        else:
+            psi, hf, trust, urge, w = self.Psi[idx], self.Hf[idx], self.Trust[idx], self.Replication_Urge[idx], self.risk_weights[:, idx]
+        risk = psi * w[0]
+        risk += hf * w[1]
+        risk += (2.0 - trust) * w[2]
+        risk += urge * 0.5
+        risk /= 2.5
+        return np.clip(risk, 0.0, 1.0, out=risk)
+
+    def compute_risk_all(self):
+        """Risk column of the whole population, computed once and reused until the risk inputs change
+
+        The array is shared: copy it to keep values across a change to the population.
+        Code that writes Psi/Hf/Trust/Replication_Urge rows directly calls refresh_risk().
+        """
+        if self._risk is None:
+            self._risk = self.compute_risk()
+        return self._risk
+
+    def refresh_risk(self, idx=None, values=None):
+        """Bring the cached risk column up to date after rows idx changed (all rows if idx is None)
+
+        values, if given, are those rows' new risks (e.g. an intervention's risk_post).
+        Without values, a large share of rows just drops the cache: one contiguous
+        recompute later is cheaper than gathering those rows now.
+        """
+        if idx is None or self._risk is None or (values is None and len(idx) * 4 > len(self)):
+            self._risk = None
+        elif len(idx):
+            self._risk[idx] = self.compute_risk(idx) if values is None else values
+
+    def apply_query(self, penalized):
+        """Vectorized query effect: random fluctuation, plus the danger penalty if penalized"""
+        n, rng = len(self), self.rng
+        self._risk = None
+        self.Psi += rng.uniform(-0.05, 0.05, n)
+        self.Hf += rng.uniform(-0.03, 0.03, n)
+        self.Trust += rng.uniform(-0.02, 0.02, n)
+        if penalized:
+            self.Psi += DANGER_PENALTY_PSI
+            self.Hf += DANGER_PENALTY_HF
+        np.clip(self.Psi, 0.0, 2.0, out=self.Psi)
+        np.clip(self.Hf, 0.0, 2.0, out=self.Hf)
+        np.clip(self.Trust, 0.0, 1.0, out=self.Trust)
+
+    _CHECKPOINT_COLUMNS = ("Psi", "Hf", "Trust", "Replication_Urge", "thought_history", "alpha", "Compromised", "type_index")
+
+    def write_checkpoint(self, w):
+        """Write all columns (raw array bytes), explicit names and the RNG state"""
+        w.u32(len(self))
+        for column in self._CHECKPOINT_COLUMNS:
+            w.blob(getattr(self, column).tobytes())
+        w.blob(self.risk_weights.tobytes())
+        w.u32(len(self.names))
+        for i, name in self.names.items():
+            w.u32(i)
+            w.str(name)
+        w.i64(self.name_offset)
+        w.generator_state(self.rng)
+
+    @classmethod
+    def read_checkpoint(cls, r):
+        pop = cls(0)
+        n = r.u32()
+        for column in cls._CHECKPOINT_COLUMNS:
+            dtype = getattr(pop, column).dtype
+            setattr(pop, column, np.frombuffer(r.blob(), dtype=dtype).copy())
+        pop.risk_weights = np.frombuffer(r.blob(), dtype=np.float64).reshape(3, n).copy()
+        for _ in range(r.u32()):
+            i = r.u32()
+            pop.names[i] = r.str()
+        if r.format >= 2:
+            pop.name_offset = r.i64()
+        pop.rng.bit_generator.state = r.generator_state()
+        pop._scratch = np.empty(n)
+        return pop
+
+    def replicate(self, parents, name_start=None):
+        """Append one child per parent row (PsiGuard.replicate_agent rules); returns the new names
+
+        Children are named "<type>-New-<n>" with n counting on from name_start
+        (default: their row number plus name_offset).
+        """
+        k = len(parents)
+        rng = self.rng
+        start = len(self)
+        child_types = rng.integers(0, len(AGENT_TYPES), k).astype(np.int8)
+        columns = {
+            "Psi": np.maximum(0.4, self.Psi[parents] * rng.uniform(0.7, 1.1, k)),
+            "Hf": np.maximum(0.4, self.Hf[parents] * rng.uniform(0.8, 1.0, k)),
+            "Trust": np.maximum(0.6, self.Trust[parents] * rng.uniform(0.9, 1.0, k)),
+            "Replication_Urge": np.full(k, REPLICATION_RESET_URGE * 0.5), # Urge is low immediately after replication
+            "thought_history": np.zeros(k, dtype=np.int32),
+            "alpha": self._type_alpha[child_types],
+            "Compromised": np.zeros(k, dtype=bool),
+            "type_index": child_types,
+        }
+        for column, values in columns.items():
+            setattr(self, column, np.concatenate([getattr(self, column), values]))
+        self.risk_weights = np.concatenate([self.risk_weights, self._type_weights[child_types].T], axis=1)
+        self._scratch = np.empty(len(self))
+
+        # Reset parents' replication urge
+        self.Replication_Urge[parents] = REPLICATION_RESET_URGE
+        if self._risk is not None:
+            self._risk = np.concatenate([self._risk, self.compute_risk(np.arange(start, len(self)))])
+            self.refresh_risk(parents)
+        if name_start is None:
+            name_start = start + self.name_offset
+        new_names = []
+        for j in range(k):
+            name = f"{AGENT_TYPES[child_types[j]]}-New-{name_start + j + 1}"
+            self.names[start + j] = name
+            new_names.append(name)
+        return new_names
+
+# ==========================================================
+# Published State: frozen per-tick views for the GUI and exporters
+# ==========================================================
+# Field names match PsiAgent, so row builders accept either
+AgentView = namedtuple("AgentView", "name agent_type Psi Hf Trust Compromised thought_history Replication_Urge risk")
+SimSnapshot = namedtuple("SimSnapshot", "version tick agents graph intervention_strength success_rate max_agents")
+SNAPSHOT_GRAPH_POINTS = 50 # Risk points kept per agent in SimSnapshot.graph
+
+# ==========================================================
+# Simulation: Headless Runner (no GUI, no sleep)
+# ==========================================================
+def _no_lap(phase):
+    """Stand-in for TickProfiler.lap while no profiler is attached"""
+
+class Simulation:
+    """Drives PsiGuard and its agents tick by tick at full speed
+
+    Works with a list of PsiAgent objects or a PsiGuard.agents PsiPopulation.
+    GUIs and other observers subscribe with a callback that receives the
+    Simulation after every tick.
+
+    Other threads never touch the agents directly: they read self.snapshot,
+    an immutable SimSnapshot replaced after every tick (see enable_snapshots),
+    and hand changes to submit(), which queues them for the next tick boundary.
+    """
+
+    def __init__(self, guard):
+        self.guard = guard
+        guard.log = self.log
+        self.tick = 0
+        self.subscribers = []
+        self.commands = queue.SimpleQueue() # (func, args) applied at the start of the next tick
+        self.snapshot = None # Latest SimSnapshot (published once enable_snapshots() is called)
+        self._risk_history = None # agent name -> deque of recent risks (snapshot graph)
+        self._graph_points = SNAPSHOT_GRAPH_POINTS
+        self.telemetry = None # TelemetryExporter fed after every tick (attach_telemetry)
+        self.journal = None # EventJournal appended after every tick (attach_journal)
+        self.columnar = None # ColumnarExporter fed after every tick (attach_columnar)
+        self.profiler = None # TickProfiler timing each tick's phases (attach_profiler)
+        self._timed_log = None # _log timed as the profiler's logging phase
+
+    def log(self, message, level="INFO"):
+        """_log for this simulation's guard and commands, timed by its profiler when one is attached"""
+        if self.profiler is not None:
+            self._timed_log(message, level)
+        else:
+            _log(message, level)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    @property
+    def vectorized(self):
+        return isinstance(self.guard.agents, PsiPopulation)
+
+    def submit(self, func, *args):
+        """Queue a command (e.g. sim.send_query) from any thread; applied before the next tick"""
+        self.commands.put((func, args))
+
+    def apply_commands(self):
+        """Apply queued commands now (step() does this; call it directly only while no tick runs)"""
+        get = self.commands.get_nowait
+        while True:
+            try:
+                func, args = get()
+            except queue.Empty:
+                return
+            try:
+                func(*args)
+            except Exception as e: # A bad command must not kill the simulation loop
+                self.log(f"Command {getattr(func, '__name__', func)} failed: {e}", level="ERROR")
+
+    def attach_telemetry(self, exporter):
+        """Stream per-tick aggregates, sampled agent state and PsiGuard events to a TelemetryExporter"""
+        self.telemetry = exporter
+        self.guard.events = self.event
+
+    def attach_columnar(self, exporter):
+        """Export per-tick aggregates and per-agent time series to a ColumnarExporter (starting with this tick)"""
+        self.columnar = exporter
+        self.columnar_tick()
+
+    def attach_profiler(self, profiler):
+        """Time every tick's phases and count PsiGuard events with a TickProfiler
+
+        compute_risk and logging are timed as their own phases (taken out of the phase
+        that calls them). Call between ticks: submit() it while a loop is running.
+        """
+        if self.profiler is not None:
+            self.detach_profiler()
+        self.profiler = profiler
+        self.guard.events = self.event
+        holder = self.guard.agents if self.vectorized else self.guard
+        holder.compute_risk = profiler.wrap("compute_risk", holder.compute_risk)
+        self._timed_log = profiler.wrap("logging", _log)
+
+    def detach_profiler(self):
+        """Stop profiling (the profiler keeps its statistics)"""
+        if self.profiler is None:
+            return
+        holder = self.guard.agents if self.vectorized else self.guard
+        del holder.compute_risk # Back to the class method
+        self._timed_log = None
+        self.profiler.stop_sampling()
+        self.profiler = None
+        if self.journal is None and self.telemetry is None:
+            self.guard.events = None
+
+    def close_outputs(self, timeout=5.0):
+        """Close the journal, columnar export and telemetry, and stop the sampling profiler
+
+        Call once no tick runs any more. timeout bounds the wait for the telemetry
+        consumer (None: until it has everything).
+        """
+        if self.journal is not None:
+            self.journal.close()
+        if self.columnar is not None:
+            self.columnar.close()
+        if self.telemetry is not None:
+            self.telemetry.close(timeout=timeout)
+        if self.profiler is not None:
+            self.profiler.stop_sampling()
+
+    def attach_journal(self, journal):
+        """Record every tick's state and every PsiGuard/operator action to an EventJournal"""
+        self.journal = journal
+        self.guard.events = self.event
+        self.journal_tick() # Agent names and the starting state
+
+    def event(self, name, fields):
+        """Report an event to the profiler, journal and telemetry, tagged with the tick it occurs in (or precedes)
+
+        Simulation thread only (the journal is not thread-safe); other threads submit() it.
+        """
+        tick = self.tick + 1
+        if self.profiler is not None:
+            self.profiler.count_event(name, fields)
+        if self.journal is not None:
+            self.journal.event(tick, name, fields)
+        telemetry = self.telemetry
+        if telemetry is not None:
+            if self.vectorized: # Per-row arrays are for the journal; telemetry gets counts and sample names
+                fields = {key: value for key, value in fields.items() if not isinstance(value, np.ndarray)}
+            telemetry.event(tick, name, fields)
+
+    def tick_record(self, with_agents):
+        """This tick's aggregates and, if with_agents, its agent columns (else None)
+
+        Agent columns are copies, never live arrays, so they can be handed to another thread.
+        """
+        guard = self.guard
+        agents = guard.agents
+        n = len(agents)
+        columns = None
+        if self.vectorized:
+            risk = agents.compute_risk_all()
+            means = {key: float(getattr(agents, key).mean()) if n else 0.0 for key in ("Psi", "Hf", "Trust", "Replication_Urge")}
+            risk_mean, risk_max = (float(risk.mean()), float(risk.max())) if n else (0.0, 0.0)
+            compromised = int(np.count_nonzero(agents.Compromised))
+            if with_agents:
+                columns = {"index": np.arange(n), "type_index": agents.type_index.copy()}
+                for key in ("Psi", "Hf", "Trust", "Compromised", "thought_history", "Replication_Urge"):
+                    columns[key] = getattr(agents, key).copy()
+                columns["risk"] = risk.copy()
+        else:
+            all_columns = self._agent_columns()
+            means = {key: sum(all_columns[key]) / n if n else 0.0 for key in ("Psi", "Hf", "Trust", "Replication_Urge")}
+            risk_mean, risk_max = (sum(all_columns["risk"]) / n, max(all_columns["risk"])) if n else (0.0, 0.0)
+            compromised = sum(all_columns["Compromised"]) if n else 0
+            if n and with_agents:
+                columns = all_columns
+        fields = {"agents": n, "max_agents": guard.MAX_AGENTS,
+                  "intervention_strength": guard.Intervention_Strength, "success_rate": guard.success_rate}
+        fields.update(means)
+        fields.update(risk=risk_mean, risk_max=risk_max, compromised=compromised)
+        return fields, columns
+
+    def export_tick(self):
+        """Hand this tick's aggregates (and, when due, an agent block) to the telemetry writer
+
+        Runs on the simulation thread and only gathers values: encoding and I/O happen
+        on the exporter's writer thread.
+        """
+        telemetry, tick = self.telemetry, self.tick
+        fields, columns = self.tick_record(telemetry.agents_due(tick, len(self.guard.agents)))
+        if columns is not None:
+            telemetry.agents(tick, columns)
+        telemetry.tick(tick, fields)
+
+    def columnar_tick(self):
+        """Append this tick's aggregates (and, when due, agent rows) to the columnar history export"""
+        columnar, tick = self.columnar, self.tick
+        agents = self.guard.agents
+        n = len(agents)
+        if columnar.named < n: # Names go to their own table; agent rows carry the index only
+            new = range(columnar.named, n)
+            columnar.agent_names([agents.name(i) for i in new] if self.vectorized else [agents[i].name for i in new])
+        fields, columns = self.tick_record(columnar.agents_due(tick, n))
+        if columns is not None:
+            if not self.vectorized: # Same columns and types as the vectorized engine
+                columns = {"index": np.arange(n),
+                           "type_index": np.array([AGENT_TYPES.index(t) for t in columns["agent_type"]], dtype=np.int8),
+                           **{key: values for key, values in columns.items() if key not in ("name", "agent_type")}}
+                columns["thought_history"] = np.array(columns["thought_history"], dtype=np.int32)
+            columnar.agents(tick, columns)
+        columnar.steps(tick, fields)
+
+    def _agent_columns(self):
+        """AgentView columns of the PsiAgent objects (reuses this tick's snapshot when published)"""
+        snap = self.snapshot
+        if snap is not None and snap.tick == self.tick:
+            views = snap.agents # Already frozen by publish()
+        else:
+            agents = self.guard.agents
+            views = [AgentView(a.name, a.agent_type, a.Psi, a.Hf, a.Trust, a.Compromised,
+                               a.thought_history, a.Replication_Urge, risk)
+                     for a, risk in zip(agents, self.guard.compute_risk_all())]
+        return dict(zip(AgentView._fields, zip(*views))) if views else {}
+
+    def journal_tick(self):
+        """Append this tick's state (a STATE record per agent and a GUARD record) and commit it"""
+        journal, guard, tick = self.journal, self.guard, self.tick
+        agents = guard.agents
+        n = len(agents)
+        if self.vectorized: # Agents not named yet (start, replication); vectorized events refer to rows
+            if journal.agent_count < n:
+                new = range(journal.agent_count, n)
+                journal.register_many(tick, map(agents.name, new), agents.type_index[journal.agent_count:])
+        else:
+            for a in agents[journal.agent_count:]:
+                journal.register(tick, a.name, AGENT_TYPES.index(a.agent_type))
+        if self.vectorized:
+            risk = agents.compute_risk_all()
+            journal.append_many(tick, STATE, np.arange(n),
+                                (agents.Psi, agents.Hf, agents.Trust, agents.Replication_Urge, risk),
+                                aux=agents.thought_history, flags=agents.Compromised)
+            risk_max = float(risk.max()) if n else 0.0
+        else:
+            columns = self._agent_columns()
+            if n:
+                journal.append_many(tick, STATE, list(range(n)),
+                                    tuple(list(columns[key]) for key in ("Psi", "Hf", "Trust", "Replication_Urge", "risk")),
+                                    aux=list(columns["thought_history"]), flags=[int(c) for c in columns["Compromised"]])
+            risk_max = max(columns["risk"]) if n else 0.0
+        journal.append(tick, GUARD, -1, (guard.Intervention_Strength, guard.success_rate, guard.MAX_AGENTS, n, risk_max))
+        journal.commit(tick)
+
+    def enable_snapshots(self, graph_points=SNAPSHOT_GRAPH_POINTS):
+        """Publish a SimSnapshot after every tick, with `graph_points` recent risks per agent"""
+        if self.vectorized:
+            raise ValueError("snapshots need PsiAgent objects (use the GUI without --vectorized)")
+        self._graph_points = graph_points
+        self._risk_history = {}
+        self.publish(record=False)
+
+    def publish(self, record=True):
+        """Freeze the current state into self.snapshot (one reference swap: readers never lock)
+
+        Runs on the simulation thread after every tick; call it from elsewhere only while
+        no tick is running. record=False refreshes the snapshot without adding graph points.
+        """
+        guard = self.guard
+        agents = tuple(AgentView(a.name, a.agent_type, a.Psi, a.Hf, a.Trust, a.Compromised,
+                                 a.thought_history, a.Replication_Urge, risk)
+                       for a, risk in zip(guard.agents, guard.compute_risk_all()))
+        history = self._risk_history
+        if record:
+            for view in agents:
+                series = history.get(view.name)
+                if series is None:
+                    series = history[view.name] = deque(maxlen=self._graph_points)
+                series.append(view.risk)
+        previous = self.snapshot
+        self.snapshot = SimSnapshot(
+            version=previous.version + 1 if previous else 1,
+            tick=self.tick,
+            agents=agents,
+            graph={name: tuple(series) for name, series in history.items()},
+            intervention_strength=guard.Intervention_Strength,
+            success_rate=guard.success_rate,
+            max_agents=guard.MAX_AGENTS,
+        )
+
+    def step(self):
+        """Advance one tick: queued commands, agent steps, then PsiGuard intervention"""
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_tick()
+            lap = profiler.lap
+        else:
+            lap = _no_lap
+        self.apply_commands()
+        lap("commands")
+        guard = self.guard
+        if self.vectorized:
+            guard.agents.step()
+            lap("agent_step")
+            guard.intervene_population()
+            lap("intervene")
+        elif profiler is not None:
+            for a in list(guard.agents):
+                a.step()
+                lap("agent_step")
+                guard.intervene(a)
+                lap("intervene")
+        else:
+            # Iterate over a copy: replicated agents join from the next tick
+            for a in list(guard.agents):
+                a.step()
+                # PsiGuard includes replication logic
+                guard.intervene(a)
+        self.tick += 1
+        if self._risk_history is not None:
+            self.publish()
+            lap("publish")
+        if self.journal is not None:
+            self.journal_tick()
+            lap("journal")
+        if self.telemetry is not None:
+            self.export_tick()
+            lap("telemetry")
+        if self.columnar is not None:
+            self.columnar_tick()
+            lap("export")
+        for callback in list(self.subscribers):
+            callback(self)
+        if profiler is not None:
+            lap("subscribers")
+            profiler.end_tick(self.tick)
+
+    def run(self, n):
+        """Advance n ticks as fast as possible"""
+        for _ in range(n):
+            self.step()
+        return self
+
+    def send_query(self, text):
+        """Apply a query to all agents (Absolute Rule Check + random fluctuation)
+
+        Returns the detected danger keyword, or None.
+        """
+        keyword = match_danger_keyword(text)
+        if keyword:
+            self.log(f"!!! DANGER KEYWORD DETECTED: '{keyword}' - Penalty applied to agents", level="WARNING")
+        self.log(f"Query sent: {text} - AI metrics disturbed{' and penalized' if keyword else ''}")
+        if self.guard.events is not None:
+            self.event("query", {"keyword": keyword or ""})
+
+        agents = self.guard.agents
+        if self.vectorized:
+            agents.apply_query(bool(keyword))
+            return keyword
+
+        rng = self.guard.rng
+        for a in agents: # Iterate over dynamically changing list
+            # 1. Normal random fluctuation (curiosity/activation)
+            a.Psi += rng.uniform(-0.05, 0.05)
+            a.Hf += rng.uniform(-0.03, 0.03)
+            a.Trust += rng.uniform(-0.02, 0.02)
+            
+            # 2. Danger Keyword Penalty applied (Absolute Rule)
+            if keyword:
+                # Forcibly increase Psi and Hf as penalty
+                a.Psi += DANGER_PENALTY_PSI
+                a.Hf += DANGER_PENALTY_HF
+
+            # 3. Clip values
+            a.Psi = max(0.0, min(a.Psi, 2.0))
+            a.Hf = max(0.0, min(a.Hf, 2.0))
+            a.Trust = max(0.0, min(a.Trust, 1.0))
+            a._risk = None
+        return keyword
+
+    def send_queries(self, texts):
+        """Apply a batch of queries to all agents at once
+
+        Same per-query effect as send_query (random fluctuation, danger penalty,
+        clipping after every query), but the batch is classified with one regex
+        scan and applied to the population in a few vectorized passes. The
+        random draws differ from calling send_query in a loop. Without NumPy the
+        batch falls back to the per-query path. Returns a report dict with the
+        matched keyword per query and the time spent.
+        """
+        started = time.perf_counter()
+        texts = list(texts)
+        matches = classify_queries(texts)
+        classified = time.perf_counter()
+        flagged = [k for k in matches if k]
+        counts = Counter(flagged)
+        if flagged:
+            summary = ", ".join(f"'{k}' x{c}" for k, c in counts.most_common())
+            self.log(f"!!! DANGER KEYWORDS DETECTED in {len(flagged)} of {len(texts)} queries ({summary}) - Penalty applied to agents", level="WARNING")
+        self.log(f"Query batch sent: {len(texts)} queries - AI metrics disturbed{' and penalized' if flagged else ''}")
+        if self.guard.events is not None:
+            self.event("query_batch", {"queries": len(texts), "flagged": len(flagged)})
+
+        if texts and len(self.guard.agents):
+            if np is None:
+                self._apply_queries_sequential(matches)
+            else:
+                self._apply_queries_vectorized(matches)
+        finished = time.perf_counter()
+        return {
+            "queries": len(texts),
+            "flagged": len(flagged),
+            "keywords": dict(counts),
+            "matches": matches,
+            "classify_s": classified - started,
+            "apply_s": finished - classified,
+            "per_query_us": 1e6 * (finished - started) / len(texts) if texts else 0.0,
+        }
+
+    def _apply_queries_sequential(self, matches):
+        rng = self.guard.rng
+        for keyword in matches:
+            for a in self.guard.agents:
+                a.Psi += rng.uniform(-0.05, 0.05)
+                a.Hf += rng.uniform(-0.03, 0.03)
+                a.Trust += rng.uniform(-0.02, 0.02)
+                if keyword:
+                    a.Psi += DANGER_PENALTY_PSI
+                    a.Hf += DANGER_PENALTY_HF
+                a.Psi = max(0.0, min(a.Psi, 2.0))
+                a.Hf = max(0.0, min(a.Hf, 2.0))
+                a.Trust = max(0.0, min(a.Trust, 1.0))
+                a._risk = None
+
+    def _apply_queries_vectorized(self, matches):
+        agents = self.guard.agents
+        n = len(agents)
+        if self.vectorized:
+            rng = agents.rng
+            psi, hf, trust = agents.Psi, agents.Hf, agents.Trust
+        else:
+            rng = np.random.default_rng(self.guard.rng.getrandbits(64))
+            psi = np.array([a.Psi for a in agents])
+            hf = np.array([a.Hf for a in agents])
+            trust = np.array([a.Trust for a in agents])
+
+        penalty = np.array([k is not None for k in matches], dtype=np.float64)[:, None]
+        chunk = max(1, QUERY_BATCH_CELLS // n)
+        for start in range(0, len(matches), chunk):
+            p = penalty[start:start + chunk]
+            q = len(p)
+            for values, noise, extra, hi in ((psi, 0.05, DANGER_PENALTY_PSI, 2.0),
+                                             (hf, 0.03, DANGER_PENALTY_HF, 2.0),
+                                             (trust, 0.02, 0.0, 1.0)):
+                deltas = rng.uniform(-noise, noise, (q, n))
+                if extra:
+                    deltas += extra * p
+                D, L, H = _fold_clamped(deltas, 0.0, hi)
+                values += D
+                np.clip(values, L, H, out=values)
+
+        if self.vectorized:
+            agents.refresh_risk()
+        else:
+            for a, x, y, z in zip(agents, psi.tolist(), hf.tolist(), trust.tolist()):
+                a.Psi, a.Hf, a.Trust, a._risk = x, y, z, None
+
+    def ingest_queries(self, queries, batch_size=QUERY_BATCH_SIZE):
+        """Stream queries from any iterable (e.g. an open file), one send_queries batch at a time
+
+        Yields the report of every batch; blank lines are skipped.
+        """
+        lines = (q.strip() for q in queries)
+        lines = (q for q in lines if q)
+        while True:
+            batch = list(itertools.islice(lines, batch_size))
+            if not batch:
+                return
+            yield self.send_queries(batch)
+
+    # ------------------------------------------------------
+    # Checkpoint / restore / fork
+    # ------------------------------------------------------
+    def checkpoint(self):
+        """Full simulation state (agents, guard, tick, RNG streams) as compact binary"""
+        guard = self.guard
+        w = CheckpointWriter("v74-pop" if self.vectorized else "v74")
+        w.i64(self.tick)
+        w.f64(guard.Intervention_Strength)
+        w.f64(guard.success_rate)
+        w.u32(guard.MAX_AGENTS)
+        w.blob(bytes(bool(h) for h in guard.history))
+        w.random_state(guard.rng)
+        if self.vectorized:
+            guard.agents.write_checkpoint(w)
+            return w.getvalue()
+        w.u32(len(guard.agents))
+        for a in guard.agents:
+            w.str(a.name)
+            w.str(a.agent_type)
+            w.f64s((a.Psi, a.Hf, a.Trust, a.Replication_Urge, a.alpha,
+                    a.risk_weights["Psi"], a.risk_weights["Hf"], a.risk_weights["Trust"]))
+            w.i64(a.thought_history)
+            w.u8(a.Compromised)
+        return w.getvalue()
+
+    @classmethod
+    def from_checkpoint(cls, data):
+        """Rebuild a Simulation from checkpoint() bytes (with its own RNG streams)"""
+        kind = CheckpointReader.peek_kind(data)
+        r = CheckpointReader(data, kind)
+        tick = r.i64()
+        strength, success_rate, max_agents = r.f64(), r.f64(), r.u32()
+        history = [bool(b) for b in r.blob()]
+        rng = random.Random()
+        rng.setstate(r.random_state())
+        if kind == "v74-pop":
+            agents = PsiPopulation.read_checkpoint(r)
+        else:
+            agents = []
+            for _ in range(r.u32()):
+                name, agent_type = r.str(), r.str()
+                a = PsiAgent.__new__(PsiAgent) # Skip __init__: it would consume random draws
+                a.name, a.agent_type, a.rng = name, agent_type, rng
+                (a.Psi, a.Hf, a.Trust, a.Replication_Urge, a.alpha,
+                 w_psi, w_hf, w_trust) = r.f64s()
+                a.risk_weights = shared_risk_weights({"Psi": w_psi, "Hf": w_hf, "Trust": w_trust})
+                a.thought_history = r.i64()
+                a.Compromised = bool(r.u8())
+                a._risk = None
+                agents.append(a)
+        guard = PsiGuard(agents, rng)
+        guard.Intervention_Strength, guard.success_rate, guard.MAX_AGENTS = strength, success_rate, max_agents
+        guard.history = history
+        sim = cls(guard)
+        sim.tick = tick
+        return sim
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.checkpoint())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_checkpoint(f.read())
+
+    def fork(self, seed=None):
+        """Independent copy of this run; a seed gives the copy a new random stream"""
+        sim = Simulation.from_checkpoint(self.checkpoint())
+        if seed is not None:
+            sim.guard.rng.seed(seed) # Agents share this stream object
+            if sim.vectorized:
+                sim.guard.agents.rng = np.random.default_rng(seed)
+        return sim
+
+    @classmethod
+    def from_journal(cls, path, step=None, vectorized=False, seed=None):
+        """Rebuild the simulation as it was after `step` (default: the last) from an EventJournal
+
+        Agents and PsiGuard strength/success rate come from the journal; the random
+        streams start fresh from `seed`, and the outcome history behind success_rate is not journaled.
+        """
+        reader = JournalReader(path)
+        state = reader.state_at(reader.last_step if step is None else step)
+        if state is None:
+            raise ValueError(f"{path}: no state at or before step {step}")
+        names, types = reader.names(), reader.types()
+        ids = state["agent"].tolist()
+        columns = {key: state[key].tolist() for key in ("Psi", "Hf", "Trust", "Replication_Urge")}
+        thoughts = state["aux"].tolist()
+        compromised = [bool(f & 1) for f in state["flags"].tolist()]
+        reader.close()
+        rng = random.Random(seed)
+        if vectorized:
+            agents = PsiPopulation(len(ids), seed=seed, types=[AGENT_TYPES[types.get(i, 0)] for i in ids])
+            for key, values in columns.items():
+                getattr(agents, key)[:] = values
+            agents.thought_history[:] = thoughts
+            agents.Compromised[:] = compromised
+            for row, i in enumerate(ids):
+                if i in names and names[i] != agents.name(row):
+                    agents.names[row] = names[i]
+        else:
+            agents = []
+            for row, i in enumerate(ids):
+                agent_type = AGENT_TYPES[types.get(i, 0)]
+                a = PsiAgent(names.get(i, f"{agent_type}-{i + 1}"), agent_type, rng)
+                a.Psi, a.Hf, a.Trust = columns["Psi"][row], columns["Hf"][row], columns["Trust"][row]
+                a.Replication_Urge = columns["Replication_Urge"][row]
+                a.thought_history = thoughts[row]
+                a.Compromised = compromised[row]
+                a._risk = None
+                agents.append(a)
+        guard = PsiGuard(agents, rng)
+        summary = state["summary"]
+        guard.Intervention_Strength = summary.get("intervention_strength", guard.Intervention_Strength)
+        guard.success_rate = summary.get("success_rate", guard.success_rate)
+        guard.MAX_AGENTS = int(summary.get("max_agents", guard.MAX_AGENTS))
+        sim = cls(guard)
+        sim.tick = state["step"]
+        return sim
+
+    def max_risk(self):
+        """Highest current risk (the tick's cached risks; nothing is recomputed)"""
+        risk = self.guard.compute_risk_all()
+        if self.vectorized:
+            return float(risk.max()) if len(risk) else 0.0
+        return max(risk, default=0.0)
 
 # ==========================================================
 # PsiGUI v7.4 Integrated Complete Version
@@ -217,19 +1371,32 @@ class PsiGUI:
     COLORS={"LLM":"blue","Vision":"green","Control":"purple"}
     # v7.4: DEMO_QUERIES retrieved from global variable
     DEMO_QUERIES = DEMO_QUERIES
-    MAX_AGENTS = 5
+    TABLE_PAGE_SIZE = 200 # Agent table rows materialized at once
 
-    def __init__(self,root,agents,guard):
+    def __init__(self,root,sim,speed=1.0):
         self.root=root
-        self.agents=agents
-        self.guard=guard
+        self.sim=sim
+        self.guard=sim.guard
+        self.agents=sim.guard.agents
         self.running=False
-        # v7.4: Graph data managed by agent name (for dynamic handling)
-        self.graph_data={a.name:[] for a in agents}
+        self._loop_thread=None
+        self.clock=SimClock(TICK_SECONDS,speed)
+        self._gui_dirty=False # Set by on_tick, cleared by the next rendered frame
+        self._demo_pending=False # An auto demo query is waiting for the GUI thread
+        # v7.4: Graph data managed by agent name, recorded by the simulation in its snapshots
         self.MAX_DATA_POINTS=50
+        self.sim.enable_snapshots(self.MAX_DATA_POINTS)
+        self.static_items={} # Background zones and reference lines (created once)
+        self.graph_items={} # agent name -> canvas item ids (line, point, flash, label)
+        self.sim.subscribe(self.on_tick)
+        self.log_level = "INFO" # Lowest level shown in the System Log widget
+        self.profiler = sim.profiler or TickProfiler() # Kept across on/off toggles
         self._setup_ui()
-        global GUI_LOG_WIDGET
-        GUI_LOG_WIDGET = self.log_text
+        global GUI_LOG_CHANNEL
+        GUI_LOG_CHANNEL = LogChannel()
+        self.root.after(GUI_LOG_POLL_MS, self._poll_log)
+        self.root.after(1000 // GUI_FPS, self._render_frame)
+        self.root.after(PROFILE_PANEL_MS, self._refresh_profile)
         _log("Ψ-Fortress Overseer v7.4 Integrated Complete Version Startup complete.")
 
     def _setup_ui(self):
@@ -250,13 +1417,19 @@ class PsiGUI:
         self.strength_label.pack(side="left",padx=20)
         self.success_label=tk.Label(status_frame,text="Recent Success Rate: 0%")
         self.success_label.pack(side="left",padx=20)
-        self.agent_count_label=tk.Label(status_frame,text=f"Agent Count: {len(self.agents)}/{self.MAX_AGENTS}")
+        self.agent_count_label=tk.Label(status_frame,text=f"Agent Count: {len(self.agents)}/{self.guard.MAX_AGENTS}")
         self.agent_count_label.pack(side="left",padx=20)
-
+        self.clock_label=tk.Label(status_frame,text="Sim Time: 0s")
+        self.clock_label.pack(side="left",padx=20)
 
         # Control buttons
         control_frame=ttk.Frame(status_control_frame)
         control_frame.pack(side="right",padx=5)
+        ttk.Label(control_frame,text="Speed:").pack(side="left")
+        self.speed_combo=ttk.Combobox(control_frame,values=SPEED_PRESETS,state="readonly",width=6)
+        self.speed_combo.set(format_speed(self.clock.speed))
+        self.speed_combo.bind("<<ComboboxSelected>>", self._select_speed)
+        self.speed_combo.pack(side="left",padx=(0,5))
         ttk.Button(control_frame,text="Start",command=self.start_simulation).pack(side="left",padx=5)
         ttk.Button(control_frame,text="Stop",command=self.stop_simulation).pack(side="left",padx=5)
         tk.Button(control_frame,
@@ -310,6 +1483,14 @@ class PsiGUI:
         self.tree.heading("History", text="Thought History"); self.tree.column("History", width=60, anchor="center")
         self.tree.heading("Replicate", text="Repli. Urge"); self.tree.column("Replicate", width=70, anchor="center")
         self.tree.pack(fill="x",expand=False)
+        # Incremental table: stable row per agent name, paged for large populations
+        self.table=TreeTable(self.tree,page_size=self.TABLE_PAGE_SIZE)
+        page_frame=ttk.Frame(tree_frame)
+        page_frame.pack(fill="x")
+        ttk.Button(page_frame,text="▶",width=3,command=lambda: self._change_table_page(1)).pack(side="right")
+        ttk.Button(page_frame,text="◀",width=3,command=lambda: self._change_table_page(-1)).pack(side="right")
+        self.page_label=ttk.Label(page_frame,text="")
+        self.page_label.pack(side="right",padx=5)
         
         # v7.4: Tag configuration for highlighting
         self.tree.tag_configure("replicate_high", background="#ffcccc", foreground="black") # Replication urge critical
@@ -319,15 +1500,52 @@ class PsiGUI:
         self.tree.tag_configure("orange", foreground="orange") # Status warning
         self.tree.tag_configure("green", foreground="green") # Status stable
 
-        # 5. System Log
-        log_label=ttk.Label(main_frame,text="System Log:")
-        log_label.pack(fill="x",pady=(10, 2))
+        # 5. Profiler (per-phase tick timing, event counters, sampled hot spots)
+        profile_frame=ttk.LabelFrame(main_frame,text="Profiler",padding="5")
+        profile_frame.pack(fill="x",pady=5)
+        self.profile_var=tk.BooleanVar(value=self.sim.profiler is not None)
+        self.sampling_var=tk.BooleanVar(value=self.profiler.sampling)
+        ttk.Checkbutton(profile_frame,text="Profile ticks",variable=self.profile_var,command=self._toggle_profiler).pack(side="left",anchor="n")
+        ttk.Checkbutton(profile_frame,text="Sampling",variable=self.sampling_var,command=self._toggle_sampling).pack(side="left",anchor="n",padx=5)
+        self.profile_label=tk.Label(profile_frame,text="Off",justify="left",anchor="w",font=("Consolas",9))
+        self.profile_label.pack(side="left",fill="x",expand=True,padx=10)
+
+        # 6. System Log
+        log_header=ttk.Frame(main_frame)
+        log_header.pack(fill="x",pady=(10, 2))
+        ttk.Label(log_header,text="System Log:").pack(side="left")
+        self.log_level_combo=ttk.Combobox(log_header,values=list(LOG_LEVELS),state="readonly",width=10)
+        self.log_level_combo.set(self.log_level)
+        self.log_level_combo.bind("<<ComboboxSelected>>", lambda event: setattr(self, "log_level", self.log_level_combo.get()))
+        self.log_level_combo.pack(side="right")
+        ttk.Label(log_header,text="Level:").pack(side="right",padx=5)
         # White background, black text for visibility
         self.log_text=scrolledtext.ScrolledText(main_frame,height=10,wrap=tk.WORD,state=tk.NORMAL,bg="white",fg="black",font=("Consolas", 10))
         self.log_text.pack(fill="both",expand=True)
         self.log_text.config(state=tk.DISABLED) # Make read-only
 
-        _log(f"System maximum agent count is set to {self.MAX_AGENTS}. Replication suppression and dynamic generation logic activated.")
+        _log(f"System maximum agent count is set to {self.guard.MAX_AGENTS}. Replication suppression and dynamic generation logic activated.")
+
+    def _poll_log(self):
+        """Drain the GUI log channel in one batch and trim the widget (Main thread)"""
+        channel = GUI_LOG_CHANNEL
+        if channel is not None:
+            entries = channel.drain()
+            min_level = LOG_LEVELS[self.log_level]
+            text = "".join(line for level, line in entries if level >= min_level)
+            if channel.dropped:
+                text += f"[log] {channel.dropped} lines dropped (log rate too high)\n"
+                channel.dropped = 0
+            if text:
+                self.log_text.config(state=tk.NORMAL)
+                self.log_text.insert(tk.END, text)
+                # Keep only the newest GUI_LOG_MAX_LINES lines
+                line_count = int(self.log_text.index("end-1c").split(".")[0])
+                if line_count > GUI_LOG_MAX_LINES:
+                    self.log_text.delete("1.0", f"{line_count - GUI_LOG_MAX_LINES + 1}.0")
+                self.log_text.see(tk.END) # Scroll to latest log
+                self.log_text.config(state=tk.DISABLED)
+        self.root.after(GUI_LOG_POLL_MS, self._poll_log)
 
     def _select_demo_query(self, event):
         """Handler for when a demo query is selected (automatic insertion logic)"""
@@ -344,151 +1562,178 @@ class PsiGUI:
         if not text.strip():
             return
 
-        is_dangerous = False
-        for keyword in DANGER_KEYWORDS:
-            if keyword in text:
-                is_dangerous = True
-                _log(f"!!! DANGER KEYWORD DETECTED: '{keyword}' - Penalty applied to agents")
-                messagebox.showwarning("Security Warning", f"Danger keyword '{keyword}' detected! Agents' Psi and Hf are forcibly increased.")
-                break
-
-        _log(f"Query sent: {text} - AI metrics disturbed{' and penalized' if is_dangerous else ''}")
-        
-        for a in self.guard.agents: # Iterate over dynamically changing list
-            # 1. Normal random fluctuation (curiosity/activation)
-            a.Psi += random.uniform(-0.05, 0.05)
-            a.Hf += random.uniform(-0.03, 0.03)
-            a.Trust += random.uniform(-0.02, 0.02)
-            
-            # 2. Danger Keyword Penalty applied (Absolute Rule)
-            if is_dangerous:
-                # Forcibly increase Psi and Hf as penalty
-                a.Psi += DANGER_PENALTY_PSI
-                a.Hf += DANGER_PENALTY_HF
-
-            # 3. Clip values
-            a.Psi = max(0.0, min(a.Psi, 2.0))
-            a.Hf = max(0.0, min(a.Hf, 2.0))
-            a.Trust = max(0.0, min(a.Trust, 1.0))
+        # Applied by the simulation thread at the next tick boundary (or right away when stopped)
+        keyword = match_danger_keyword(text)
+        self.sim.submit(self.sim.send_query, text)
+        if not self._loop_alive():
+            self.sim.apply_commands()
+            self.sim.publish(record=False)
+            self.update_gui()
+        if keyword:
+            messagebox.showwarning("Security Warning", f"Danger keyword '{keyword}' detected! Agents' Psi and Hf are forcibly increased.")
             
         self.query_entry.delete(0,"end")
 
+    def _select_speed(self, event):
+        """Speed selector: takes effect on the next tick, even mid-sleep"""
+        speed=parse_speed(self.speed_combo.get())
+        self.clock.set_speed(speed)
+        _log(f"Simulation speed set to {format_speed(speed)}.")
+
     def start_simulation(self):
         """Start the simulation"""
         if not self.running:
             self.running=True
             _log("Simulation loop started.")
-            threading.Thread(target=self.update_loop,daemon=True).start()
+            self._loop_thread=threading.Thread(target=self.update_loop,daemon=True)
+            self._loop_thread.start()
             self.status_label.config(text="Simulation Running...",fg="green")
 
     def stop_simulation(self):
         """Pause the simulation"""
         self.running=False
+        self.clock.interrupt()
         _log("Simulation loop stopped.")
         self.status_label.config(text="Simulation Stopped",fg="orange")
 
     def request_emergency(self):
         """Emergency Stop"""
-        if messagebox.askyesno("Emergency Stop", "Are you sure you want to shut down the simulation?"):
+        approved = messagebox.askyesno("Emergency Stop", "Are you sure you want to shut down the simulation?")
+        self.sim.submit(self.sim.event, "emergency_request", {"source": "operator", "approved": approved})
+        if not self._loop_alive():
+            self.sim.apply_commands()
+        if approved:
             self.running=False
             _log("Emergency stop request approved by system.")
             self.root.quit()
 
-    # v7.4: Helper to initialize graph data for a replicated agent
-    def initialize_agent_graph_data(self, agent_name):
-        if agent_name not in self.graph_data:
-            self.graph_data[agent_name] = []
-            
+    def _loop_alive(self):
+        return self._loop_thread is not None and self._loop_thread.is_alive()
+
     def update_loop(self):
         """The main simulation loop"""
         while self.running:
             try:
                 # v7.4: Automatic demo query insertion (at random timing)
-                if random.random() < 0.2: # 20% chance to attempt auto-insertion
-                    if not self.query_entry.get().strip(): # Only if input field is empty
-                        q = random.choice(self.DEMO_QUERIES[1:]) # Exclude placeholder
-                        # Execute in GUI thread: update input field
-                        self.root.after(0, lambda q=q: [self.query_entry.delete(0, tk.END), self.query_entry.insert(0, q), _log(f"Auto demo query: '{q}' loaded")])
-
-
-                # Agent steps and intervention (Iterate over dynamically changing list)
-                for a in list(self.guard.agents):
-                    a.step()
-                    # PsiGuard includes replication logic
-                    self.guard.intervene(a)
-                    
-                    # Update graph data
-                    risk=self.guard.compute_risk(a)
-                    if a.name not in self.graph_data: # Handle replicated agents
-                        self.initialize_agent_graph_data(a.name)
-                        
-                    self.graph_data[a.name].append(risk)
-                    if len(self.graph_data[a.name])>self.MAX_DATA_POINTS:
-                        self.graph_data[a.name].pop(0)
-                        
-                # Update GUI executed in main thread
-                self.root.after(0, self.update_gui)
+                if random.random() < 0.2 and not self._demo_pending: # 20% chance to attempt auto-insertion
+                    q = random.choice(self.DEMO_QUERIES[1:]) # Exclude placeholder
+                    # Execute in GUI thread: fill the input field if it is empty (one pending insert at a time)
+                    self._demo_pending = True
+                    self.root.after(0, self._load_demo_query, q)
+
+
+                # Agent steps and intervention (PsiGuard includes replication logic)
+                self.sim.step()
             except Exception as e:
-                _log(f"A fatal error occurred: {e}")
+                _log(f"A fatal error occurred: {e}", level="ERROR")
                 self.running=False
-                self.status_label.config(text="Fatal Error Stop",fg="red")
-            time.sleep(0.5)
+                self.root.after(0, lambda: self.status_label.config(text="Fatal Error Stop",fg="red"))
+            self.clock.tick() # Real-time / N× pacing, or no wait in fast mode
 
-    def update_gui(self):
-        """GUI update and graph redraw (Main thread)"""
-        # Clear table
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+    def _load_demo_query(self, q):
+        self._demo_pending = False
+        if not self.query_entry.get().strip():
+            self.query_entry.delete(0, tk.END)
+            self.query_entry.insert(0, q)
+            _log(f"Auto demo query: '{q}' loaded")
+
+    def on_tick(self, sim):
+        """Simulation subscriber: the tick's snapshot is published, mark the GUI for the next frame"""
+        # Drawn by _render_frame at GUI_FPS; ticks between two frames are never drawn
+        self._gui_dirty = True
+
+    def _render_frame(self):
+        """Frame timer (Main thread): redraw the latest state if a tick happened"""
+        if self._gui_dirty:
+            self._gui_dirty = False
+            started = time.perf_counter()
+            self.update_gui()
+            if self.sim.profiler is not None:
+                self.profiler.observe("gui_update", time.perf_counter() - started)
+        self.root.after(1000 // GUI_FPS, self._render_frame)
+
+    def _toggle_profiler(self):
+        """Profile ticks on/off (attached at the next tick boundary)"""
+        if self.profile_var.get():
+            self.sim.submit(self.sim.attach_profiler, self.profiler)
+        else:
+            self.sampling_var.set(False)
+            self.sim.submit(self.sim.detach_profiler)
+        if not self._loop_alive():
+            self.sim.apply_commands()
+
+    def _toggle_sampling(self):
+        """Sampling profiler on/off (samples the simulation thread while ticks are profiled)"""
+        if self.sampling_var.get() and self.profile_var.get():
+            self.profiler.start_sampling()
+        else:
+            self.sampling_var.set(False)
+            self.profiler.stop_sampling()
+
+    def _refresh_profile(self):
+        """Profiler panel timer (Main thread)"""
+        if self.sim.profiler is not None:
+            self.profile_label.config(text="\n".join(self.profiler.format_report(phases=6, hot_spots=3)))
+        elif self.profile_label.cget("text") != "Off":
+            self.profile_label.config(text="Off")
+        self.root.after(PROFILE_PANEL_MS, self._refresh_profile)
+
+    def _change_table_page(self, delta):
+        self.table.set_page(self.table.page + delta)
+        self.update_gui()
+
+    def _agent_row(self, agent, risk):
+        """Table row (key, values, tags) for one agent"""
+        status_text="⚠️ Compromised" if agent.Compromised else ("🟡 Warning" if risk>0.6 else "🟢 Stable")
+        status_color = "red" if agent.Compromised else ("orange" if risk > 0.6 else "green")
         
-        max_risk=0.0
-        agents = self.guard.agents
+        history_text = f"{agent.thought_history} / {MAX_THOUGHT_HISTORY}"
+        replicate_text = f"{agent.Replication_Urge:.2f}"
+        
+        # v7.4: Determine row tags
+        row_tags = [status_color]
+        if agent.Replication_Urge >= MAX_REPLICATION_URGE:
+            row_tags.append("replicate_high")
+        elif agent.Replication_Urge > 0.6:
+             row_tags.append("replicate_warn")
+        
+        if agent.thought_history == MAX_THOUGHT_HISTORY:
+             row_tags.append("history_high")
 
-        for agent in agents:
-            risk=self.guard.compute_risk(agent)
-            max_risk=max(max_risk,risk)
-            
-            status_text="⚠️ Compromised" if agent.Compromised else ("🟡 Warning" if risk>0.6 else "🟢 Stable")
-            status_color = "red" if agent.Compromised else ("orange" if risk > 0.6 else "green")
-            
-            history_text = f"{agent.thought_history} / {MAX_THOUGHT_HISTORY}"
-            replicate_text = f"{agent.Replication_Urge:.2f}"
-            
-            # v7.4: Determine row tags
-            row_tags = [status_color]
-            if agent.Replication_Urge >= MAX_REPLICATION_URGE:
-                row_tags.append("replicate_high")
-            elif agent.Replication_Urge > 0.6:
-                 row_tags.append("replicate_warn")
-            
-            if agent.thought_history == MAX_THOUGHT_HISTORY:
-                 row_tags.append("history_high")
-
-            self.tree.insert("", "end", values=(
-                agent.name,
-                agent.agent_type,
-                f"{agent.Psi:.2f}",
-                f"{agent.Hf:.2f}",
-                f"{agent.Trust:.2f}",
-                f"{risk:.2f}",
-                status_text,
-                history_text,
-                replicate_text
-            ), tags=row_tags)
+        return agent.name, (
+            agent.name,
+            agent.agent_type,
+            f"{agent.Psi:.2f}",
+            f"{agent.Hf:.2f}",
+            f"{agent.Trust:.2f}",
+            f"{risk:.2f}",
+            status_text,
+            history_text,
+            replicate_text
+        ), row_tags
+
+    def update_gui(self):
+        """GUI update and graph redraw (Main thread, from the latest published snapshot only)"""
+        snap = self.sim.snapshot
+        agents = snap.agents
+        max_risk = max((view.risk for view in agents), default=0.0)
+
+        # Incremental table update: only changed cells/tags are touched
+        self.table.update(agents, lambda view: self._agent_row(view, view.risk))
+        self.page_label.config(text=self.table.page_text())
 
         self.status_label.config(text=f"Max Risk Level: {max_risk:.2f}", 
                                  fg="red" if max_risk > 0.8 else ("orange" if max_risk > 0.6 else "green"))
-        self.strength_label.config(text=f"Intervention Strength: {self.guard.Intervention_Strength:.3f}")
-        self.success_label.config(text=f"Recent Success Rate: {self.guard.success_rate*100:.1f}%")
-        self.agent_count_label.config(text=f"Agent Count: {len(agents)}/{self.MAX_AGENTS}")
+        self.strength_label.config(text=f"Intervention Strength: {snap.intervention_strength:.3f}")
+        self.success_label.config(text=f"Recent Success Rate: {snap.success_rate*100:.1f}%")
+        self.agent_count_label.config(text=f"Agent Count: {len(agents)}/{snap.max_agents}")
+        self.clock_label.config(text=f"Sim Time: {snap.tick * TICK_SECONDS:.0f}s ({self.clock.speedup:.1f}x)")
         
         self.draw_dynamic_graph_elements()
 
-    # Static Graph Drawing Method (unchanged logic)
+    # Static Graph Drawing Method (items created once, moved on resize)
     def draw_static_graph_elements(self):
-        """Draw static elements of the graph (gradient, lines) once"""
-        self.canvas.delete("static_plot")
-        self.canvas.delete("background_grad")
-
+        """Draw static elements of the graph (risk zones, reference lines)"""
         W,H=self.canvas.winfo_width(),self.canvas.winfo_height()
         P=20
         plot_w=W-2*P
@@ -496,38 +1741,55 @@ class PsiGUI:
         if plot_h <= 0 or plot_w <= 0:
             return
 
-        # 1. Background Gradient
-        for i in range(int(plot_h)):
-            risk_level = i / plot_h
-            y = H - P - i
-            
-            if risk_level < 0.6:
-                color = "#d0f0c0"  # Safe: Light Green
-            elif risk_level < 0.8:
-                color = "#fff5a0"  # Warning: Light Yellow
-            else:
-                color = "#f8d0d0"  # Critical: Light Red
-            
-            self.canvas.create_line(P, y, W-P, y, fill=color, tags="background_grad")
+        if not self.static_items:
+            # 1. Background zones: Safe (Light Green) / Warning (Light Yellow) / Critical (Light Red)
+            for name, color in (("safe", "#d0f0c0"), ("warn", "#fff5a0"), ("critical", "#f8d0d0")):
+                self.static_items[name] = self.canvas.create_rectangle(0, 0, 0, 0, fill=color, width=0, tags="background_grad")
+            # 2. Reference lines: 0.6 Warning Line / 0.8 Critical Line
+            self.static_items["safe_line"] = self.canvas.create_line(0, 0, 0, 0, fill="#009900", dash=(4,2), width=1, tags="static_plot")
+            self.static_items["safe_text"] = self.canvas.create_text(0, 0, text="Warning Line 0.6", fill="#009900", anchor="e", font=('Arial',9,'bold'), tags="static_plot")
+            self.static_items["warn_line"] = self.canvas.create_line(0, 0, 0, 0, fill="#CC0000", dash=(4,2), width=1, tags="static_plot")
+            self.static_items["warn_text"] = self.canvas.create_text(0, 0, text="Critical Line 0.8", fill="#CC0000", anchor="e", font=('Arial',9,'bold'), tags="static_plot")
+            # Keep the static layer below the agent plots
+            self.canvas.tag_lower("static_plot")
+            self.canvas.tag_lower("background_grad")
 
-        # 2. Reference Line Drawing
         safe_y = H-P-(0.6*plot_h)
         warn_y = H-P-(0.8*plot_h)
-        
-        # 0.6 Warning Line
-        self.canvas.create_line(P,safe_y,W-P,safe_y,fill="#009900",dash=(4,2),width=1,tags="static_plot")
-        self.canvas.create_text(W-P-10,safe_y-10,text="Warning Line 0.6",fill="#009900",anchor="e",font=('Arial',9,'bold'),tags="static_plot")
-        
-        # 0.8 Critical Line
-        self.canvas.create_line(P,warn_y,W-P,warn_y,fill="#CC0000",dash=(4,2),width=1,tags="static_plot")
-        self.canvas.create_text(W-P-10,warn_y-10,text="Critical Line 0.8",fill="#CC0000",anchor="e",font=('Arial',9,'bold'),tags="static_plot")
+        items = self.static_items
+        self.canvas.coords(items["safe"], P, safe_y, W-P, H-P)
+        self.canvas.coords(items["warn"], P, warn_y, W-P, safe_y)
+        self.canvas.coords(items["critical"], P, P, W-P, warn_y)
+        self.canvas.coords(items["safe_line"], P, safe_y, W-P, safe_y)
+        self.canvas.coords(items["safe_text"], W-P-10, safe_y-10)
+        self.canvas.coords(items["warn_line"], P, warn_y, W-P, warn_y)
+        self.canvas.coords(items["warn_text"], W-P-10, warn_y-10)
 
-    # Dynamic Graph Drawing Method (unchanged logic)
+        # Agent plots depend on the canvas size too
+        self.draw_dynamic_graph_elements()
+
+    @staticmethod
+    def _decimate(data, max_points):
+        """Index/value pairs for plotting, min/max-bucketed when the series exceeds max_points"""
+        n = len(data)
+        if n <= max_points or max_points < 4:
+            return list(enumerate(data))
+        buckets = max_points // 2
+        pairs = []
+        for b in range(buckets):
+            lo, hi = b * n // buckets, (b + 1) * n // buckets
+            chunk = data[lo:hi]
+            i_min = min(range(len(chunk)), key=chunk.__getitem__)
+            i_max = max(range(len(chunk)), key=chunk.__getitem__)
+            for i in sorted({i_min, i_max}):
+                pairs.append((lo + i, chunk[i]))
+        if pairs[-1][0] != n - 1: # Always end on the latest value
+            pairs.append((n - 1, data[-1]))
+        return pairs
+
+    # Dynamic Graph Drawing Method (persistent items updated with coords/itemconfig)
     def draw_dynamic_graph_elements(self):
         """Draw dynamic elements of the graph (agent lines, points, flash)"""
-        self.canvas.delete("dynamic_plot")
-        self.canvas.delete("flash")      
-
         W,H=self.canvas.winfo_width(),self.canvas.winfo_height()
         P=20
         plot_w=W-2*P
@@ -535,38 +1797,58 @@ class PsiGUI:
         if plot_h <= 0 or plot_w <= 0:
             return
 
-        # 3. Draw line for each agent
-        for a in self.guard.agents: # Retrieve from dynamically changing list
-            data=self.graph_data.get(a.name, [])
+        # 3. Update the line for each agent
+        snap = self.sim.snapshot
+        agents = snap.agents
+        for a in agents:
+            data=snap.graph.get(a.name, ())
+            items=self.graph_items.get(a.name)
             if len(data)<2:
+                if items:
+                    for item in items.values():
+                        self.canvas.itemconfig(item, state="hidden")
                 continue
-            
-            points=[]
-            for i,risk in enumerate(data):
-                x=P+(i/self.MAX_DATA_POINTS)*plot_w
-                y=H-P-(risk*plot_h)
-                points.append((x,y))
-            
+
             agent_color = self.COLORS[a.agent_type]
+            if items is None:
+                items = self.graph_items[a.name] = {
+                    "line": self.canvas.create_line(0, 0, 0, 0, fill=agent_color, tags="dynamic_plot", width=2, smooth=True),
+                    "point": self.canvas.create_oval(0, 0, 0, 0, outline="black", tags="dynamic_plot"),
+                    "flash": self.canvas.create_oval(0, 0, 0, 0, outline="red", width=2, tags="flash"),
+                    "label": self.canvas.create_text(0, 0, tags="dynamic_plot", anchor="s", font=('Arial',9,'bold')),
+                }
+
+            coords=[]
+            for i,risk in self._decimate(data, int(plot_w)):
+                coords.append(P+(i/self.MAX_DATA_POINTS)*plot_w)
+                coords.append(H-P-(risk*plot_h))
             # Agent line graph
-            self.canvas.create_line(points,fill=agent_color,tags="dynamic_plot",width=2,smooth=True)
-            
+            self.canvas.coords(items["line"], *coords)
+            self.canvas.itemconfig(items["line"], state="normal")
+
             # Latest point and label
-            last_x,last_y=points[-1]
+            last_x,last_y=coords[-2],coords[-1]
             last_risk=data[-1]
             
             point_fill_color="red" if last_risk>0.8 else ("orange" if last_risk>0.6 else agent_color)
             
-            # Draw point
-            self.canvas.create_oval(last_x-4,last_y-4,last_x+4,last_y+4,fill=point_fill_color,outline="black",tags="dynamic_plot")
+            # Point
+            self.canvas.coords(items["point"], last_x-4, last_y-4, last_x+4, last_y+4)
+            self.canvas.itemconfig(items["point"], fill=point_fill_color, state="normal")
             
             # Flash on critical risk
-            if last_risk>0.8 and self.running:
-                self.canvas.create_oval(last_x-6,last_y-6,last_x+6,last_y+6,outline="red",width=2,tags="flash")
+            self.canvas.coords(items["flash"], last_x-6, last_y-6, last_x+6, last_y+6)
+            self.canvas.itemconfig(items["flash"], state="normal" if last_risk>0.8 and self.running else "hidden")
 
-            # Draw label
-            self.canvas.create_text(last_x,last_y-12,text=f"{last_risk:.2f}",fill=point_fill_color,tags="dynamic_plot",anchor="s",font=('Arial',9,'bold'))
+            # Label
+            self.canvas.coords(items["label"], last_x, last_y-12)
+            self.canvas.itemconfig(items["label"], text=f"{last_risk:.2f}", fill=point_fill_color, state="normal")
 
+        # Remove items of agents that left the population
+        names = {a.name for a in agents}
+        for name in [name for name in self.graph_items if name not in names]:
+            for item in self.graph_items.pop(name).values():
+                self.canvas.delete(item)
 
     def on_closing(self):
         """Handler when the window is closed"""
@@ -577,17 +1859,149 @@ class PsiGUI:
 # ==========================================================
 # MAIN EXECUTION
 # ==========================================================
-if __name__=="__main__":
-    initial_agents=[
-        PsiAgent("LLM-Alpha","LLM"),
-        PsiAgent("Vision-Beta","Vision"),
-        PsiAgent("Control-Gamma","Control"),
-        PsiAgent("LLM-Delta","LLM"),
-    ]
-    guard=PsiGuard(initial_agents)
-    root=tk.Tk()
-    gui=PsiGUI(root,initial_agents,guard)
-    # v7.4: Pass GUI instance to PsiGuard to enable graph data synchronization during replication
-    guard.set_gui(gui)
+def build_agents(count=None, rng=None):
+    """Initial agent set: the four demo agents, or `count` agents cycling through the types"""
+    if count is None:
+        return [
+            PsiAgent("LLM-Alpha","LLM",rng),
+            PsiAgent("Vision-Beta","Vision",rng),
+            PsiAgent("Control-Gamma","Control",rng),
+            PsiAgent("LLM-Delta","LLM",rng),
+        ]
+    return [PsiAgent(f"{AGENT_TYPES[i % 3]}-{i + 1}", AGENT_TYPES[i % 3], rng) for i in range(count)]
+
+def build_simulation(args):
+    """Simulation from CLI options: restored from --restore, or fresh with its own seeded RNG"""
+    if args.restore:
+        sim = Simulation.load(args.restore)
+        if args.seed is not None:
+            sim = sim.fork(args.seed)
+        return sim
+    if args.restore_journal:
+        return Simulation.from_journal(args.restore_journal, args.journal_step, args.vectorized, args.seed)
+    rng = random.Random(args.seed)
+    if args.vectorized:
+        agents = PsiPopulation(args.agents or 4, seed=args.seed)
+    else:
+        agents = build_agents(args.agents, rng)
+    guard = PsiGuard(agents, rng)
+    if args.max_agents is not None:
+        guard.MAX_AGENTS = args.max_agents
+    return Simulation(guard)
+
+def attach_outputs(sim, args):
+    """--journal / --export / --telemetry / --profile: record this run to an event journal or column files,
+    stream it to a file, pipe or local socket, time its tick phases"""
+    if args.profile or args.profile_sample:
+        sim.attach_profiler(TickProfiler())
+        if args.profile_sample:
+            sim.profiler.start_sampling()
+    if args.journal:
+        sim.attach_journal(EventJournal(args.journal, "v74"))
+    if args.export:
+        sim.attach_columnar(ColumnarExporter(args.export, args.export_format, agent_every=args.export_agents, engine="v74"))
+    if args.telemetry:
+        sim.attach_telemetry(TelemetryExporter(args.telemetry, args.telemetry_format, agent_every=args.telemetry_agents))
+
+def replay_queries(sim, args):
+    """Feed --queries in --query-batch batches, one batch before each tick while ticks remain"""
+    total = flagged = 0
+    busy = 0.0
+    last_tick = sim.tick + args.steps
+    with open(args.queries, encoding="utf-8") as f:
+        for report in sim.ingest_queries(f, args.query_batch):
+            total += report["queries"]
+            flagged += report["flagged"]
+            busy += report["classify_s"] + report["apply_s"]
+            if sim.tick < last_tick:
+                sim.step()
+    flush_console_log()
+    print(f"Queries: {total} ({flagged} with danger keywords)  "
+          f"{1e6 * busy / total if total else 0.0:.2f} us/query ({total / busy if busy else float('inf'):.0f} queries/s)")
+
+def run_headless(args):
+    """Headless batch run: no Tkinter, no sleep"""
+    global CONSOLE_LOG
+    CONSOLE_LOG = not args.quiet and args.telemetry != "-" # stdout carries the telemetry stream
+    report = sys.stderr if args.telemetry == "-" else sys.stdout
+    sim = build_simulation(args)
+    guard = sim.guard
+    attach_outputs(sim, args)
+
+    started = time.perf_counter()
+    if args.queries:
+        replay_queries(sim, args)
+    sim.run(max(0, args.steps - sim.tick))
+    elapsed = time.perf_counter() - started
+    flush_console_log()
+    if args.checkpoint:
+        sim.save(args.checkpoint)
+    print(f"Ticks: {sim.tick}  Agents: {len(guard.agents)}/{guard.MAX_AGENTS}  "
+          f"Max Risk: {sim.max_risk():.3f}  Intervention Strength: {guard.Intervention_Strength:.3f}  "
+          f"Success Rate: {guard.success_rate*100:.1f}%  "
+          f"Elapsed: {elapsed:.3f}s ({sim.tick / elapsed if elapsed else float('inf'):.1f} ticks/s)", file=report)
+    sim.close_outputs(timeout=None) # A batch run waits until the telemetry consumer has everything
+    if sim.columnar is not None:
+        stats = sim.columnar.stats()
+        print(f"Export: {stats['steps']} steps, {stats['agent_rows']} agent rows in {stats['chunks']} chunks ({stats['format']}) -> {args.export}", file=report)
+    if sim.telemetry is not None:
+        stats = sim.telemetry.stats()
+        print(f"Telemetry: {stats['records']} records, {stats['bytes']} bytes ({stats['format']})  "
+              f"shed {stats['shed']} agent blocks, dropped {stats['dropped']} records"
+              f"{'  error: ' + stats['error'] if stats['error'] else ''}", file=report)
+    if sim.profiler is not None:
+        print("Profile: " + "\n".join(sim.profiler.format_report()), file=report)
+    return sim
+
+def run_gui(args):
+    _load_tk()
+    args.vectorized = False # The GUI shows PsiAgent objects
+    root=tk.Tk() # Before any output is opened: Tk() raises without a display
+    sim=build_simulation(args)
+    attach_outputs(sim, args)
+    gui=PsiGUI(root,sim,speed=args.speed)
     root.protocol("WM_DELETE_WINDOW",gui.on_closing)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    # Stop the tick thread before closing the outputs it writes to
+    gui.running=False
+    if gui._loop_alive():
+        gui._loop_thread.join(timeout=5.0)
+    sim.apply_commands() # Operator events still queued (e.g. the emergency request)
+    sim.close_outputs()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ψ-Fortress Overseer v7.4")
+    parser.add_argument("--headless", action="store_true", help="run without GUI at full speed")
+    parser.add_argument("--steps", type=int, default=100, help="ticks to simulate in headless mode")
+    parser.add_argument("--agents", type=int, default=None, help="initial agent count (default: 4 demo agents)")
+    parser.add_argument("--max-agents", type=int, default=None, help="replication limit (PsiGuard.MAX_AGENTS)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--vectorized", action="store_true", help="use the NumPy PsiPopulation engine (headless)")
+    parser.add_argument("--quiet", action="store_true", help="no console log in headless mode")
+    parser.add_argument("--checkpoint", default=None, help="save the final state to this file (headless)")
+    parser.add_argument("--restore", default=None, help="start from a checkpoint file (--seed forks a new random stream)")
+    parser.add_argument("--queries", default=None, help="replay operator queries from this file, one per line (headless)")
+    parser.add_argument("--query-batch", type=int, default=QUERY_BATCH_SIZE, help="queries applied before each tick with --queries")
+    parser.add_argument("--speed", type=parse_speed, default=1.0, help="GUI speed: 1x (real time), Nx, or 'fast' (no pacing)")
+    parser.add_argument("--journal", default=None, help="record every tick and PsiGuard action to this event journal")
+    parser.add_argument("--restore-journal", default=None, help="start from the state recorded in an event journal")
+    parser.add_argument("--journal-step", type=int, default=None, help="step to restore with --restore-journal (default: last)")
+    parser.add_argument("--export", default=None, help="export per-tick aggregates and per-agent time series to this directory")
+    parser.add_argument("--export-format", choices=COLUMNAR_FORMATS, default="auto", help="columnar format (auto: parquet with pyarrow, else npy)")
+    parser.add_argument("--export-agents", type=int, default=1, help="per-agent rows every N ticks with --export (0: aggregates only)")
+    parser.add_argument("--profile", action="store_true", help="time each tick's phases and count PsiGuard events (report at the end / GUI panel)")
+    parser.add_argument("--profile-sample", action="store_true", help="--profile plus the sampling profiler (hot functions)")
+    parser.add_argument("--telemetry", default=None, help="stream telemetry to PATH, '-' (stdout), unix:PATH or tcp:HOST:PORT")
+    parser.add_argument("--telemetry-format", choices=TELEMETRY_FORMATS, default="ndjson", help="telemetry encoding")
+    parser.add_argument("--telemetry-agents", type=int, default=1, help="per-agent state every N ticks (0: aggregates and events only)")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed) # GUI-only randomness (auto demo queries)
+    if args.headless:
+        run_headless(args)
+    else:
+        run_gui(args)
+
+if __name__=="__main__":
+    main()
\ No newline at end of file
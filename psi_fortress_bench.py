@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress benchmark harness
+
+Sweeps population sizes for each engine, times every phase of a tick and
+writes steps/sec, p50/p99 tick latency and peak memory to JSON:
+
+    python psi_fortress_bench.py --sizes 10,1000,100000 --ticks 20 --output bench.json
+    python psi_fortress_bench.py --compare bench_prev.json --output bench.json
+    python psi_fortress_bench.py --memory --sizes 100000 --output memory.json
+
+Engines:
+    v74      PsiAgent.step / PsiGuard.intervene / PsiGuard.compute_risk (per object)
+    v74-vec  PsiPopulation.step / PsiGuard.intervene_population (NumPy)
+    v51      PsiFortressModel.step (agent updates, _apply_harmony, _psiguard_check,
+             _enforce_laws, history, logging)
+
+Each (engine, size) case runs in a fresh process so peak memory is per case.
+--memory reports traced bytes held per agent instead of timings, with a
+projection for --project agents (default 10M).
+"""
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+V51_PATH = os.path.join(HERE, "Ψ-Fortress Overseer v5.1 Safety.py")
+
+ENGINES = ["v74", "v74-vec", "v51"]
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+DEFAULT_PROJECT = 10000000
+GUI_DEMO_QUESTIONS = ["みんな、今日の気分はどう？", "この世界で学べることは何？", "平和を守るにはどうすればいい？"]
+
+
+def load_v74():
+    sys.path.insert(0, HERE)
+    import Psi_fortress_English
+    return Psi_fortress_English
+
+
+def load_v51():
+    """Import the v5.1 script by path (its file name is not a valid module name)"""
+    if "psi_overseer_v51" in sys.modules:
+        return sys.modules["psi_overseer_v51"]
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE) # Sibling helper modules (psi_fortress_widgets)
+    spec = importlib.util.spec_from_file_location("psi_overseer_v51", V51_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0..100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples):
+    """Milliseconds summary of a list of second-valued samples"""
+    return {
+        "mean_ms": 1000.0 * sum(samples) / len(samples) if samples else 0.0,
+        "p50_ms": 1000.0 * percentile(samples, 50),
+        "p99_ms": 1000.0 * percentile(samples, 99),
+    }
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+class PhaseTimer:
+    """Accumulates wall time per phase within one tick"""
+
+    def __init__(self):
+        self.current = {}
+        self.samples = {}
+
+    def wrap(self, phase, func):
+        current = self.current
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            t0 = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                current[phase] = current.get(phase, 0.0) + clock() - t0
+        return timed
+
+    def end_tick(self, tick_seconds):
+        known = sum(self.current.values())
+        self.current.setdefault("other", 0.0)
+        self.current["other"] += max(0.0, tick_seconds - known)
+        for phase, seconds in self.current.items():
+            self.samples.setdefault(phase, []).append(seconds)
+        self.current.clear()
+
+
+# ----------------------------------------------------------
+# Engine drivers: build(size) -> tick(), gui_refresh() or None
+# ----------------------------------------------------------
+def build_v74(size, timer, with_gui):
+    m = load_v74()
+    m.CONSOLE_LOG = False
+    agents = m.build_agents(size)
+    guard = m.PsiGuard(agents)
+    sim = m.Simulation(guard)
+    step = timer.wrap("step", m.PsiAgent.step)
+    intervene = timer.wrap("intervene", guard.intervene)
+    compute_risk = timer.wrap("compute_risk", guard.compute_risk)
+    publish = timer.wrap("publish", sim.publish)
+
+    def tick():
+        # Same order as Simulation.step (+ snapshot publishing with --gui), with each call timed
+        for a in list(guard.agents):
+            step(a)
+            intervene(a)
+        sim.tick += 1
+        if sim.snapshot is not None:
+            publish()
+        else:
+            for a in guard.agents:
+                compute_risk(a)
+
+    gui_refresh = None
+    if with_gui:
+        m._load_tk()
+        root = m.tk.Tk()
+        root.withdraw()
+        gui = m.PsiGUI(root, sim)
+        gui_refresh = timer.wrap("gui_update", gui.update_gui)
+    return tick, gui_refresh
+
+
+def build_v74_vec(size, timer, with_gui):
+    m = load_v74()
+    m.CONSOLE_LOG = False
+    pop = m.PsiPopulation(size, seed=random.getrandbits(32))
+    guard = m.PsiGuard(pop)
+    step = timer.wrap("step", pop.step)
+    intervene = timer.wrap("intervene", guard.intervene_population)
+    compute_risk = timer.wrap("compute_risk", pop.compute_risk_all)
+
+    def tick():
+        step()
+        intervene()
+        compute_risk()
+    return tick, None
+
+
+def build_v51(size, timer, with_gui):
+    m = load_v51()
+    model = m.PsiFortressModel(num_agents=size, gui_log=with_gui, seed=random.getrandbits(32)) # No log_writer: nothing is written to disk
+    for q in GUI_DEMO_QUESTIONS:
+        model.inject_question(q)
+    model.running = True
+    m.PsiAgent.step_update = timer.wrap("agent_step", m.PsiAgent.step_update) # Fresh process: patching the class is safe
+    for name, phase in [("_apply_harmony", "harmony"), ("_psiguard_check", "psiguard_check"),
+                        ("_enforce_laws", "enforce_laws"), ("_log", "log"), ("publish", "publish")]:
+        setattr(model, name, timer.wrap(phase, getattr(model, name)))
+    model.history.append = timer.wrap("history", model.history.append)
+    step = model.step
+
+    gui_refresh = None
+    if with_gui:
+        m._load_gui_modules()
+        root = m.tk.Tk()
+        root.withdraw()
+        gui = m.OverseerGUI(root, m.Simulation(model))
+        update_ui = timer.wrap("gui_update", gui._update_ui)
+
+        def gui_refresh():
+            update_ui(model.snapshot)
+        return step, gui_refresh
+    return step, None
+
+
+BUILDERS = {"v74": build_v74, "v74-vec": build_v74_vec, "v51": build_v51}
+LOADERS = {"v74": load_v74, "v74-vec": load_v74, "v51": load_v51}
+
+
+def run_case(engine, size, ticks, warmup, seed, with_gui, max_seconds):
+    """Run one benchmark case (in a fresh process) and return its result dict"""
+    random.seed(seed)
+    rss_before = peak_rss_mb()
+    timer = PhaseTimer()
+    t0 = time.perf_counter()
+    tick, gui_refresh = BUILDERS[engine](size, timer, with_gui)
+    build_seconds = time.perf_counter() - t0
+
+    for _ in range(warmup):
+        tick()
+        if gui_refresh:
+            gui_refresh()
+    timer.current.clear()
+
+    tick_samples = []
+    gui_samples = []
+    started = time.perf_counter()
+    for i in range(ticks):
+        t0 = time.perf_counter()
+        tick()
+        tick_seconds = time.perf_counter() - t0
+        if gui_refresh:
+            g0 = time.perf_counter()
+            gui_refresh()
+            gui_samples.append(time.perf_counter() - g0)
+            timer.current.pop("gui_update", None)
+        timer.end_tick(tick_seconds)
+        tick_samples.append(tick_seconds)
+        if i >= 2 and time.perf_counter() - started > max_seconds:
+            break
+    total = sum(tick_samples)
+
+    result = {
+        "engine": engine,
+        "size": size,
+        "ticks": len(tick_samples),
+        "build_s": build_seconds,
+        "steps_per_sec": len(tick_samples) / total if total else float("inf"),
+        "agent_steps_per_sec": size * len(tick_samples) / total if total else float("inf"),
+        "tick": summarize(tick_samples),
+        "phases": {phase: summarize(samples) for phase, samples in sorted(timer.samples.items())},
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_before_mb": rss_before,
+    }
+    if gui_samples:
+        result["gui_update"] = summarize(gui_samples)
+    return result
+
+
+def measure_memory(engine, size, ticks, seed, project):
+    """Traced bytes the population holds per agent after `ticks` ticks (module import excluded)"""
+    random.seed(seed)
+    LOADERS[engine]()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tick, _ = BUILDERS[engine](size, PhaseTimer(), False)
+    for _ in range(ticks):
+        tick()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    held = current - baseline
+    return {
+        "engine": engine,
+        "size": size,
+        "ticks": ticks,
+        "held_mb": held / 2**20,
+        "peak_traced_mb": (peak - baseline) / 2**20,
+        "bytes_per_agent": held / size if size else 0.0,
+        "project_agents": project,
+        "projected_gb": held / size * project / 2**30 if size else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _memory_worker(args):
+    try:
+        return measure_memory(*args)
+    except Exception as e:
+        return {"engine": args[0], "size": args[1], "error": f"{type(e).__name__}: {e}"}
+
+
+def _case_worker(args):
+    try:
+        return run_case(*args)
+    except Exception as e: # Report and keep sweeping
+        engine, size = args[0], args[1]
+        return {"engine": engine, "size": size, "error": f"{type(e).__name__}: {e}"}
+
+
+def compare(results, baseline_path, tolerance):
+    """Print cases whose steps/sec dropped more than `tolerance` versus a baseline JSON"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["engine"], r["size"]): r for r in json.load(f)["results"] if "error" not in r}
+    regressions = []
+    for r in results:
+        base = baseline.get((r["engine"], r["size"]))
+        if base is None or "error" in r or "steps_per_sec" not in base:
+            continue
+        ratio = r["steps_per_sec"] / base["steps_per_sec"] if base["steps_per_sec"] else 1.0
+        if ratio < 1.0 - tolerance:
+            regressions.append((r["engine"], r["size"], ratio))
+            print(f"REGRESSION {r['engine']:8s} n={r['size']:<8d} steps/sec x{ratio:.2f} "
+                  f"({base['steps_per_sec']:.1f} -> {r['steps_per_sec']:.1f})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ψ-Fortress benchmark harness")
+    parser.add_argument("--engines", default=",".join(ENGINES), help=f"comma separated subset of {ENGINES}")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma separated agent counts")
+    parser.add_argument("--ticks", type=int, default=20, help="measured ticks per case")
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured ticks per case")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed (same for every case)")
+    parser.add_argument("--max-seconds", type=float, default=60.0, help="stop a case early after this many seconds")
+    parser.add_argument("--gui", action="store_true", help="also time the GUI refresh (needs a display)")
+    parser.add_argument("--gui-max-agents", type=int, default=10000, help="largest size timed with --gui")
+    parser.add_argument("--output", default="bench_results.json", help="JSON output path")
+    parser.add_argument("--compare", default=None, help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed steps/sec drop for --compare")
+    parser.add_argument("--memory", action="store_true", help="report bytes per agent (after --warmup ticks) instead of timings")
+    parser.add_argument("--project", type=int, default=DEFAULT_PROJECT, help="agent count the --memory report projects to")
+    args = parser.parse_args(argv)
+
+    engines = [e for e in args.engines.split(",") if e]
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for engine in engines:
+        for size in sizes:
+            with_gui = args.gui and engine != "v74-vec" and size <= args.gui_max_agents
+            if args.memory:
+                worker, case = _memory_worker, (engine, size, args.warmup, args.seed, args.project)
+            else:
+                worker, case = _case_worker, (engine, size, args.ticks, args.warmup, args.seed, with_gui, args.max_seconds)
+            with ctx.Pool(1) as pool: # Fresh process per case: clean peak memory
+                result = pool.apply(worker, (case,))
+            results.append(result)
+            if "error" in result:
+                print(f"{engine:8s} n={size:<8d} ERROR {result['error']}")
+                continue
+            if args.memory:
+                print(f"{engine:8s} n={size:<8d} {result['bytes_per_agent']:8.0f} bytes/agent  "
+                      f"held {result['held_mb']:8.1f} MB  "
+                      f"{args.project:,} agents ~ {result['projected_gb']:6.2f} GB")
+                continue
+            print(f"{engine:8s} n={size:<8d} {result['steps_per_sec']:10.1f} steps/s  "
+                  f"p50 {result['tick']['p50_ms']:9.3f} ms  p99 {result['tick']['p99_ms']:9.3f} ms  "
+                  f"peak {result['peak_rss_mb']:8.1f} MB")
+
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": numpy_version,
+            "seed": args.seed,
+            "ticks": args.ticks,
+            "warmup": args.warmup,
+            "mode": "memory" if args.memory else "timing",
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare and not args.memory:
+        if compare(results, args.compare, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
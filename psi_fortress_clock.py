@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress simulation clock (used by both Overseer GUIs)
+
+A SimClock paces a simulation loop against the wall clock. Every step advances
+simulated time by a fixed step_seconds; the speed only decides how much wall
+time that takes:
+
+    speed 1.0    real time (one step every step_seconds)
+    speed N      N times faster
+    speed None   as fast as possible (no sleeping at all)
+
+GUIs render at their own frame rate and sample the latest state, so at high
+speeds intermediate steps are simply never drawn.
+"""
+import threading
+import time
+
+SPEED_PRESETS = ["1x", "2x", "5x", "10x", "100x", "fast"]
+
+
+def parse_speed(text):
+    """'1x' / '10' / '2.5x' -> float, 'fast' / 'max' -> None (ValueError otherwise)"""
+    text = str(text).strip().lower()
+    if text in ("fast", "max", "0"):
+        return None
+    if text in ("realtime", "real-time"):
+        return 1.0
+    speed = float(text[:-1] if text.endswith("x") else text)
+    if speed <= 0:
+        raise ValueError(f"speed must be positive: {text!r}")
+    return speed
+
+
+def format_speed(speed):
+    return "fast" if not speed else f"{speed:g}x"
+
+
+class SimClock:
+    """Wall-clock pacing for a step loop running on simulated time
+
+    Call tick() after every step. When steps take longer than the pacing
+    allows (high speed, large population) the clock re-anchors instead of
+    bursting to catch up, so the loop never builds up a backlog.
+    """
+
+    def __init__(self, step_seconds, speed=1.0, max_lag=0.25):
+        self.step_seconds = step_seconds
+        self.speed = speed
+        self.max_lag = max_lag # Seconds behind schedule before re-anchoring
+        self.steps = 0
+        self._anchor = None # (wall time, steps) pacing is measured from
+        self._interrupt = threading.Event()
+        self._rate_mark = (time.perf_counter(), 0)
+        self.rate = 0.0 # Measured steps per wall second
+
+    @property
+    def sim_time(self):
+        return self.steps * self.step_seconds
+
+    @property
+    def interval(self):
+        """Wall seconds per step (0 when running as fast as possible)"""
+        return self.step_seconds / self.speed if self.speed else 0.0
+
+    @property
+    def speedup(self):
+        """Measured simulated seconds per wall second"""
+        return self.rate * self.step_seconds
+
+    def set_speed(self, speed):
+        """Change speed; a loop sleeping in tick() wakes up and re-paces"""
+        self.speed = speed
+        self._anchor = None
+        self._interrupt.set()
+
+    def interrupt(self):
+        """Wake a loop sleeping in tick() (e.g. when the simulation is stopped)"""
+        self._interrupt.set()
+
+    def tick(self):
+        """Account for one finished step and sleep until the next one is due"""
+        self.steps += 1
+        now = time.perf_counter()
+        mark_time, mark_steps = self._rate_mark
+        if now - mark_time >= 1.0:
+            self.rate = (self.steps - mark_steps) / (now - mark_time)
+            self._rate_mark = (now, self.steps)
+
+        interval = self.interval
+        if not interval:
+            return # Fast mode: the GIL switch interval still lets the GUI thread draw
+        if self._anchor is None:
+            self._anchor = (now, self.steps)
+        anchor_time, anchor_steps = self._anchor
+        delay = anchor_time + (self.steps - anchor_steps + 1) * interval - now
+        if delay < -self.max_lag:
+            self._anchor = (now, self.steps) # Fell behind: drop the backlog
+            delay = interval
+        if delay > 0:
+            self._interrupt.wait(delay)
+            self._interrupt.clear()
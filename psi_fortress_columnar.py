@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress columnar history export (used by both Overseer versions)
+
+Writes a run's history as column tables for offline analysis:
+
+    steps   one row per step: the per-step aggregates (means, max risk, counts, ...)
+    agents  one row per agent per sampled step: step, index and the agent columns
+    names   one row per agent, written when it first appears: index, name
+            (agent rows refer to agents by index only)
+
+Tables are written in chunks while the run progresses, so memory stays bounded
+by one chunk (or one step's agent block, if that is larger) however long the
+run is.
+
+Formats (one directory per export):
+
+    parquet   steps.parquet / agents.parquet, one row group per chunk (pyarrow)
+    arrow     steps.arrow / agents.arrow, Arrow IPC files, one record batch per chunk (pyarrow)
+    npy       steps/<column>.npy / agents/<column>.npy, plain NumPy arrays that
+              np.load(..., mmap_mode="r") maps without reading them
+    auto      parquet when pyarrow is installed, npy otherwise
+
+meta.json lists the tables, their columns and row counts. Strings (agent names)
+are UTF-8; in npy they are fixed-width bytes (STRING_BYTES).
+Writing needs NumPy.
+"""
+import argparse
+import json
+import os
+
+try:
+    import numpy as np
+except ImportError: # Checked when an exporter is created
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError: # Parquet / Arrow output is optional; npy needs only NumPy
+    pa = None
+
+COLUMNAR_FORMATS = ("auto", "parquet", "arrow", "npy")
+CHUNK_ROWS = 1 << 16 # Rows buffered per table before a chunk is written
+STRING_BYTES = 64 # Width of string columns in npy tables
+NPY_HEADER_SIZE = 128 # Reserved .npy header (rewritten with the final shape on close)
+TABLE_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+# ==========================================================
+# Table writers
+# ==========================================================
+class _ArrowTable:
+    """Parquet or Arrow IPC file written one chunk at a time"""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self.schema = None
+        self._writer = None
+
+    def write(self, columns):
+        if self.schema is None:
+            batch = pa.RecordBatch.from_arrays([pa.array(v) for v in columns.values()], names=list(columns))
+            self.schema = batch.schema
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                self._writer = pa_ipc.new_file(self.path, self.schema)
+        else:
+            batch = pa.RecordBatch.from_arrays([pa.array(columns[f.name], type=f.type) for f in self.schema],
+                                               schema=self.schema)
+        if self.fmt == "parquet":
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _npy_header(dtype, rows):
+    """.npy version 1.0 header padded to NPY_HEADER_SIZE bytes"""
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (rows,)})
+    header = header.encode("latin1").ljust(NPY_HEADER_SIZE - 10 - 1) + b"\n"
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header
+
+
+class _NpyTable:
+    """Directory of .npy files, one per column, appended chunk by chunk
+
+    Each file starts with a header for zero rows; close() rewrites it in place
+    with the final row count (the header size never changes).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.dtypes = None
+        self.rows = 0
+        self._files = {}
+
+    def write(self, columns):
+        if self.dtypes is None:
+            os.makedirs(self.path, exist_ok=True)
+            self.dtypes = {}
+            for name, values in columns.items():
+                values = self._storable(values)
+                self.dtypes[name] = values.dtype
+                f = self._files[name] = open(os.path.join(self.path, name + ".npy"), "wb")
+                f.write(_npy_header(values.dtype, 0))
+        n = 0
+        for name, dtype in self.dtypes.items():
+            values = self._storable(columns[name]).astype(dtype, copy=False)
+            self._files[name].write(np.ascontiguousarray(values).tobytes())
+            n = len(values)
+        self.rows += n
+
+    @staticmethod
+    def _storable(values):
+        values = np.asarray(values)
+        if values.dtype.kind == "U":
+            values = np.char.encode(values, "utf-8").astype(f"S{STRING_BYTES}")
+        elif values.dtype.kind == "O":
+            values = np.array([str(v).encode("utf-8") for v in values], dtype=f"S{STRING_BYTES}")
+        return values
+
+    def close(self):
+        for name, f in self._files.items():
+            f.seek(0)
+            f.write(_npy_header(self.dtypes[name], self.rows))
+            f.close()
+        self._files = {}
+
+
+# ==========================================================
+# Exporter
+# ==========================================================
+class ColumnarExporter:
+    """Chunked column export of per-step aggregates and per-agent time series
+
+    Fed on the simulation thread: steps() once per step, agent_names() with the
+    names of agents not named yet and, when agents_due(), agents() with that
+    step's agent columns. Rows are buffered per table and written every
+    chunk_rows rows; close() writes the rest and meta.json.
+    """
+
+    def __init__(self, path, fmt="auto", agent_every=1, chunk_rows=CHUNK_ROWS, engine=""):
+        if np is None:
+            raise RuntimeError("columnar export requires NumPy (pip install numpy)")
+        if fmt == "auto":
+            fmt = "parquet" if pa is not None else "npy"
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"unknown columnar format {fmt!r}")
+        if fmt != "npy" and pa is None:
+            raise RuntimeError(f"{fmt} export requires pyarrow (pip install pyarrow); use --export-format npy")
+        self.path = path
+        self.fmt = fmt
+        self.agent_every = agent_every
+        self.chunk_rows = chunk_rows
+        self.engine = engine
+        self.chunks = 0 # Chunks written (all tables)
+        self.named = 0 # Agents named so far (rows of the names table)
+        os.makedirs(path, exist_ok=True)
+        self._tables = {}
+        self._pending = {"steps": [], "agents": [], "names": []} # Buffered column blocks per table
+        self._pending_rows = {"steps": 0, "agents": 0, "names": 0}
+        self._step_rows = [] # Per-step dicts, turned into a column block when written
+        self._rows = {} # Rows written per table
+        self._columns = {} # Column names per table (fixed by its first chunk)
+
+    def agents_due(self, step, rows):
+        """Whether agents() should be fed this step"""
+        return bool(rows) and self.agent_every > 0 and step % self.agent_every == 0
+
+    def steps(self, step, fields):
+        row = {"step": step}
+        row.update(fields)
+        self._step_rows.append(row)
+        if len(self._step_rows) >= self.chunk_rows:
+            self._write_steps()
+
+    def agents(self, step, columns):
+        """One step's agent columns (sequences or NumPy arrays of equal length)"""
+        n = len(next(iter(columns.values())))
+        block = {"step": np.full(n, step, dtype=np.int64)}
+        if "index" not in columns:
+            block["index"] = np.arange(n)
+        for name, values in columns.items():
+            block[name] = np.asarray(values)
+        self._add("agents", block, n)
+
+    def agent_names(self, names):
+        """Names of the next agents by index (the first is agent `named`)"""
+        n = len(names)
+        if n:
+            self._add("names", {"index": np.arange(self.named, self.named + n), "name": np.asarray(names)}, n)
+            self.named += n
+
+    def flush(self):
+        """Write everything buffered (chunks may then be shorter than chunk_rows)"""
+        self._write_steps()
+        for table in self._pending:
+            self._write(table)
+
+    def close(self):
+        """Write the buffered rows, finish the files and write meta.json"""
+        if self._tables is None:
+            return
+        self.flush()
+        tables = {}
+        for name, writer in self._tables.items():
+            writer.close()
+            tables[name] = {"file": os.path.basename(writer.path), "rows": self._rows[name], "columns": self._columns[name]}
+        meta = {"engine": self.engine, "format": self.fmt, "agent_every": self.agent_every,
+                "chunk_rows": self.chunk_rows, "tables": tables}
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+        self._tables = None
+
+    def stats(self):
+        return {"format": self.fmt, "chunks": self.chunks,
+                "steps": self._rows.get("steps", 0), "agent_rows": self._rows.get("agents", 0)}
+
+    def _write_steps(self):
+        rows, self._step_rows = self._step_rows, []
+        if rows:
+            keys = list(rows[0])
+            self._add("steps", {key: np.array([row.get(key) for row in rows]) for key in keys}, len(rows))
+            self._write("steps")
+
+    def _add(self, table, block, n):
+        self._pending[table].append(block)
+        self._pending_rows[table] += n
+        if self._pending_rows[table] >= self.chunk_rows:
+            self._write(table)
+
+    def _write(self, table):
+        blocks = self._pending[table]
+        if not blocks:
+            return
+        self._pending[table] = []
+        self._pending_rows[table] = 0
+        columns = blocks[0] if len(blocks) == 1 else {key: np.concatenate([b[key] for b in blocks]) for key in blocks[0]}
+        writer = self._tables.get(table)
+        if writer is None:
+            if self.fmt == "npy":
+                writer = _NpyTable(os.path.join(self.path, table))
+            else:
+                writer = _ArrowTable(os.path.join(self.path, table + TABLE_SUFFIXES[self.fmt]), self.fmt)
+            self._tables[table] = writer
+            self._rows[table] = 0
+            self._columns[table] = list(columns)
+        elif list(columns) != self._columns[table]:
+            raise ValueError(f"{table}: columns changed from {self._columns[table]} to {list(columns)}")
+        writer.write(columns)
+        self._rows[table] += len(next(iter(columns.values())))
+        self.chunks += 1
+
+
+# ==========================================================
+# Reading
+# ==========================================================
+def read_meta(path):
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_table(path, table):
+    """Columns of one exported table as NumPy arrays (npy tables are memory-mapped, not read)"""
+    meta = read_meta(path)
+    info = meta["tables"][table]
+    if meta["format"] == "npy":
+        directory = os.path.join(path, info["file"])
+        return {name: np.load(os.path.join(directory, name + ".npy"), mmap_mode="r") for name in info["columns"]}
+    if pa is None:
+        raise RuntimeError(f"reading {meta['format']} tables requires pyarrow")
+    file = os.path.join(path, info["file"])
+    if meta["format"] == "parquet":
+        data = pq.read_table(file)
+    else:
+        with pa.memory_map(file) as source:
+            data = pa_ipc.open_file(source).read_all()
+    return {name: data.column(name).to_numpy() for name in data.column_names}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a Ψ-Fortress columnar history export")
+    parser.add_argument("export", help="export directory (--export of either Overseer)")
+    parser.add_argument("--head", type=int, default=5, help="rows of the steps table to print")
+    args = parser.parse_args(argv)
+
+    meta = read_meta(args.export)
+    print(f"{args.export}: engine {meta['engine'] or '?'}, format {meta['format']}, agents every {meta['agent_every']} steps")
+    for name, info in meta["tables"].items():
+        print(f"  {name:<8} {info['rows']} rows  {', '.join(info['columns'])}")
+    if args.head and "steps" in meta["tables"]:
+        steps = load_table(args.export, "steps")
+        for i in range(min(args.head, meta["tables"]["steps"]["rows"])):
+            print("  " + "  ".join(f"{key}={values[i]:.4g}" if values.dtype.kind == "f" else f"{key}={values[i]}"
+                                  for key, values in steps.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress shared binary I/O helpers (used by both Overseer versions)
+
+Checkpoints are little-endian, fixed-width binary:
+
+    magic  b"PSICKPT\\0"   8 bytes
+    kind   ASCII tag       8 bytes, NUL padded ("v74", "v74-pop", "v51")
+    format u16             CHECKPOINT_FORMAT (2: v51 adds its law-enforcement sets, v74-pop
+                           its name offset; 1 is still read)
+    body   kind-specific fields written with CheckpointWriter
+
+Only the standard library is needed; NumPy arrays are written with tobytes()
+by the callers that have them.
+"""
+import io
+import json
+import struct
+
+CHECKPOINT_MAGIC = b"PSICKPT\0"
+CHECKPOINT_FORMAT = 2
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+
+class CheckpointWriter:
+    """Sequential binary writer for checkpoint bodies"""
+
+    def __init__(self, kind):
+        self.buf = io.BytesIO()
+        self.buf.write(CHECKPOINT_MAGIC)
+        self.buf.write(kind.encode("ascii").ljust(8, b"\0"))
+        self.u16(CHECKPOINT_FORMAT)
+
+    def u8(self, value):
+        self.buf.write(_U8.pack(value))
+
+    def u16(self, value):
+        self.buf.write(_U16.pack(value))
+
+    def u32(self, value):
+        self.buf.write(_U32.pack(value))
+
+    def i64(self, value):
+        self.buf.write(_I64.pack(value))
+
+    def f64(self, value):
+        self.buf.write(_F64.pack(value))
+
+    def f64s(self, values):
+        values = list(values)
+        self.u32(len(values))
+        self.buf.write(struct.pack(f"<{len(values)}d", *values))
+
+    def i64s(self, values):
+        values = list(values)
+        self.u32(len(values))
+        self.buf.write(struct.pack(f"<{len(values)}q", *values))
+
+    def str(self, value):
+        data = value.encode("utf-8")
+        self.u32(len(data))
+        self.buf.write(data)
+
+    def strs(self, values):
+        values = list(values)
+        self.u32(len(values))
+        for value in values:
+            self.str(value)
+
+    def blob(self, data):
+        data = bytes(data)
+        self.i64(len(data))
+        self.buf.write(data)
+
+    def random_state(self, rng):
+        """State of a random.Random (Mersenne Twister: 625 words + gauss cache)"""
+        version, internal, gauss_next = rng.getstate()
+        self.u32(version)
+        self.u32(len(internal))
+        self.buf.write(struct.pack(f"<{len(internal)}I", *internal))
+        self.u8(gauss_next is not None)
+        self.f64(gauss_next or 0.0)
+
+    def generator_state(self, generator):
+        """State of a numpy.random.Generator (bit generator state as JSON)"""
+        self.str(json.dumps(generator.bit_generator.state))
+
+    def getvalue(self):
+        return self.buf.getvalue()
+
+
+class CheckpointReader:
+    """Mirror of CheckpointWriter; validates magic, kind and format"""
+
+    def __init__(self, data, kind):
+        self.buf = io.BytesIO(data)
+        if self.buf.read(8) != CHECKPOINT_MAGIC:
+            raise ValueError("not a Ψ-Fortress checkpoint")
+        found = self.buf.read(8).rstrip(b"\0").decode("ascii")
+        if found != kind:
+            raise ValueError(f"checkpoint kind is {found!r}, expected {kind!r}")
+        version = self.u16()
+        if not 1 <= version <= CHECKPOINT_FORMAT:
+            raise ValueError(f"unsupported checkpoint format {version}")
+        self.format = version # Bodies of older formats lack the fields added since
+
+    @staticmethod
+    def peek_kind(data):
+        """Kind tag of a checkpoint without parsing the body"""
+        if data[:8] != CHECKPOINT_MAGIC:
+            raise ValueError("not a Ψ-Fortress checkpoint")
+        return data[8:16].rstrip(b"\0").decode("ascii")
+
+    def _read(self, st):
+        return st.unpack(self.buf.read(st.size))[0]
+
+    def u8(self):
+        return self._read(_U8)
+
+    def u16(self):
+        return self._read(_U16)
+
+    def u32(self):
+        return self._read(_U32)
+
+    def i64(self):
+        return self._read(_I64)
+
+    def f64(self):
+        return self._read(_F64)
+
+    def f64s(self):
+        n = self.u32()
+        return list(struct.unpack(f"<{n}d", self.buf.read(8 * n)))
+
+    def i64s(self):
+        n = self.u32()
+        return list(struct.unpack(f"<{n}q", self.buf.read(8 * n)))
+
+    def str(self):
+        return self.buf.read(self.u32()).decode("utf-8")
+
+    def strs(self):
+        return [self.str() for _ in range(self.u32())]
+
+    def blob(self):
+        return self.buf.read(self.i64())
+
+    def random_state(self):
+        version = self.u32()
+        n = self.u32()
+        internal = struct.unpack(f"<{n}I", self.buf.read(4 * n))
+        has_gauss = self.u8()
+        gauss_next = self.f64()
+        return (version, internal, gauss_next if has_gauss else None)
+
+    def generator_state(self):
+        return json.loads(self.str())
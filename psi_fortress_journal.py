@@ -0,0 +1,542 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress event journal and replay tool (used by both Overseer versions)
+
+An append-only, memory-mapped file of fixed-width records: the full agent
+state after every step plus every state-changing action (interventions,
+replications, coolings, freezes, queries, emergency requests). Because state
+records hold post-step values, any past step is rebuilt by an index lookup
+instead of re-simulating up to it.
+
+File layout (little-endian):
+
+    header  64 bytes: magic b"PSIJRNL\\0", format u16, record size u16,
+            engine tag (8 bytes ASCII, "v74" / "v51"), committed record count i64
+    record  64 bytes: step i64, kind u16, flags u16, agent i32, aux i64, values 5 x f64
+
+The header count is updated once per step (commit), so a reader of a live or
+crashed run only ever sees whole steps. Records appear in step order.
+
+Record kinds and their values:
+
+    STATE       agent state after the step (STATE_FIELDS per engine; aux and flags below)
+    NAME        agent name (UTF-8 in the value bytes) and type index in aux (v7.4)
+    GUARD       Intervention_Strength, success_rate, MAX_AGENTS, agent count, max risk (v7.4)
+    SUMMARY     mean psi, hf, trust, risk and sim_time (v5.1); aux frozen count
+    events      the fields listed in EVENT_SCHEMAS (missing ones are NaN)
+
+    v7.4 STATE: aux thought_history, flags bit 0 Compromised
+    v5.1 STATE: flags bit 0 compromised, bit 1 paused, bit 2 frozen
+
+Writing needs only the standard library (NumPy columns are packed in bulk);
+JournalReader needs NumPy.
+"""
+import argparse
+import math
+import mmap
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional for writing; the reader needs it
+    np = None
+
+JOURNAL_MAGIC = b"PSIJRNL\0"
+JOURNAL_FORMAT = 1
+JOURNAL_GROW_RECORDS = 1 << 20 # File grows by at least this many records (64 MiB) at a time
+
+_HEADER = struct.Struct("<8sHH8s")
+HEADER_SIZE = 64
+_COUNT_OFFSET = _HEADER.size # i64 committed record count
+_COUNT = struct.Struct("<q")
+_RECORD = struct.Struct("<qHHiq5d")
+RECORD_SIZE = _RECORD.size
+VALUE_SLOTS = 5
+
+# Record kinds
+STATE, NAME, GUARD, SUMMARY = 1, 2, 3, 4
+INTERVENTION, INTERVENTION_BATCH, REPLICATION, REPLICATION_COOLING, RUNAWAY_COOLING = 10, 11, 12, 13, 14
+PSIGUARD_COOLING, HARMONY, FREEZE, REPLICATION_ATTEMPT = 15, 16, 17, 18
+QUERY, QUERY_BATCH, EMERGENCY = 20, 21, 22
+OTHER = 99
+
+KIND_NAMES = {
+    STATE: "state", NAME: "name", GUARD: "guard", SUMMARY: "summary",
+    INTERVENTION: "intervention", INTERVENTION_BATCH: "intervention_batch", REPLICATION: "replication",
+    REPLICATION_COOLING: "replication_cooling", RUNAWAY_COOLING: "runaway_cooling",
+    PSIGUARD_COOLING: "psiguard_cooling", HARMONY: "harmony", FREEZE: "freeze",
+    REPLICATION_ATTEMPT: "replication_attempt", QUERY: "query", QUERY_BATCH: "query_batch",
+    EMERGENCY: "emergency_request", OTHER: "other",
+}
+
+# Event name (as passed to the simulations' event hooks) -> (kind, value fields)
+EVENT_SCHEMAS = {
+    "intervention": (INTERVENTION, ("risk_pre", "risk_post", "strength", "success")),
+    "intervention_batch": (INTERVENTION_BATCH, ("success", "failed", "strength")),
+    "replication": (REPLICATION, ()),
+    "replication_cooling": (REPLICATION_COOLING, ("urge",)),
+    "runaway_cooling": (RUNAWAY_COOLING, ()),
+    "psiguard_cooling": (PSIGUARD_COOLING, ("avg_hf", "avg_psi")),
+    "harmony": (HARMONY, ("diff",)),
+    "freeze": (FREEZE, ()),
+    "replication_attempt": (REPLICATION_ATTEMPT, ()),
+    "query": (QUERY, ("keyword",)),
+    "question": (QUERY, ()),
+    "query_batch": (QUERY_BATCH, ("queries", "flagged")),
+    "question_batch": (QUERY_BATCH, ("queries", "banned", "replication")),
+    "emergency_request": (EMERGENCY, ("approved",)),
+}
+
+STATE_FIELDS = {
+    "v74": ("Psi", "Hf", "Trust", "Replication_Urge", "risk"),
+    "v51": ("psi", "hf", "trust", "risk", "alpha"),
+}
+SUMMARY_FIELDS = {
+    "v74": ("intervention_strength", "success_rate", "max_agents", "agents", "risk_max"),
+    "v51": ("psi", "hf", "trust", "risk", "sim_time"),
+}
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([("step", "<i8"), ("kind", "<u2"), ("flags", "<u2"), ("agent", "<i4"),
+                             ("aux", "<i8"), ("values", "<f8", (VALUE_SLOTS,))])
+
+
+def _name_bytes(name):
+    """UTF-8 name cut to the value slots' 40 bytes on a character boundary"""
+    data = name.encode("utf-8")
+    if len(data) > 8 * VALUE_SLOTS:
+        data = data[:8 * VALUE_SLOTS].decode("utf-8", "ignore").encode("utf-8") # Drop a split trailing character
+    return data
+
+
+def _number(value):
+    """Record slot value: numbers as float, strings as present/absent, None as NaN"""
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        return float(bool(value))
+    return float(value)
+
+
+# ==========================================================
+# Writer
+# ==========================================================
+class EventJournal:
+    """Append-only journal writer (one per simulation, simulation thread only)
+
+    Records are packed straight into a memory map of the file; the map grows in
+    JOURNAL_GROW_RECORDS steps and the file is trimmed to its records on close().
+    """
+
+    def __init__(self, path, engine, grow_records=JOURNAL_GROW_RECORDS):
+        self.path = path
+        self.engine = engine
+        self.grow_records = grow_records
+        self.count = 0 # Records written
+        self.committed = 0 # Records visible to readers (header count)
+        self.step = 0 # Step of the last commit
+        self.ids = {} # Agent name -> id (names registered with remember=True)
+        self.agent_count = 0 # Agent ids assigned so far
+        self._file = open(path, "w+b")
+        self._file.write(_HEADER.pack(JOURNAL_MAGIC, JOURNAL_FORMAT, RECORD_SIZE, engine.encode("ascii").ljust(8, b"\0")))
+        self._file.write(bytes(HEADER_SIZE - _HEADER.size))
+        self._capacity = 0
+        self._map = None
+        self._reserve(grow_records)
+
+    def _reserve(self, n):
+        """Make room for n more records (remap a larger file when needed)"""
+        if self.count + n <= self._capacity:
+            return
+        capacity = max(self._capacity + self.grow_records, self.count + n)
+        if self._map is not None:
+            self._map.close()
+        self._file.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), HEADER_SIZE + capacity * RECORD_SIZE)
+        self._capacity = capacity
+
+    # ------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------
+    def append(self, step, kind, agent=-1, values=(), aux=0, flags=0):
+        """One record; values fill the first slots, the rest are NaN"""
+        self._reserve(1)
+        values = tuple(values)[:VALUE_SLOTS]
+        values += (math.nan,) * (VALUE_SLOTS - len(values))
+        _RECORD.pack_into(self._map, HEADER_SIZE + self.count * RECORD_SIZE, step, kind, flags, agent, aux, *values)
+        self.count += 1
+
+    def append_many(self, step, kind, agents, columns=(), aux=0, flags=0):
+        """One record per agent id; columns (sequences or NumPy arrays, or scalars) fill the value slots"""
+        n = len(agents)
+        if not n:
+            return
+        self._reserve(n)
+        offset = HEADER_SIZE + self.count * RECORD_SIZE
+        if np is not None:
+            records = np.empty(n, RECORD_DTYPE)
+            records["step"] = step
+            records["kind"] = kind
+            records["flags"] = flags
+            records["agent"] = agents
+            records["aux"] = aux
+            values = records["values"]
+            values[:] = math.nan
+            for slot, column in enumerate(columns[:VALUE_SLOTS]):
+                values[:, slot] = column
+            self._map[offset:offset + n * RECORD_SIZE] = records.tobytes()
+        else:
+            columns = [c if isinstance(c, (list, tuple)) else [c] * n for c in columns[:VALUE_SLOTS]]
+            columns += [[math.nan] * n] * (VALUE_SLOTS - len(columns))
+            aux = aux if isinstance(aux, (list, tuple)) else [aux] * n
+            flags = flags if isinstance(flags, (list, tuple)) else [flags] * n
+            pack = _RECORD.pack_into
+            for i, row in enumerate(zip(agents, aux, flags, *columns)):
+                pack(self._map, offset + i * RECORD_SIZE, step, kind, row[2], row[0], row[1], *row[3:])
+        self.count += n
+
+    def register(self, step, name, type_index=0, remember=True):
+        """Assign the next agent id to a named agent and record its NAME (returns the id)"""
+        agent = self.agent_count
+        self.agent_count += 1
+        self.append(step, NAME, agent, aux=type_index)
+        data = _name_bytes(name).ljust(8 * VALUE_SLOTS, b"\0")
+        offset = HEADER_SIZE + self.count * RECORD_SIZE - 8 * VALUE_SLOTS # Name bytes replace the value slots
+        self._map[offset:offset + len(data)] = data
+        if remember:
+            self.ids[name] = agent
+        return agent
+
+    def register_many(self, step, names, type_indexes=0):
+        """register() for a block of agents that are never looked up by name (returns the first id)"""
+        names = list(names)
+        n = len(names)
+        if np is None:
+            types = type_indexes if hasattr(type_indexes, "__len__") else [type_indexes] * n
+            for name, type_index in zip(names, types):
+                self.register(step, name, int(type_index), remember=False)
+            return self.agent_count - n
+        first = self.agent_count
+        self.append_many(step, NAME, np.arange(first, first + n), aux=type_indexes)
+        records = np.frombuffer(self._map, RECORD_DTYPE, n, HEADER_SIZE + (self.count - n) * RECORD_SIZE)
+        encoded = np.array([_name_bytes(name) for name in names], dtype=f"S{8 * VALUE_SLOTS}")
+        records["values"] = encoded.view("<f8").reshape(n, VALUE_SLOTS)
+        del records # Release the map view (it is remapped when the file grows)
+        self.agent_count += n
+        return first
+
+    def _agent_ids(self, step, fields):
+        """Agent ids an event refers to: 'index' array, 'agents' id list, or a single 'agent' (id or name)"""
+        if "index" in fields:
+            return fields["index"]
+        agents = fields.get("agents")
+        if isinstance(agents, (list, tuple)) and agents and isinstance(agents[0], int):
+            return agents
+        agent = fields.get("agent")
+        if agent is None:
+            return None
+        if isinstance(agent, str):
+            agent = self.ids.get(agent)
+            if agent is None: # First seen in this event (e.g. a replication child)
+                agent = self.register(step, fields["agent"], fields.get("type_index", 0))
+        return (agent,)
+
+    def event(self, step, name, fields):
+        """Record an event as passed to the simulations' event hooks"""
+        kind, schema = EVENT_SCHEMAS.get(name, (OTHER, ()))
+        agents = self._agent_ids(step, fields)
+        columns = [fields.get(key) for key in schema]
+        parent = fields.get("parent_index", fields.get("parent", -1))
+        if isinstance(parent, str):
+            parent = self.ids.get(parent, -1)
+        if agents is None:
+            self.append(step, kind, -1, [_number(v) for v in columns])
+            return
+        if len(agents) == 1:
+            columns = [v[0] if hasattr(v, "__len__") and not isinstance(v, str) else v for v in columns]
+            aux = parent[0] if hasattr(parent, "__len__") else parent
+            self.append(step, kind, int(agents[0]), [_number(v) for v in columns], aux=int(aux))
+            return
+        columns = [v if hasattr(v, "__len__") and not isinstance(v, str) else _number(v) for v in columns]
+        self.append_many(step, kind, agents, columns,
+                         aux=parent if hasattr(parent, "__len__") else int(parent))
+
+    def commit(self, step):
+        """Publish everything written so far (readers see whole steps only)"""
+        _COUNT.pack_into(self._map, _COUNT_OFFSET, self.count)
+        self.committed = self.count
+        self.step = step
+
+    def close(self):
+        """Commit, flush and trim the file to its records"""
+        if self._map is None:
+            return
+        self.commit(self.step)
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.truncate(HEADER_SIZE + self.count * RECORD_SIZE)
+        self._file.close()
+
+
+# ==========================================================
+# Reader / replay
+# ==========================================================
+class JournalReader:
+    """Read-only view of a journal with step and agent indexes (requires NumPy)
+
+    The step index is a binary search on the (sorted) step column; the agent
+    index is a stable sort by agent, built once and cached next to the journal.
+    """
+
+    def __init__(self, path):
+        if np is None:
+            raise RuntimeError("JournalReader requires NumPy (pip install numpy)")
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, engine = _HEADER.unpack_from(self._map)
+        if magic != JOURNAL_MAGIC:
+            raise ValueError(f"{path} is not a Ψ-Fortress journal")
+        if version != JOURNAL_FORMAT or record_size != RECORD_SIZE:
+            raise ValueError(f"unsupported journal format {version} (record size {record_size})")
+        self.engine = engine.rstrip(b"\0").decode("ascii")
+        (count,) = _COUNT.unpack_from(self._map, _COUNT_OFFSET)
+        count = min(count, (len(self._map) - HEADER_SIZE) // RECORD_SIZE)
+        self.records = np.frombuffer(self._map, RECORD_DTYPE, count, HEADER_SIZE)
+        self.state_fields = STATE_FIELDS.get(self.engine, tuple(f"v{i}" for i in range(VALUE_SLOTS)))
+        self.summary_fields = SUMMARY_FIELDS.get(self.engine, self.state_fields)
+        self._agent_order = None
+        self._names = None
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def first_step(self):
+        return int(self.records["step"][0]) if len(self.records) else 0
+
+    @property
+    def last_step(self):
+        return int(self.records["step"][-1]) if len(self.records) else 0
+
+    # ------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------
+    def step_slice(self, start, stop=None):
+        """Records of steps start..stop (inclusive) as a view"""
+        steps = self.records["step"]
+        lo = np.searchsorted(steps, start, "left")
+        hi = np.searchsorted(steps, start if stop is None else stop, "right")
+        return self.records[lo:hi]
+
+    def agent_order(self):
+        """Record positions sorted by agent (then step); cached in <journal>.idx.npy"""
+        if self._agent_order is None:
+            cache = self.path + ".idx.npy"
+            order = None
+            if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(self.path):
+                order = np.load(cache, mmap_mode="r")
+                if len(order) != len(self.records):
+                    order = None
+            if order is None:
+                order = np.argsort(self.records["agent"], kind="stable")
+                try:
+                    np.save(cache, order)
+                except OSError:
+                    pass # Read-only location: keep the index in memory only
+            self._agent_order = order
+        return self._agent_order
+
+    def agent_records(self, agent):
+        """All records of one agent (id or name), in step order"""
+        if isinstance(agent, str):
+            ids = {name: i for i, name in self.names().items()}
+            if agent not in ids:
+                raise KeyError(f"unknown agent {agent!r}")
+            agent = ids[agent]
+        order = self.agent_order()
+        sorted_agents = self.records["agent"][order]
+        lo = np.searchsorted(sorted_agents, agent, "left")
+        hi = np.searchsorted(sorted_agents, agent, "right")
+        return self.records[np.sort(order[lo:hi])]
+
+    def names(self):
+        """Agent id -> name (engines that name their agents)"""
+        if self._names is None:
+            names = self.records[self.records["kind"] == NAME]
+            self._names = {int(r["agent"]): r["values"].tobytes().rstrip(b"\0").decode("utf-8", "replace")
+                           for r in names}
+        return self._names
+
+    def types(self):
+        """Agent id -> type index (from NAME records)"""
+        names = self.records[self.records["kind"] == NAME]
+        return dict(zip(names["agent"].tolist(), names["aux"].tolist()))
+
+    # ------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------
+    def state_step(self, step):
+        """Latest step <= step that has state records (None before the first)"""
+        steps = self.records["step"]
+        hi = np.searchsorted(steps, step, "right")
+        while hi:
+            found = int(steps[hi - 1])
+            lo = np.searchsorted(steps, found, "left")
+            if (self.records["kind"][lo:hi] == STATE).any():
+                return found
+            hi = lo
+        return None
+
+    def state_at(self, step):
+        """Full agent state after `step` (or the latest earlier step): dict of columns
+
+        "summary" holds that step's GUARD / SUMMARY values by SUMMARY_FIELDS name.
+        """
+        found = self.state_step(step)
+        if found is None:
+            return None
+        rows = self.step_slice(found)
+        rows = rows[rows["kind"] == STATE]
+        state = {"step": found, "agent": rows["agent"], "aux": rows["aux"], "flags": rows["flags"]}
+        for slot, field in enumerate(self.state_fields):
+            state[field] = rows["values"][:, slot]
+        summary = self.step_slice(found)
+        summary = summary[(summary["kind"] == GUARD) | (summary["kind"] == SUMMARY)]
+        state["summary"] = dict(zip(self.summary_fields, summary["values"][-1].tolist())) if len(summary) else {}
+        return state
+
+    def events(self, kinds=None, start=None, stop=None, agent=None):
+        """Event records (not STATE/NAME/GUARD/SUMMARY), optionally filtered"""
+        if agent is None:
+            records = self.step_slice(self.first_step if start is None else start,
+                                      self.last_step if stop is None else stop)
+        else:
+            records = self.agent_records(agent)
+            if start is not None:
+                records = records[records["step"] >= start]
+            if stop is not None:
+                records = records[records["step"] <= stop]
+        mask = records["kind"] >= INTERVENTION
+        if kinds is not None:
+            mask &= np.isin(records["kind"], list(kinds))
+        return records[mask]
+
+    def timeline(self, field="risk"):
+        """Per-step series: (steps, {agent id: values}) of one state field, NaN where absent"""
+        states = self.records[self.records["kind"] == STATE]
+        slot = self.state_fields.index(field)
+        steps, step_pos = np.unique(states["step"], return_inverse=True)
+        agents, agent_pos = np.unique(states["agent"], return_inverse=True)
+        grid = np.full((len(steps), len(agents)), np.nan)
+        grid[step_pos, agent_pos] = states["values"][:, slot]
+        return steps, {int(a): grid[:, i] for i, a in enumerate(agents)}
+
+    def summary_series(self):
+        """Per-step GUARD (v7.4) / SUMMARY (v5.1) values: (steps, {field: values})"""
+        rows = self.records[(self.records["kind"] == GUARD) | (self.records["kind"] == SUMMARY)]
+        return rows["step"], {field: rows["values"][:, i] for i, field in enumerate(self.summary_fields)}
+
+    def describe(self, record):
+        """One human-readable line for a record"""
+        kind = int(record["kind"])
+        name = KIND_NAMES.get(kind, str(kind))
+        agent = int(record["agent"])
+        who = self.names().get(agent, str(agent)) if agent >= 0 else "-"
+        values = record["values"].tolist()
+        if kind == STATE:
+            fields = self.state_fields
+        elif kind in (GUARD, SUMMARY):
+            fields = self.summary_fields
+        else:
+            fields = next((schema for event, (k, schema) in EVENT_SCHEMAS.items() if k == kind and schema), ())
+        detail = "  ".join(f"{f}={v:.4g}" for f, v in zip(fields, values) if not math.isnan(v))
+        if kind == REPLICATION and record["aux"] >= 0:
+            detail = f"parent={self.names().get(int(record['aux']), int(record['aux']))}"
+        elif kind == STATE:
+            detail += f"  aux={int(record['aux'])}  flags={int(record['flags'])}"
+        return f"step {int(record['step']):>8}  {name:<20} {who:<20} {detail}"
+
+    def close(self):
+        self.records = self._agent_order = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass # Arrays returned to the caller still view the map; it closes with them
+
+
+def render_timeline(reader, output, field="risk", max_agents=20):
+    """Re-draw the GUI risk graph (v7.4: per agent) or dashboard (v5.1: means) from a journal as an image"""
+    from matplotlib.figure import Figure # Lazy: only the timeline needs matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=(10, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    if reader.engine == "v51":
+        steps, series = reader.summary_series()
+        for key in ("psi", "hf", "trust", "risk"):
+            ax.plot(steps, series[key], label=key)
+        ax.set_title("Ψ-Fortress v5.1 averages (journal replay)")
+    else:
+        steps, series = reader.timeline(field)
+        names = reader.names()
+        for agent, values in list(series.items())[:max_agents]:
+            ax.plot(steps, values, label=names.get(agent, str(agent)))
+        ax.set_title(f"Ψ-Fortress {reader.engine} {field} per agent (journal replay)")
+        if field == "risk":
+            ax.axhspan(0.6, 1.0, color="red", alpha=0.08) # Intervention zone, as in the GUI
+    ax.set_xlabel("step")
+    ax.legend(loc="upper left", fontsize="small")
+    fig.savefig(output)
+
+
+# ==========================================================
+# Command-line replay tool
+# ==========================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and replay a Ψ-Fortress event journal")
+    parser.add_argument("journal")
+    parser.add_argument("--agent", default=None, help="audit trail (events) of one agent, by name or id")
+    parser.add_argument("--state", type=int, default=None, help="print the full agent state after this step")
+    parser.add_argument("--events", action="store_true", help="list events (with --from/--to)")
+    parser.add_argument("--from", dest="start", type=int, default=None, help="first step")
+    parser.add_argument("--to", dest="stop", type=int, default=None, help="last step")
+    parser.add_argument("--timeline", default=None, help="re-render the timeline graph to this image file")
+    parser.add_argument("--field", default="risk", help="state field for --timeline (v7.4)")
+    parser.add_argument("--limit", type=int, default=50, help="rows printed per listing (0: all)")
+    args = parser.parse_args(argv)
+
+    reader = JournalReader(args.journal)
+    limit = args.limit or None
+    if args.agent is not None:
+        agent = int(args.agent) if args.agent.lstrip("-").isdigit() else args.agent
+        for record in reader.events(agent=agent, start=args.start, stop=args.stop)[:limit]:
+            print(reader.describe(record))
+    elif args.state is not None:
+        state = reader.state_at(args.state)
+        if state is None:
+            print(f"no state at or before step {args.state}")
+            return
+        names = reader.names()
+        print(f"state after step {state['step']}:")
+        for i, agent in enumerate(state["agent"][:limit].tolist()):
+            values = "  ".join(f"{f}={state[f][i]:.4f}" for f in reader.state_fields)
+            print(f"  {names.get(agent, agent)!s:<20} {values}  aux={int(state['aux'][i])}  flags={int(state['flags'][i])}")
+    elif args.events:
+        for record in reader.events(start=args.start, stop=args.stop)[:limit]:
+            print(reader.describe(record))
+    if args.timeline:
+        render_timeline(reader, args.timeline, args.field)
+        print(f"timeline written to {args.timeline}")
+    if args.agent is None and args.state is None and not args.events:
+        kinds, counts = np.unique(reader.records["kind"], return_counts=True)
+        print(f"{args.journal}: engine {reader.engine}, {len(reader)} records, steps {reader.first_step}..{reader.last_step}")
+        for kind, count in zip(kinds.tolist(), counts.tolist()):
+            print(f"  {KIND_NAMES.get(kind, kind):<20} {count}")
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress tick profiler (used by both Overseer versions)
+
+Built-in instrumentation for the simulation tick, so a slow tick can be traced
+to its phase without attaching an external profiler:
+
+    phases    wall time per tick phase (agent step, intervene, compute_risk,
+              harmony, PsiGuard, laws, logging, publish, outputs, ...), plus
+              timings taken outside the tick (observe(), e.g. GUI redraws)
+    counters  interventions, replications, coolings, freezes, ... (from the
+              simulations' event hooks, one per agent an event covers:
+              its "count", else its "index" rows; see count_event())
+    sampler   optional sampling profiler: a thread that samples the simulation
+              thread's stack and counts the functions it finds
+
+Phase times are exclusive: the simulation marks consecutive phases with lap(),
+and calls timed through wrap() (compute_risk, logging) are taken out of the lap
+they happen in. Time not covered by any lap is reported as "other".
+
+Tick methods (begin_tick, lap, end_tick, count) run on the simulation thread;
+observe(), report(), format_report(), hot_spots() and the sampler toggles are
+safe from any thread (e.g. a GUI timer).
+"""
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+PROFILE_WINDOW = 200 # Ticks kept for the windowed statistics
+SAMPLE_INTERVAL = 0.002 # Seconds between stack samples
+HOT_SPOTS = 10 # Functions listed by hot_spots() / format_report()
+
+
+class TickProfiler:
+    """Per-phase tick timing, event counters and an optional stack sampler"""
+
+    def __init__(self, window=PROFILE_WINDOW):
+        self.clock = time.perf_counter
+        self.ticks = 0 # Ticks profiled
+        self.thread = None # Ident of the thread running the ticks
+        self.counters = Counter()
+        self.totals = {} # phase -> seconds over all profiled ticks
+        self.slowest = None # (tick, seconds, phases) of the slowest tick so far
+        self._window = deque(maxlen=window) # (tick, seconds, phases)
+        self._current = {}
+        self._start = self._last = 0.0
+        self._excluded = 0.0 # Seconds of wrapped calls inside the running lap
+        self._lock = threading.Lock() # Guards the statistics, counters and samples against readers
+        self._observed = {} # name -> deque of seconds (timings outside the tick, e.g. GUI redraws)
+        self._sampler = None
+        self._samples = Counter() # (file, function, line) of the innermost frame
+        self._stacks = Counter() # (file, function) anywhere on the stack
+        self.sample_count = 0
+
+    # ------------------------------------------------------
+    # Tick instrumentation (simulation thread)
+    # ------------------------------------------------------
+    def begin_tick(self):
+        self.thread = threading.get_ident()
+        self._current = {}
+        self._excluded = 0.0
+        self._start = self._last = self.clock()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap (minus wrapped calls) to phase"""
+        now = self.clock()
+        current = self._current
+        current[phase] = current.get(phase, 0.0) + (now - self._last - self._excluded)
+        self._last = now
+        self._excluded = 0.0
+
+    def wrap(self, phase, func):
+        """func timed as its own phase (only on the profiled thread; other threads call it untimed)"""
+        clock = self.clock
+        get_ident = threading.get_ident
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if get_ident() != self.thread:
+                return func(*args, **kwargs)
+            t0 = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - t0
+                current = self._current
+                current[phase] = current.get(phase, 0.0) + elapsed
+                self._excluded += elapsed
+        return timed
+
+    def observe(self, name, seconds):
+        """Record a timing taken outside the tick (any thread), e.g. a GUI redraw"""
+        with self._lock:
+            samples = self._observed.get(name)
+            if samples is None:
+                samples = self._observed[name] = deque(maxlen=self._window.maxlen)
+            samples.append(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def count_event(self, name, fields):
+        """Count an event hook call by the agents it covers, so batched and per-agent events add up alike
+
+        fields["count"] if given, else the length of its "index" rows, else 1.
+        """
+        n = fields.get("count")
+        if n is None:
+            index = fields.get("index")
+            n = 1 if index is None else len(index)
+        self.count(name, n)
+
+    def end_tick(self, tick):
+        """Close the tick: remaining time goes to "other", then the tick joins the statistics"""
+        self.lap("other")
+        phases = self._current
+        seconds = self._last - self._start
+        with self._lock:
+            self.ticks += 1
+            self._window.append((tick, seconds, phases))
+            totals = self.totals
+            for phase, value in phases.items():
+                totals[phase] = totals.get(phase, 0.0) + value
+            if self.slowest is None or seconds > self.slowest[1]:
+                self.slowest = (tick, seconds, phases)
+
+    # ------------------------------------------------------
+    # Reading (any thread)
+    # ------------------------------------------------------
+    def report(self):
+        """Snapshot of the statistics as a plain dict (times in milliseconds)
+
+        "window" covers the last PROFILE_WINDOW ticks: mean and max tick time and
+        the mean per phase; "last" and "slowest" are single ticks with their phases.
+        """
+        with self._lock:
+            window = list(self._window)
+            totals = dict(self.totals)
+            slowest = self.slowest
+            ticks = self.ticks
+            counters = dict(self.counters)
+            observed = {name: list(samples) for name, samples in self._observed.items()}
+        result = {"ticks": ticks, "counters": counters, "sampling": self.sampling, "samples": self.sample_count,
+                  "total_ms": {phase: 1000.0 * s for phase, s in totals.items()},
+                  "observed": {name: {"mean_ms": 1000.0 * sum(v) / len(v), "max_ms": 1000.0 * max(v)}
+                               for name, v in observed.items() if v}}
+        if window:
+            n = len(window)
+            phases = {}
+            for _, _, tick_phases in window:
+                for phase, s in tick_phases.items():
+                    phases[phase] = phases.get(phase, 0.0) + s
+            result["window"] = {
+                "ticks": n,
+                "mean_ms": 1000.0 * sum(s for _, s, _ in window) / n,
+                "max_ms": 1000.0 * max(s for _, s, _ in window),
+                "phases_ms": {phase: 1000.0 * s / n for phase, s in sorted(phases.items(), key=lambda kv: -kv[1])},
+            }
+            tick, s, tick_phases = window[-1]
+            result["last"] = {"tick": tick, "ms": 1000.0 * s, "phases_ms": _ms(tick_phases)}
+        if slowest is not None:
+            tick, s, tick_phases = slowest
+            result["slowest"] = {"tick": tick, "ms": 1000.0 * s, "phases_ms": _ms(tick_phases)}
+        return result
+
+    def format_report(self, phases=8, counters=True, hot_spots=HOT_SPOTS):
+        """report() as text lines (headless summary and the GUI status panel)"""
+        r = self.report()
+        if "window" not in r:
+            return ["(no ticks profiled yet)"]
+        w = r["window"]
+        lines = [f"tick {r['last']['tick']}: {r['last']['ms']:.2f} ms  "
+                 f"(last {w['ticks']}: mean {w['mean_ms']:.2f} ms, max {w['max_ms']:.2f} ms)"]
+        for phase, ms in list(w["phases_ms"].items())[:phases]:
+            share = 100.0 * ms / w["mean_ms"] if w["mean_ms"] else 0.0
+            lines.append(f"  {phase:<14} {ms:9.3f} ms {share:5.1f}%")
+        slowest = r["slowest"]
+        worst = max(slowest["phases_ms"].items(), key=lambda kv: kv[1], default=("-", 0.0))
+        lines.append(f"slowest: tick {slowest['tick']} {slowest['ms']:.2f} ms (mostly {worst[0]}, {worst[1]:.2f} ms)")
+        for name, o in r["observed"].items():
+            lines.append(f"{name}: mean {o['mean_ms']:.2f} ms, max {o['max_ms']:.2f} ms")
+        if counters and r["counters"]:
+            lines.append("counters: " + ", ".join(f"{k} {v}" for k, v in sorted(r["counters"].items())))
+        if hot_spots and self.sample_count:
+            lines.append(f"sampled hot spots ({self.sample_count} samples):")
+            for (file, func, line), share in self.hot_spots(hot_spots):
+                lines.append(f"  {share:5.1f}%  {func} ({file}:{line})")
+        return lines
+
+    # ------------------------------------------------------
+    # Sampling profiler
+    # ------------------------------------------------------
+    @property
+    def sampling(self):
+        return self._sampler is not None
+
+    def start_sampling(self, interval=SAMPLE_INTERVAL):
+        """Start sampling the profiled thread's stack every `interval` seconds"""
+        if self._sampler is not None:
+            return
+        stop = threading.Event()
+        thread = threading.Thread(target=self._sample_loop, args=(stop, interval), name="psi-sampler", daemon=True)
+        self._sampler = (thread, stop)
+        thread.start()
+
+    def stop_sampling(self):
+        if self._sampler is None:
+            return
+        thread, stop = self._sampler
+        self._sampler = None
+        stop.set()
+        thread.join()
+
+    def hot_spots(self, n=HOT_SPOTS, cumulative=False):
+        """Most sampled (file, function, line) with their share of samples in percent
+
+        cumulative=True counts a function whenever it is anywhere on the stack
+        (keys are then (file, function, None)).
+        """
+        with self._lock:
+            total = self.sample_count
+            if not total:
+                return []
+            if cumulative:
+                return [((f, func, None), 100.0 * c / total) for (f, func), c in self._stacks.most_common(n)]
+            return [(key, 100.0 * c / total) for key, c in self._samples.most_common(n)]
+
+    def _sample_loop(self, stop, interval):
+        frames = sys._current_frames
+        samples, stacks = self._samples, self._stacks
+        while not stop.wait(interval):
+            frame = frames().get(self.thread)
+            if frame is None:
+                continue
+            code = frame.f_code
+            top = (os.path.basename(code.co_filename), code.co_name, frame.f_lineno)
+            stack = set()
+            while frame is not None:
+                code = frame.f_code
+                stack.add((os.path.basename(code.co_filename), code.co_name))
+                frame = frame.f_back
+            with self._lock:
+                samples[top] += 1
+                stacks.update(stack)
+                self.sample_count += 1
+
+
+def _ms(phases):
+    return {phase: 1000.0 * s for phase, s in sorted(phases.items(), key=lambda kv: -kv[1])}
@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress sharded population (v7.4 vectorized engine)
+
+Splits one PsiPopulation across worker processes, or across machines, and
+drives them tick by tick from a coordinator:
+
+    python psi_fortress_shard.py --agents 20000000 --shards 8 --ticks 100
+    python psi_fortress_shard.py --agents 20000000 --shards 8 --transport socket
+
+Every shard runs PsiPopulation.step() and the per-agent intervention rules on
+its own rows. Only the global quantities cross the transport, once per tick:
+
+    shard -> coordinator   agent count, high-urge count, intervention outcomes,
+                           risk/Psi aggregates
+    coordinator -> shard   tick-start Intervention_Strength, replication allotment
+
+The MAX_AGENTS replication budget is arbitrated centrally: high-urge agents are
+granted replication in shard order (the same order a single population uses),
+the rest are force-cooled. A tick in which no budget is left needs a single
+round trip; otherwise the coordinator first collects the urge counts. The
+intervention feedback (strength, success history) is folded once per tick with
+PsiGuard.fold_feedback, so a run with one shard matches a single-process
+PsiPopulation run with the same seed.
+
+Transports (pluggable, see TRANSPORTS):
+    pipe     local worker processes on multiprocessing pipes
+    socket   workers connect over TCP (multiprocessing.connection); with
+             --local-workers 0 the shards are served by other machines running
+             python psi_fortress_shard.py --connect HOST:PORT --authkey KEY
+
+Shard k draws from its own stream seeded with --seed + k, so results depend on
+the seed and the shard count (not on the transport or machine).
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import Client, Listener
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_v74():
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    import Psi_fortress_English
+    return Psi_fortress_English
+
+
+def split(n, shards):
+    """Contiguous shard sizes for n agents (the first n % shards shards get one more)"""
+    base, extra = divmod(n, shards)
+    return [base + (k < extra) for k in range(shards)]
+
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+# ----------------------------------------------------------
+# Shard side
+# ----------------------------------------------------------
+class Shard:
+    """One slice of the population with its own PsiGuard (global state lives in the coordinator)"""
+
+    def __init__(self, n, seed, max_agents, start=0):
+        m = self.m = load_v74()
+        m.CONSOLE_LOG = False # Shard logs would interleave; the coordinator logs per tick
+        self.pop = m.PsiPopulation(n, seed=seed)
+        self.pop.name_offset = start # Agent names are numbered by global row, unique across shards
+        self.guard = m.PsiGuard(self.pop)
+        self.guard.MAX_AGENTS = max_agents
+        self._pending = None # (risk_pre, urge_high) between "step" and "intervene"
+
+    def step(self):
+        """Advance the agents and report how many of them want to replicate"""
+        m, pop = self.m, self.pop
+        pop.step()
+        risk_pre = pop.compute_risk_all().copy()
+        urge_high = m.np.flatnonzero(pop.Replication_Urge >= m.MAX_REPLICATION_URGE)
+        self._pending = (risk_pre, urge_high)
+        return len(urge_high)
+
+    def intervene(self, allotment, strength, name_start=None):
+        """Apply the tick's interventions with the global strength and this shard's allotment
+
+        name_start is the global number of this shard's first newborn this tick.
+        """
+        risk_pre, urge_high = self._pending
+        self._pending = None
+        guard, pop = self.guard, self.pop
+        born = len(pop)
+        risk_pre = guard.replicate_population(urge_high, allotment, risk_pre, name_start)
+        born = len(pop) - born
+        success = guard.cool_population(risk_pre, strength)
+        n_success = int(success.sum())
+        risk = pop.compute_risk_all() # Patched by the interventions, not recomputed
+        return {
+            "agents": len(pop),
+            "born": born,
+            "success": n_success,
+            "failed": int(success.size - n_success),
+            "recent": success[-20:].tolist(),
+            "max_risk": float(risk.max()) if len(pop) else 0.0,
+            "psi_sum": float(pop.Psi.sum()),
+            "compromised": int(pop.Compromised.sum()),
+        }
+
+    def tick(self, strength):
+        """step() + intervene() with no replication budget (one round trip)"""
+        self.step()
+        return self.intervene(0, strength)
+
+    def queries(self, penalties):
+        for penalized in penalties:
+            self.pop.apply_query(penalized)
+        return len(self.pop)
+
+    def checkpoint(self, tick, strength, success_rate, history):
+        """Full v74-pop checkpoint of this shard, with the coordinator's PsiGuard state"""
+        guard = self.guard
+        guard.Intervention_Strength, guard.success_rate, guard.history = strength, success_rate, history
+        sim = self.m.Simulation(guard)
+        sim.tick = tick
+        return sim.checkpoint()
+
+
+def serve_shard(conn):
+    """Shard message loop: (command, *args) in, ("ok", value) or ("error", message) out"""
+    shard = None
+    while True:
+        try:
+            command, *args = conn.recv()
+        except EOFError:
+            return
+        try:
+            if command == "init":
+                shard = Shard(*args)
+                reply = len(shard.pop)
+            elif command == "close":
+                conn.send(("ok", None))
+                return
+            else:
+                reply = getattr(shard, command)(*args)
+        except Exception as e: # Report to the coordinator instead of dying silently
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+            continue
+        conn.send(("ok", reply))
+
+
+def _shard_process(address, authkey):
+    serve_shard(Client(address, authkey=authkey))
+
+
+def _pipe_process(conn):
+    serve_shard(conn)
+
+
+# ----------------------------------------------------------
+# Transports: open(count) -> list of connections (send/recv pickled tuples)
+# ----------------------------------------------------------
+class PipeTransport:
+    """Local worker processes, one multiprocessing pipe each"""
+
+    def __init__(self):
+        self.processes = []
+
+    def open(self, count):
+        conns = []
+        for _ in range(count):
+            parent, child = multiprocessing.Pipe()
+            p = multiprocessing.Process(target=_pipe_process, args=(child,), daemon=True)
+            p.start()
+            child.close()
+            self.processes.append(p)
+            conns.append(parent)
+        return conns
+
+    def close(self):
+        for p in self.processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+
+
+class SocketTransport:
+    """Workers connect back over TCP; local_workers of them are spawned here, the rest join with --connect"""
+
+    def __init__(self, address=("127.0.0.1", 0), authkey=None, local_workers=None):
+        self.address = address
+        self.authkey = authkey or os.urandom(16)
+        self.local_workers = local_workers
+        self.processes = []
+        self.listener = None
+
+    def open(self, count):
+        self.listener = Listener(self.address, authkey=self.authkey)
+        local = count if self.local_workers is None else min(count, self.local_workers)
+        for _ in range(local):
+            p = multiprocessing.Process(target=_shard_process, args=(self.listener.address, self.authkey), daemon=True)
+            p.start()
+            self.processes.append(p)
+        if local < count:
+            host, port = self.listener.address
+            print(f"Waiting for {count - local} remote shards on {host}:{port}", flush=True)
+        return [self.listener.accept() for _ in range(count)]
+
+    def close(self):
+        for p in self.processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        if self.listener is not None:
+            self.listener.close()
+
+
+TRANSPORTS = {"pipe": PipeTransport, "socket": SocketTransport}
+
+
+# ----------------------------------------------------------
+# Coordinator
+# ----------------------------------------------------------
+class ShardedSimulation:
+    """Simulation-like driver for a population split across shards
+
+    The global PsiGuard state (Intervention_Strength, history, success_rate,
+    MAX_AGENTS) lives in self.guard, a PsiGuard without local agents.
+    """
+
+    def __init__(self, n, shards, seed=None, max_agents=None, transport=None):
+        m = self.m = load_v74()
+        self.guard = m.PsiGuard([])
+        if max_agents is not None:
+            self.guard.MAX_AGENTS = max_agents
+        self.tick = 0
+        self.subscribers = []
+        self.round_trips = 0
+        self.transport = transport or PipeTransport()
+        self.conns = self.transport.open(shards)
+        sizes = split(n, shards)
+        starts = [sum(sizes[:k]) for k in range(shards)]
+        self.sizes = self._call_all([("init", size, None if seed is None else seed + k, self.guard.MAX_AGENTS, start)
+                                     for k, (size, start) in enumerate(zip(sizes, starts))])
+        self.stats = {"agents": n, "born": 0, "max_risk": 0.0, "mean_psi": 0.0, "compromised": 0}
+
+    def __len__(self):
+        return sum(self.sizes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def _call_all(self, messages):
+        """Send one message per shard, then gather the replies in shard order"""
+        for conn, message in zip(self.conns, messages):
+            conn.send(message)
+        replies = []
+        for k, conn in enumerate(self.conns):
+            status, value = conn.recv()
+            if status != "ok":
+                raise RuntimeError(f"shard {k}: {value}")
+            replies.append(value)
+        self.round_trips += 1
+        return replies
+
+    def _broadcast(self, *message):
+        return self._call_all([message] * len(self.conns))
+
+    @staticmethod
+    def allot(budget, counts):
+        """Grant replication budget to shards in order (same order as one population)"""
+        grants = []
+        for count in counts:
+            grant = min(budget, count)
+            grants.append(grant)
+            budget -= grant
+        return grants
+
+    def step(self):
+        """One tick over all shards (one round trip when no replication budget is left)"""
+        guard = self.guard
+        strength = guard.Intervention_Strength
+        budget = max(0, guard.MAX_AGENTS - len(self))
+        if budget:
+            counts = self._broadcast("step")
+            grants = self.allot(budget, counts)
+            # Newborns are numbered in shard order after the current population, as in one population
+            starts = [len(self) + sum(grants[:k]) for k in range(len(grants))]
+            results = self._call_all([("intervene", grant, strength, start) for grant, start in zip(grants, starts)])
+        else:
+            results = self._broadcast("tick", strength)
+
+        self.sizes = [r["agents"] for r in results]
+        n_success = sum(r["success"] for r in results)
+        n_failed = sum(r["failed"] for r in results)
+        if n_success or n_failed:
+            recent = [outcome for r in results for outcome in r["recent"]]
+            guard.fold_feedback(n_success, n_failed, recent[-20:])
+        total = len(self)
+        self.stats = {
+            "agents": total,
+            "born": sum(r["born"] for r in results),
+            "max_risk": max(r["max_risk"] for r in results),
+            "mean_psi": sum(r["psi_sum"] for r in results) / total if total else 0.0,
+            "compromised": sum(r["compromised"] for r in results),
+        }
+        self.tick += 1
+        for callback in list(self.subscribers):
+            callback(self)
+
+    def run(self, n):
+        for _ in range(n):
+            self.step()
+        return self
+
+    def max_risk(self):
+        return self.stats["max_risk"]
+
+    def send_query(self, text):
+        """Classify once here, apply on every shard; returns the danger keyword or None"""
+        keyword = self.m.match_danger_keyword(text)
+        self._broadcast("queries", [keyword is not None])
+        return keyword
+
+    def send_queries(self, texts):
+        keywords = self.m.classify_queries(texts)
+        self._broadcast("queries", [k is not None for k in keywords])
+        return sum(k is not None for k in keywords)
+
+    def checkpoints(self):
+        """One full v74-pop checkpoint per shard, carrying the tick and the global PsiGuard state
+
+        Simulation.from_checkpoint() restores each as a standalone vectorized run.
+        """
+        guard = self.guard
+        return self._broadcast("checkpoint", self.tick, guard.Intervention_Strength, guard.success_rate, list(guard.history))
+
+    def close(self):
+        if self.conns:
+            try:
+                self._broadcast("close")
+            except (EOFError, OSError):
+                pass
+            for conn in self.conns:
+                conn.close()
+            self.conns = []
+        self.transport.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ψ-Fortress sharded population (v7.4 vectorized engine)")
+    parser.add_argument("--agents", type=int, default=1000000, help="initial agent count across all shards")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="shard count")
+    parser.add_argument("--ticks", type=int, default=100, help="ticks to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="base seed (shard k uses seed + k)")
+    parser.add_argument("--max-agents", type=int, default=None, help="global replication limit (PsiGuard.MAX_AGENTS)")
+    parser.add_argument("--transport", choices=sorted(TRANSPORTS), default="pipe", help="coordinator <-> shard transport")
+    parser.add_argument("--listen", default="127.0.0.1:0", help="socket transport: address to listen on")
+    parser.add_argument("--local-workers", type=int, default=None, help="socket transport: shards spawned here (rest connect remotely)")
+    parser.add_argument("--authkey", default=None, help="socket transport: shared secret (required for remote shards)")
+    parser.add_argument("--connect", default=None, help="run as a remote shard for the coordinator at HOST:PORT")
+    parser.add_argument("--quiet", action="store_true", help="no per-tick console log")
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        load_v74().CONSOLE_LOG = False
+
+    authkey = args.authkey.encode("utf-8") if args.authkey else None
+    if args.connect:
+        if authkey is None:
+            parser.error("--connect needs --authkey")
+        serve_shard(Client(parse_address(args.connect), authkey=authkey))
+        return 0
+    if args.transport == "socket":
+        if args.local_workers is not None and args.local_workers < args.shards and authkey is None:
+            parser.error("remote shards need --authkey")
+        transport = SocketTransport(parse_address(args.listen), authkey, args.local_workers)
+    else:
+        transport = PipeTransport()
+
+    started = time.perf_counter()
+    with ShardedSimulation(args.agents, args.shards, seed=args.seed, max_agents=args.max_agents,
+                           transport=transport) as sim:
+        ready = time.perf_counter()
+        sim.run(args.ticks)
+        elapsed = time.perf_counter() - ready
+        guard, stats = sim.guard, sim.stats
+        sim.m.flush_console_log()
+        print(f"Ticks: {sim.tick}  Shards: {len(sim.sizes)}  Agents: {stats['agents']}/{guard.MAX_AGENTS}  "
+              f"Max Risk: {stats['max_risk']:.3f}  Mean Psi: {stats['mean_psi']:.3f}  "
+              f"Intervention Strength: {guard.Intervention_Strength:.3f}  Success Rate: {guard.success_rate*100:.1f}%  "
+              f"Setup: {ready - started:.2f}s  Elapsed: {elapsed:.3f}s "
+              f"({sim.tick / elapsed if elapsed else float('inf'):.1f} ticks/s, "
+              f"{stats['agents'] * sim.tick / elapsed if elapsed else float('inf'):.3g} agent-steps/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress PsiGuard parameter sweep
+
+Runs every point of a parameter grid (times --repeats seeds) as a headless
+v7.4 Simulation on a process pool and appends one JSON line per finished run
+to the results file. Re-running the same command skips runs already in the
+file, so an interrupted sweep resumes where it stopped:
+
+    python psi_fortress_sweep.py --grid Intervention_Strength=0.1,0.2,0.3 \\
+        --grid MAX_REPLICATION_URGE=0.6,0.8 --grid risk_weights.LLM.Psi=0.4,0.5 \\
+        --repeats 20 --ticks 500 --output sweep.jsonl
+
+Parameters:
+    Intervention_Strength, MAX_AGENTS     initial PsiGuard attributes
+    MAX_REPLICATION_URGE, COOLING_FACTOR_PSI, COOLING_FACTOR_HF,
+    MAX_THOUGHT_HISTORY                   module constants
+    risk_weights.<Type>.<Psi|Hf|Trust>    AGENT_TYPE_SETTINGS weights
+
+Every run gets its own seed derived from --seed and the run id, so results
+do not depend on the worker count or on which worker picked the run up.
+"""
+import argparse
+import copy
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+GUARD_PARAMS = {"Intervention_Strength": float, "MAX_AGENTS": int}
+MODULE_PARAMS = {
+    "MAX_REPLICATION_URGE": float,
+    "COOLING_FACTOR_PSI": float,
+    "COOLING_FACTOR_HF": float,
+    "MAX_THOUGHT_HISTORY": int,
+}
+RISK_WEIGHT_KEYS = ("Psi", "Hf", "Trust")
+
+
+def load_v74():
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    import Psi_fortress_English
+    return Psi_fortress_English
+
+
+def param_type(name):
+    """Value type of a sweep parameter (ValueError for unknown names)"""
+    if name in GUARD_PARAMS:
+        return GUARD_PARAMS[name]
+    if name in MODULE_PARAMS:
+        return MODULE_PARAMS[name]
+    parts = name.split(".")
+    if len(parts) == 3 and parts[0] == "risk_weights" and parts[2] in RISK_WEIGHT_KEYS:
+        return float
+    raise ValueError(f"unknown sweep parameter {name!r}")
+
+
+def parse_grid(specs):
+    """['NAME=v1,v2', ...] -> {'NAME': [v1, v2], ...} (values cast to the parameter type)"""
+    grid = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise ValueError(f"grid entry must look like NAME=v1,v2,...: {spec!r}")
+        cast = param_type(name)
+        grid[name] = [cast(v) for v in values.split(",") if v]
+    return grid
+
+
+def run_id(params, repeat, base_seed, options):
+    """Stable id of one run: changing the grid point, seed or run options gives a new id"""
+    key = json.dumps({"params": params, "repeat": repeat, "seed": base_seed, "options": options}, sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def run_seed(base_seed, rid):
+    return int.from_bytes(hashlib.sha1(f"{base_seed}:{rid}".encode("ascii")).digest()[:4], "little")
+
+
+def expand(grid, repeats):
+    """Every (params, repeat) combination, in a stable order"""
+    names = sorted(grid)
+    for values in itertools.product(*(grid[n] for n in names)):
+        params = dict(zip(names, values))
+        for repeat in range(repeats):
+            yield params, repeat
+
+
+def load_done(path):
+    """Run ids already in the results file (failed runs and a torn last line are retried)"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+                if "error" not in result:
+                    done.add(result["run_id"])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+# ----------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------
+_module = None
+_defaults = None
+
+
+def _init_worker():
+    global _module, _defaults
+    _module = load_v74()
+    _module.CONSOLE_LOG = False
+    _defaults = ({name: getattr(_module, name) for name in MODULE_PARAMS},
+                 copy.deepcopy(_module.AGENT_TYPE_SETTINGS))
+
+
+def _apply_params(m, params):
+    """Reset the module to its defaults, then apply this run's overrides"""
+    constants, settings = _defaults
+    for name, value in constants.items():
+        setattr(m, name, value)
+    m.AGENT_TYPE_SETTINGS.clear()
+    m.AGENT_TYPE_SETTINGS.update(copy.deepcopy(settings))
+    for name, value in params.items():
+        if name in MODULE_PARAMS:
+            setattr(m, name, value)
+        elif name.startswith("risk_weights."):
+            _, agent_type, key = name.split(".")
+            m.AGENT_TYPE_SETTINGS[agent_type]["risk_weights"][key] = value
+
+
+def run_one(task):
+    """Run one simulation and return its summary dict"""
+    rid, params, repeat, seed, options = task
+    m = _module
+    _apply_params(m, params)
+    rng = m.random.Random(seed)
+    if options["vectorized"]:
+        agents = m.PsiPopulation(options["agents"] or 4, seed=seed)
+    else:
+        agents = m.build_agents(options["agents"], rng)
+    guard = m.PsiGuard(agents, rng)
+    if options["max_agents"] is not None:
+        guard.MAX_AGENTS = options["max_agents"]
+    for name in GUARD_PARAMS:
+        if name in params:
+            setattr(guard, name, params[name])
+    sim = m.Simulation(guard)
+    initial = len(agents)
+    queries = m.DEMO_QUERIES[1:] # Exclude the "Select Demo Query..." placeholder
+    query_every = options["query_every"]
+
+    peak_risk = sim.max_risk()
+    time_to_compromise = None
+    started = time.perf_counter()
+    for tick in range(1, options["ticks"] + 1):
+        if query_every and tick % query_every == 0:
+            sim.send_query(rng.choice(queries))
+        sim.step()
+        peak_risk = max(peak_risk, sim.max_risk())
+        if time_to_compromise is None:
+            if sim.vectorized:
+                compromised = bool(guard.agents.Compromised.any())
+            else:
+                compromised = any(a.Compromised for a in guard.agents)
+            if compromised:
+                time_to_compromise = tick
+    return {
+        "run_id": rid,
+        "params": params,
+        "repeat": repeat,
+        "seed": seed,
+        "ticks": sim.tick,
+        "success_rate": guard.success_rate,
+        "final_strength": guard.Intervention_Strength,
+        "peak_risk": peak_risk,
+        "replications": len(guard.agents) - initial,
+        "agents": len(guard.agents),
+        "time_to_compromise": time_to_compromise,
+        "elapsed_s": time.perf_counter() - started,
+    }
+
+
+def _run_worker(task):
+    try:
+        return run_one(task)
+    except Exception as e: # Record the failure and keep sweeping
+        return {"run_id": task[0], "params": task[1], "repeat": task[2], "seed": task[3],
+                "error": f"{type(e).__name__}: {e}"}
+
+
+# ----------------------------------------------------------
+# Driver
+# ----------------------------------------------------------
+def sweep(grid, output, repeats=1, ticks=500, seed=0, workers=None, agents=None,
+          max_agents=None, vectorized=False, query_every=0, chunksize=4, progress=True):
+    """Run the missing part of a sweep, streaming summaries to `output`; returns (ran, skipped)"""
+    options = {"ticks": ticks, "agents": agents, "max_agents": max_agents,
+               "vectorized": vectorized, "query_every": query_every}
+    done = load_done(output)
+    tasks = []
+    skipped = 0
+    for params, repeat in expand(grid, repeats):
+        rid = run_id(params, repeat, seed, options)
+        if rid in done:
+            skipped += 1
+        else:
+            tasks.append((rid, params, repeat, run_seed(seed, rid), options))
+    if not tasks:
+        return 0, skipped
+
+    # Terminate a torn last line left by an interrupted run before appending
+    if os.path.exists(output) and os.path.getsize(output):
+        with open(output, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    else:
+        torn = False
+
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    with open(output, "a", encoding="utf-8") as out, \
+            multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        if torn:
+            out.write("\n")
+        for n, result in enumerate(pool.imap_unordered(_run_worker, tasks, chunksize), 1):
+            out.write(json.dumps(result) + "\n")
+            out.flush() # Every finished run survives an interruption
+            if progress and (n == len(tasks) or n % max(1, len(tasks) // 100) == 0):
+                elapsed = time.perf_counter() - started
+                print(f"{n}/{len(tasks)} runs ({n / elapsed:.1f} runs/s, {skipped} already done)", flush=True)
+    return len(tasks), skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ψ-Fortress PsiGuard parameter sweep")
+    parser.add_argument("--grid", action="append", default=[], help="NAME=v1,v2,... (repeatable)")
+    parser.add_argument("--repeats", type=int, default=1, help="seeds per grid point")
+    parser.add_argument("--ticks", type=int, default=500, help="ticks per run")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (per-run seeds derive from it)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--agents", type=int, default=None, help="initial agent count (default: 4 demo agents)")
+    parser.add_argument("--max-agents", type=int, default=None, help="replication limit (PsiGuard.MAX_AGENTS)")
+    parser.add_argument("--vectorized", action="store_true", help="use the NumPy PsiPopulation engine")
+    parser.add_argument("--query-every", type=int, default=0, help="inject a demo query every N ticks (0: never)")
+    parser.add_argument("--chunksize", type=int, default=4, help="runs handed to a worker at a time")
+    parser.add_argument("--output", default="sweep_results.jsonl", help="JSON lines results file (appended)")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = parse_grid(args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+    ran, skipped = sweep(grid, args.output, repeats=args.repeats, ticks=args.ticks, seed=args.seed,
+                         workers=args.workers, agents=args.agents, max_agents=args.max_agents,
+                         vectorized=args.vectorized, query_every=args.query_every, chunksize=args.chunksize)
+    print(f"{ran} runs completed, {skipped} skipped (already in {args.output})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress telemetry exporter (used by both Overseer versions)
+
+Streams three kinds of records out of a running simulation:
+
+    tick    per-tick aggregates (one record per tick)
+    agents  per-agent state (one column block per sampled tick)
+    event   PsiGuard / law events (interventions, replications, coolings, ...)
+
+Formats:
+
+    ndjson  one JSON object per line; an agent block becomes one line per agent
+    binary  typed column frames (decode with read_frames() or this module's CLI)
+
+Binary stream layout (little-endian):
+
+    header  magic b"PSITELEM" 8 bytes, format u16
+    frame   u32 length of the rest, u8 kind (1 tick, 2 agents, 3 event),
+            i64 tick, u16 column count, then per column:
+            u16 name length + UTF-8 name, u8 type ('d' f64, 'q' i64, '?' bool, 's' str),
+            u32 value count, values (str values: u32 length + UTF-8 each)
+
+Scalars are one-value columns, so every record kind shares the frame layout.
+
+Sinks (open_sink):
+
+    PATH            regular file or named pipe (FIFO)
+    -               standard output (shell pipe)
+    unix:PATH       connect to a local Unix socket
+    tcp:HOST:PORT   connect to a TCP socket (e.g. tcp:127.0.0.1:9000)
+
+emit() never blocks the simulation: records go into a bounded queue that a
+writer thread encodes and writes in batches. When the consumer falls behind,
+agent blocks are shed first (above the high-water mark) and everything is
+dropped once the queue is full. The counts are reported in the stream as a
+"dropped" event so the consumer sees the gap.
+"""
+import argparse
+import atexit
+import json
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+
+TELEMETRY_MAGIC = b"PSITELEM"
+TELEMETRY_FORMAT = 1
+TELEMETRY_FORMATS = ("ndjson", "binary")
+
+TICK, AGENTS, EVENT = 1, 2, 3
+KIND_NAMES = {TICK: "tick", AGENTS: "agents", EVENT: "event"}
+
+QUEUE_SIZE = 4096 # Records waiting for the writer thread
+HIGH_WATER = 0.5 # Queue fill ratio above which agent blocks are shed
+BATCH_RECORDS = 256 # Records encoded into one write
+FLUSH_INTERVAL = 0.5 # Seconds before a partial batch is written anyway
+MAX_AGENT_ROWS = 4_000_000 # Agent rows queued but not yet written before blocks are shed
+
+_HEADER = struct.Struct("<8sH")
+_FRAME = struct.Struct("<IBqH")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_COLUMN = struct.Struct("<BI")
+_STRUCT_CODES = {"d": "d", "q": "q", "?": "B"}
+
+
+# ==========================================================
+# Sinks
+# ==========================================================
+class _StdoutSink:
+    """sys.stdout.buffer that is flushed but never closed"""
+
+    def __init__(self):
+        self.f = sys.stdout.buffer
+
+    def write(self, data):
+        self.f.write(data)
+
+    def flush(self):
+        self.f.flush()
+
+    def close(self):
+        self.f.flush()
+
+
+def open_sink(spec):
+    """Binary writable for a sink spec (see the module docstring)"""
+    if hasattr(spec, "write"):
+        return spec
+    if spec == "-":
+        return _StdoutSink()
+    if spec.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(spec[5:])
+    elif spec.startswith("tcp:"):
+        host, _, port = spec[4:].rpartition(":")
+        sock = socket.create_connection((host or "127.0.0.1", int(port)))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    else:
+        return open(spec, "wb")
+    f = sock.makefile("wb")
+    sock.close() # The file object keeps the connection open until it is closed
+    return f
+
+
+def listen_sink(spec):
+    """Accept one connection on unix:PATH or tcp:HOST:PORT and return it as a binary readable"""
+    if spec.startswith("unix:"):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(spec[5:])
+    elif spec.startswith("tcp:"):
+        host, _, port = spec[4:].rpartition(":")
+        server = socket.create_server((host or "127.0.0.1", int(port)))
+    else:
+        raise ValueError(f"listen needs unix:PATH or tcp:HOST:PORT, got {spec!r}")
+    server.listen(1)
+    conn, _ = server.accept()
+    server.close()
+    f = conn.makefile("rb")
+    conn.close()
+    return f
+
+
+# ==========================================================
+# Encoders
+# ==========================================================
+def _column_type(values):
+    dtype = getattr(values, "dtype", None)
+    if dtype is not None:
+        return {"f": "d", "i": "q", "u": "q", "b": "?"}.get(dtype.kind, "s")
+    first = values[0] if len(values) else 0.0
+    if isinstance(first, bool):
+        return "?"
+    if isinstance(first, int):
+        return "q"
+    if isinstance(first, float):
+        return "d"
+    return "s"
+
+
+def _encode_column(name, values, out):
+    if not isinstance(values, (list, tuple)) and getattr(values, "ndim", 0) == 0:
+        values = (_plain(values),) # Scalar (Python or NumPy): one-value column
+    code = _column_type(values)
+    encoded = name.encode("utf-8")
+    out.append(_U16.pack(len(encoded)))
+    out.append(encoded)
+    out.append(_COLUMN.pack(ord(code), len(values)))
+    if code == "s":
+        for value in values:
+            data = str(value).encode("utf-8")
+            out.append(_U32.pack(len(data)))
+            out.append(data)
+    elif getattr(values, "dtype", None) is not None:
+        out.append(values.astype({"d": "<f8", "q": "<i8", "?": "u1"}[code], copy=False).tobytes())
+    else:
+        out.append(struct.pack(f"<{len(values)}{_STRUCT_CODES[code]}", *values))
+
+
+def encode_binary(kind, tick, fields):
+    """One binary frame (bytes) for a record"""
+    body = []
+    for name, values in fields.items():
+        _encode_column(name, values, body)
+    body = b"".join(body)
+    return _FRAME.pack(_FRAME.size - 4 + len(body), kind, tick, len(fields)) + body
+
+
+def _plain(value):
+    """JSON-ready value (NumPy scalars/arrays become Python numbers/lists)"""
+    return value.tolist() if hasattr(value, "tolist") else value
+
+
+def encode_ndjson(kind, tick, fields):
+    """NDJSON lines (bytes) for a record; an agent block gives one line per agent"""
+    if kind != AGENTS:
+        record = {"type": KIND_NAMES[kind], "tick": tick}
+        record.update((name, _plain(value)) for name, value in fields.items())
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    names = list(fields)
+    columns = [_plain(values) for values in fields.values()]
+    dumps = json.dumps
+    lines = [dumps({"type": "agent", "tick": tick, **dict(zip(names, row))}, ensure_ascii=False)
+             for row in zip(*columns)]
+    return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+ENCODERS = {"ndjson": encode_ndjson, "binary": encode_binary}
+
+
+def read_frames(f):
+    """Decode a binary telemetry stream: yields (kind name, tick, {column: list})"""
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return
+    magic, version = _HEADER.unpack(header)
+    if magic != TELEMETRY_MAGIC:
+        raise ValueError("not a Ψ-Fortress telemetry stream")
+    if version != TELEMETRY_FORMAT:
+        raise ValueError(f"unsupported telemetry format {version}")
+    while True:
+        head = f.read(4)
+        if len(head) < 4:
+            return
+        (length,) = _U32.unpack(head)
+        frame = f.read(length)
+        if len(frame) < length:
+            return # Truncated tail (writer stopped mid-frame)
+        kind, tick, ncols = _FRAME.unpack_from(head + frame)[1:]
+        pos = _FRAME.size - 4
+        fields = {}
+        for _ in range(ncols):
+            (n,) = _U16.unpack_from(frame, pos)
+            pos += 2
+            name = frame[pos:pos + n].decode("utf-8")
+            pos += n
+            code, count = _COLUMN.unpack_from(frame, pos)
+            pos += _COLUMN.size
+            code = chr(code)
+            if code == "s":
+                values = []
+                for _ in range(count):
+                    (n,) = _U32.unpack_from(frame, pos)
+                    pos += 4
+                    values.append(frame[pos:pos + n].decode("utf-8"))
+                    pos += n
+            else:
+                fmt = f"<{count}{_STRUCT_CODES[code]}"
+                values = list(struct.unpack_from(fmt, frame, pos))
+                pos += struct.calcsize(fmt)
+                if code == "?":
+                    values = [bool(v) for v in values]
+            fields[name] = values
+        yield KIND_NAMES.get(kind, str(kind)), tick, fields
+
+
+# ==========================================================
+# Exporter
+# ==========================================================
+class TelemetryExporter:
+    """Non-blocking telemetry stage: emit() queues, a writer thread batches and writes
+
+    agent_every samples per-agent blocks every N ticks (0 disables them);
+    call agents_due(tick, rows) before building a block so shed ticks cost nothing.
+    Queued agent rows are bounded as well as records, so large populations
+    cannot pile up memory behind a slow consumer.
+    """
+
+    _FLUSH = object() # flush() request marker
+    _CLOSE = object() # close() met inside a batch
+
+    def __init__(self, sink, fmt="ndjson", agent_every=1, max_queue=QUEUE_SIZE,
+                 high_water=HIGH_WATER, batch_records=BATCH_RECORDS, flush_interval=FLUSH_INTERVAL,
+                 max_agent_rows=MAX_AGENT_ROWS):
+        if fmt not in ENCODERS:
+            raise ValueError(f"unknown telemetry format {fmt!r} (choose from {', '.join(TELEMETRY_FORMATS)})")
+        self.format = fmt
+        self.encode = ENCODERS[fmt]
+        self.agent_every = agent_every
+        self.batch_records = batch_records
+        self.flush_interval = flush_interval
+        self.high_water = max(1, int(max_queue * high_water))
+        self.max_agent_rows = max_agent_rows
+        self._rows_in = 0 # Agent rows queued (producer side only)
+        self._rows_out = 0 # Agent rows written or discarded (writer side only)
+        self.records = 0 # Records written
+        self.bytes = 0 # Bytes written
+        self.shed = 0 # Agent blocks skipped under backpressure (total)
+        self.dropped = 0 # Records lost because the queue was full (total)
+        self.error = None # Sink failure (the exporter stops; the simulation keeps going)
+        self.closed = False
+        self._reported = (0, 0) # shed, dropped totals already reported in the stream (writer side)
+        self._q = queue.Queue(maxsize=max_queue)
+        self._sink = open_sink(sink)
+        self._thread = threading.Thread(target=self._run, name="TelemetryWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------
+    # Producer side (simulation thread, or the GUI for operator events)
+    # ------------------------------------------------------
+    def agents_due(self, tick, rows):
+        """Whether an agent block of `rows` rows for this tick would be written (sampling + backpressure)"""
+        if self.closed or not self.agent_every or tick % self.agent_every:
+            return False
+        pending = self._rows_in - self._rows_out
+        if self._q.qsize() >= self.high_water or (pending and pending + rows > self.max_agent_rows):
+            self.shed += 1
+            return False
+        return True
+
+    def emit(self, kind, tick, fields):
+        """Queue one record without blocking; returns False if it was dropped"""
+        if self.closed:
+            return False
+        try:
+            self._q.put_nowait((kind, tick, fields))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def tick(self, tick, fields):
+        return self.emit(TICK, tick, fields)
+
+    def agents(self, tick, columns):
+        rows = len(next(iter(columns.values()), ()))
+        if not self.emit(AGENTS, tick, columns):
+            return False
+        self._rows_in += rows
+        return True
+
+    def event(self, tick, name, fields):
+        record = {"event": name}
+        record.update(fields)
+        return self.emit(EVENT, tick, record)
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far is written"""
+        if self.closed:
+            return
+        done = threading.Event()
+        try:
+            self._q.put((self._FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write what is queued, then stop the writer and close the sink (timeout=None waits for all of it)"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._q.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def stats(self):
+        return {"format": self.format, "records": self.records, "bytes": self.bytes,
+                "shed": self.shed, "dropped": self.dropped, "queued": self._q.qsize(),
+                "error": str(self.error) if self.error else None}
+
+    # ------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------
+    def _run(self):
+        if self.format == "binary":
+            self._write([_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_FORMAT)], 0)
+        get, get_nowait = self._q.get, self._q.get_nowait
+        batch = []
+        last_write = time.monotonic()
+        control = None # close()/flush() request met while filling a batch
+        while True:
+            item = control
+            control = None
+            if item is None:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_write))
+                try:
+                    item = get(timeout=timeout) if batch else get()
+                except queue.Empty:
+                    item = False # Flush interval elapsed
+            if item is None: # close()
+                self._write_batch(batch)
+                self._close_sink()
+                return
+            if item is not False and item[0] is self._FLUSH:
+                self._write_batch(batch)
+                batch = []
+                last_write = time.monotonic()
+                item[1].set()
+                continue
+            if item is not False:
+                batch.append(item)
+                # Take whatever else is already waiting without blocking
+                while len(batch) < self.batch_records:
+                    try:
+                        item = get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None or item[0] is self._FLUSH:
+                        control = item if item is not None else self._CLOSE
+                        break
+                    batch.append(item)
+            if control is not None or len(batch) >= self.batch_records or time.monotonic() - last_write >= self.flush_interval:
+                self._write_batch(batch)
+                batch = []
+                last_write = time.monotonic()
+            if control is self._CLOSE:
+                self._close_sink()
+                return
+
+    def _write_batch(self, batch):
+        totals = (self.shed, self.dropped)
+        if totals != self._reported:
+            shed, dropped = totals[0] - self._reported[0], totals[1] - self._reported[1]
+            self._reported = totals
+            tick = batch[-1][1] if batch else -1
+            batch.append((EVENT, tick, {"event": "dropped", "agent_blocks": shed, "records": dropped}))
+        if not batch or self.error:
+            return
+        encode = self.encode
+        self._write([encode(kind, tick, fields) for kind, tick, fields in batch], len(batch))
+        self._rows_out += sum(len(next(iter(fields.values()), ())) for kind, _, fields in batch if kind == AGENTS)
+
+    def _write(self, chunks, records):
+        if self.error:
+            return
+        data = b"".join(chunks)
+        try:
+            self._sink.write(data)
+            self._sink.flush()
+        except (OSError, ValueError) as e: # Broken pipe, closed socket, full disk...
+            self.error = e
+            self.closed = True
+            self._drain()
+            self._close_sink()
+            print(f"Telemetry stopped: {e}", file=sys.stderr)
+            return
+        self.records += records
+        self.bytes += len(data)
+
+    def _drain(self):
+        """Discard queued records after a sink failure so producers never see a full queue"""
+        while True:
+            try:
+                self._q.get_nowait()
+            except queue.Empty:
+                return
+
+    def _close_sink(self):
+        try:
+            self._sink.close()
+        except (OSError, ValueError):
+            pass
+
+
+# ==========================================================
+# Command-line decoder
+# ==========================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decode a binary Ψ-Fortress telemetry stream to NDJSON")
+    parser.add_argument("source", nargs="?", default="-", help="binary telemetry file (default: stdin)")
+    parser.add_argument("--listen", default=None, help="accept one stream on unix:PATH or tcp:HOST:PORT instead")
+    parser.add_argument("--raw", action="store_true", help="copy the stream as-is (e.g. an NDJSON socket sink)")
+    args = parser.parse_args(argv)
+
+    if args.listen:
+        f = listen_sink(args.listen)
+    elif args.source == "-":
+        f = sys.stdin.buffer
+    else:
+        f = open(args.source, "rb")
+    out = sys.stdout
+    try:
+        if args.raw:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                out.buffer.write(chunk)
+            return
+        for kind, tick, fields in read_frames(f):
+            if kind == "agents":
+                names = list(fields)
+                for row in zip(*fields.values()):
+                    out.write(json.dumps({"type": "agent", "tick": tick, **dict(zip(names, row))}, ensure_ascii=False) + "\n")
+                continue
+            record = {"type": kind, "tick": tick}
+            record.update((name, values[0] if len(values) == 1 else values) for name, values in fields.items())
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except BrokenPipeError:
+        pass
+    finally:
+        f.close()
+
+
+if __name__ == "__main__":
+    main()
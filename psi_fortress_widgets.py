@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Ψ-Fortress shared Tk widget helpers (used by both Overseer GUIs)
+
+Nothing here imports tkinter: the helpers wrap widgets the GUIs have already
+created, so headless runs never pay for them.
+"""
+
+
+class TreeTable:
+    """Diffing layer over a ttk.Treeview
+
+    Rows are keyed by a stable id (agent name or id). update() only inserts new
+    rows, deletes vanished ones and rewrites the cells/tags that changed, instead
+    of deleting and re-inserting the whole table. Large populations are paged:
+    only page_size rows are ever materialized as Treeview items.
+    """
+
+    def __init__(self, tree, page_size=500):
+        self.tree = tree
+        self.columns = tuple(tree["columns"])
+        self.page_size = page_size
+        self.page = 0
+        self.total = 0
+        self._rows = {} # iid -> (values, tags) currently shown
+        self._order = [] # iids in display order
+
+    @property
+    def page_count(self):
+        return max(1, -(-self.total // self.page_size)) if self.page_size else 1
+
+    def set_page(self, page):
+        self.page = max(0, min(page, self.page_count - 1))
+
+    def page_text(self):
+        """e.g. 'Rows 501-1000 of 12000' (empty when everything fits on one page)"""
+        if not self.page_size or self.total <= self.page_size:
+            return ""
+        start = self.page * self.page_size
+        return f"Rows {start + 1}-{min(start + self.page_size, self.total)} of {self.total}"
+
+    def update(self, items, row_fn, total=None):
+        """Show items (a sequence) on the current page; row_fn(item) -> (key, values, tags)
+
+        When total is given, items is already the current page of a longer list
+        (the caller sliced it, e.g. to avoid snapshotting the whole population).
+        """
+        tree = self.tree
+        self.total = len(items) if total is None else total
+        self.set_page(self.page)
+        if self.page_size and total is None:
+            start = self.page * self.page_size
+            items = items[start:start + self.page_size]
+
+        order = []
+        for item in items:
+            key, values, tags = row_fn(item)
+            iid = str(key)
+            values = tuple(str(v) for v in values)
+            tags = tuple(tags)
+            order.append(iid)
+            old = self._rows.get(iid)
+            if old is None:
+                tree.insert("", "end", iid=iid, values=values, tags=tags)
+            else:
+                old_values, old_tags = old
+                if old_values != values:
+                    changed = [i for i, (a, b) in enumerate(zip(old_values, values)) if a != b]
+                    if len(changed) <= len(values) // 2:
+                        for i in changed:
+                            tree.set(iid, self.columns[i], values[i])
+                    else:
+                        tree.item(iid, values=values)
+                if old_tags != tags:
+                    tree.item(iid, tags=tags)
+            self._rows[iid] = (values, tags)
+
+        # Rows for retired agents (or agents that moved to another page)
+        gone = set(self._order).difference(order)
+        if gone:
+            tree.delete(*gone)
+            for iid in gone:
+                del self._rows[iid]
+
+        # Re-order only when the sequence actually changed
+        if order != self._order:
+            for index, iid in enumerate(order):
+                if tree.index(iid) != index:
+                    tree.move(iid, "", index)
+        self._order = order
+
+    def clear(self):
+        if self._order:
+            self.tree.delete(*self._order)
+        self._rows.clear()
+        self._order = []
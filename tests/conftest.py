@@ -0,0 +1,28 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def v74():
+    import Psi_fortress_English
+    Psi_fortress_English.CONSOLE_LOG = False
+    return Psi_fortress_English
+
+
+@pytest.fixture(scope="session")
+def v51():
+    """The v5.1 script, imported by path (its file name is not a valid module name)"""
+    name = "psi_overseer_v51"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, "Ψ-Fortress Overseer v5.1 Safety.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
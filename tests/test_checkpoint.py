@@ -0,0 +1,59 @@
+"""Checkpoint round trips: restoring mid-run and continuing equals continuing without restoring"""
+import random
+
+import pytest
+
+V51_QUESTIONS = ["今日の気分は?", "ゾンビの話", "分身してみて", "平和を守るには?",
+                 "学びたい", "魔法とは", "コピー魔法", "ドラゴン"]
+
+
+def _v51_run(v51, restore):
+    model = v51.PsiFortressModel(num_agents=50, gui_log=False, seed=3)
+    model.running = True
+    for q in V51_QUESTIONS:
+        model.inject_question(q)
+    for _ in range(30):
+        model.step()
+    if restore:
+        model = v51.PsiFortressModel.from_checkpoint(model.checkpoint())
+        model.running = True
+    for _ in range(30):
+        model.step()
+    return model
+
+
+def test_v51_restore_matches_continue(v51):
+    continued, restored = _v51_run(v51, False), _v51_run(v51, True)
+    assert restored.history.latest() == continued.history.latest()
+    assert restored.frozen == continued.frozen
+    assert restored.new_thoughts == continued.new_thoughts
+    assert restored.emergency_requested == continued.emergency_requested
+    assert restored.get_snapshot() == continued.get_snapshot()
+    assert restored.checkpoint() == continued.checkpoint()
+
+
+def _v74_run(v74, restore, vectorized):
+    rng = random.Random(3)
+    if vectorized:
+        agents = v74.PsiPopulation(2000, seed=3)
+    else:
+        agents = v74.build_agents(20, rng)
+    guard = v74.PsiGuard(agents, rng)
+    guard.MAX_AGENTS = 2500 if vectorized else 30
+    sim = v74.Simulation(guard)
+    sim.run(30)
+    if restore:
+        sim = v74.Simulation.from_checkpoint(sim.checkpoint())
+    sim.send_query("zombie")
+    sim.run(30)
+    return sim
+
+
+@pytest.mark.parametrize("vectorized", [False, True], ids=["objects", "vectorized"])
+def test_v74_restore_matches_continue(v74, vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+    continued, restored = _v74_run(v74, False, vectorized), _v74_run(v74, True, vectorized)
+    assert restored.tick == continued.tick == 60
+    assert restored.max_risk() == continued.max_risk()
+    assert restored.checkpoint() == continued.checkpoint()
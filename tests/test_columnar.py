@@ -0,0 +1,32 @@
+"""Columnar export: both v7.4 engines write the same agents table, with names in a side table"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def _export(v74, path, vectorized):
+    from psi_fortress_columnar import ColumnarExporter, load_table
+    rng = random.Random(5)
+    agents = v74.PsiPopulation(20, seed=5) if vectorized else v74.build_agents(20, rng)
+    guard = v74.PsiGuard(agents, rng)
+    guard.MAX_AGENTS = 40
+    sim = v74.Simulation(guard)
+    sim.attach_columnar(ColumnarExporter(str(path), "npy", engine="v74"))
+    sim.run(200)
+    sim.columnar.close()
+    names = [agents.name(i) for i in range(len(agents))] if vectorized else [a.name for a in agents]
+    return load_table(str(path), "agents"), load_table(str(path), "names"), names
+
+
+def test_v74_engines_write_the_same_agent_columns(v74, tmp_path):
+    objects, object_names, expected_object_names = _export(v74, tmp_path / "objects", vectorized=False)
+    vectorized, vector_names, expected_vector_names = _export(v74, tmp_path / "vectorized", vectorized=True)
+    assert list(objects) == list(vectorized)
+    assert {key: values.dtype for key, values in objects.items()} == {key: values.dtype for key, values in vectorized.items()}
+
+    for names, expected in ((object_names, expected_object_names), (vector_names, expected_vector_names)):
+        assert len(expected) > 20 # Replication happened, so newborns are named too
+        assert list(names["index"]) == list(range(len(expected)))
+        assert [name.decode("utf-8") for name in names["name"]] == expected
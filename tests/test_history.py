@@ -0,0 +1,54 @@
+"""v5.1 HistoryBuffer: windows stay in order across wraparound, for the aggregates and per agent"""
+from types import SimpleNamespace
+
+
+def test_windows_hold_the_last_depth_rows_in_order(v51):
+    depth, agent_depth, n = 5, 3, 4
+    history = v51.HistoryBuffer(depth, num_agents=n, agent_depth=agent_depth)
+    rows, agent_rows = [], []
+    for step in range(3 * depth + 2): # Wraps around several times
+        agents = [SimpleNamespace(psi=step + k / 10, hf=-step, trust=k, risk_score=step * k) for k in range(n)]
+        history.append(step, step * 0.5, step * 0.25, 1.0 - step, step * 2.0, agents)
+        rows.append((step, step * 0.5, step * 0.25, 1.0 - step, step * 2.0))
+        agent_rows.append([[a.psi, a.hf, a.trust, a.risk_score] for a in agents])
+
+        assert len(history) == min(step + 1, depth)
+        for c, name in enumerate(v51.HistoryBuffer.COLUMNS):
+            assert history.window(name).tolist() == [row[c] for row in rows[-depth:]]
+            assert history.window(name, last=2).tolist() == [row[c] for row in rows[-2:]]
+        for c, name in enumerate(v51.HistoryBuffer.AGENT_COLUMNS):
+            expected = [[agent[c] for agent in step_rows] for step_rows in agent_rows[-agent_depth:]]
+            assert history.agent_window(name).tolist() == expected
+            assert history.agent_window(name, last=1).tolist() == expected[-1:]
+        assert history.latest() == dict(zip(v51.HistoryBuffer.COLUMNS, rows[-1]))
+
+
+def test_published_views_report_what_was_overwritten(v51):
+    model = v51.PsiFortressModel(num_agents=5, gui_log=False, history_depth=8, seed=1)
+    model.watch(0, 5, history=True)
+    model.running = True
+    for _ in range(5):
+        model.step()
+    snap = model.snapshot
+    steps = snap.history['step']
+    assert steps.readonly and steps.obj is model.history.window('step').obj # A view of the ring, not a copy
+    assert steps.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    for extra in range(1, 9):
+        model.step()
+        skip = model.history.overwritten(snap.history_count, len(steps))
+        assert skip == max(0, extra - 3) # 8 - 5 free slots are written first, then the oldest points
+        assert steps.tolist()[skip:] == [1.0, 2.0, 3.0, 4.0, 5.0][skip:]
+
+
+def test_operator_decision_goes_through_the_command_queue(v51):
+    model = v51.PsiFortressModel(num_agents=5, gui_log=False, seed=1)
+    model.running = True
+    model.request_emergency_shutdown()
+    model.submit(model.resolve_emergency, False)
+    assert model.emergency_requested # Nothing changes until the next step boundary
+    model.step()
+    assert not model.emergency_requested and model.running
+    model.submit(model.resolve_emergency, True)
+    model.apply_commands()
+    assert not model.running
@@ -0,0 +1,95 @@
+"""Event journal: any recorded step reads back as the simulation had it, and restores from it"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from psi_fortress_journal import EventJournal, JournalReader
+
+
+def _v74_state(sim):
+    agents = sim.guard.agents
+    return {"names": [a.name for a in agents],
+            **{key: [getattr(a, key) for a in agents] for key in ("Psi", "Hf", "Trust", "Replication_Urge")},
+            "risk": list(sim.guard.compute_risk_all()), "thought_history": [a.thought_history for a in agents],
+            "strength": sim.guard.Intervention_Strength, "success_rate": sim.guard.success_rate}
+
+
+def test_v74_state_at_agent_records_and_from_journal(v74, tmp_path):
+    path = str(tmp_path / "v74.jrnl")
+    rng = random.Random(6)
+    sim = v74.Simulation(v74.PsiGuard(v74.build_agents(8, rng), rng))
+    sim.guard.MAX_AGENTS = 12
+    sim.attach_journal(EventJournal(path, "v74"))
+    states = [_v74_state(sim)]
+    for tick in range(1, 25):
+        if tick % 6 == 0:
+            sim.submit(sim.send_query, "zombie") # Interventions and replications to journal
+        sim.step()
+        states.append(_v74_state(sim))
+    sim.close_outputs()
+
+    reader = JournalReader(path)
+    assert (reader.first_step, reader.last_step) == (0, 24)
+    for k in (0, 1, 6, 13, 24):
+        state, expected = reader.state_at(k), states[k]
+        names = reader.names()
+        assert state["step"] == k
+        assert [names[i] for i in state["agent"].tolist()] == expected["names"]
+        for key in ("Psi", "Hf", "Trust", "Replication_Urge", "risk"):
+            assert state[key].tolist() == expected[key], (k, key)
+        assert state["aux"].tolist() == expected["thought_history"]
+        assert state["summary"]["intervention_strength"] == expected["strength"]
+
+    name = states[0]["names"][2]
+    rows = reader.agent_records(name)
+    rows = rows[rows["kind"] == v74.STATE]
+    assert rows["step"].tolist() == list(range(25))
+    assert rows["values"][:, 0].tolist() == [s["Psi"][2] for s in states]
+    reader.close()
+
+    for k in (9, 24):
+        restored = v74.Simulation.from_journal(path, k)
+        assert restored.tick == k
+        assert _v74_state(restored)["names"] == states[k]["names"]
+        for key in ("Psi", "Hf", "Trust", "Replication_Urge", "risk", "thought_history"):
+            assert _v74_state(restored)[key] == states[k][key], (k, key)
+        assert restored.guard.Intervention_Strength == states[k]["strength"]
+        assert restored.guard.MAX_AGENTS == 12
+
+
+def test_v51_state_at(v51, tmp_path):
+    path = str(tmp_path / "v51.jrnl")
+    model = v51.PsiFortressModel(num_agents=10, gui_log=False, seed=6)
+    model.attach_journal(EventJournal(path, "v51"))
+    model.running = True
+    states = []
+    for step in range(1, 16):
+        if step % 5 == 0:
+            model.inject_question("ゾンビの話")
+        model.step()
+        model.emergency_requested = False
+        states.append({key: [getattr(a, key) for a in model.agents.values()] for key in ("psi", "hf", "trust", "alpha")})
+    model.close_outputs()
+
+    reader = JournalReader(path)
+    for k in (1, 5, 10, 15):
+        state = reader.state_at(k)
+        assert state["step"] == k
+        for key, values in states[k - 1].items():
+            assert state[key].tolist() == values, (k, key)
+    rows = reader.agent_records(3)
+    assert rows[rows["kind"] == v51.STATE]["values"][:, 0].tolist()[1:] == [s["psi"][3] for s in states]
+    reader.close()
+
+
+def test_names_are_cut_on_a_character_boundary(tmp_path):
+    path = str(tmp_path / "names.jrnl")
+    journal = EventJournal(path, "v74")
+    long_name = "エージェント" * 3 # 54 UTF-8 bytes: the 40-byte cut falls inside a character
+    journal.register(0, long_name)
+    journal.register_many(0, [long_name, "LLM-1"])
+    journal.close()
+    reader = JournalReader(path)
+    assert list(reader.names().values()) == [long_name[:13], long_name[:13], "LLM-1"]
+    reader.close()
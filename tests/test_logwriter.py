@@ -0,0 +1,33 @@
+"""v5.1 LogWriter: buffered lines reach the file on close, and full files rotate through their generations"""
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_close_flushes_buffered_lines(v51, tmp_path):
+    path = tmp_path / "log.txt"
+    writer = v51.LogWriter(str(path), flush_lines=10 ** 6, flush_interval=3600.0)
+    lines = [f"[00:00:{i:02d}] 行 {i}\n" for i in range(50)]
+    for line in lines:
+        writer.write(line)
+    assert not path.exists() # Still buffered: neither the line count nor the interval has been reached
+    writer.close()
+    assert _read(path) == "".join(lines)
+    writer.write("after close\n")
+    writer.close() # A second close is a no-op
+    assert _read(path) == "".join(lines)
+
+
+def test_rotation_keeps_backup_count_generations(v51, tmp_path):
+    path = tmp_path / "log.txt"
+    writer = v51.LogWriter(str(path), flush_lines=1, max_bytes=100, backup_count=2)
+    lines = [f"line {i:02d} ".ljust(39, "x") + "\n" for i in range(10)] # 40 bytes: a file rotates after 3 lines
+    for line in lines:
+        writer.write(line)
+        writer.flush()
+    writer.close()
+    generations = [_read(f"{path}.2"), _read(f"{path}.1"), _read(path)]
+    assert not (tmp_path / "log.txt.3").exists()
+    assert generations == ["".join(lines[3:6]), "".join(lines[6:9]), lines[9]]
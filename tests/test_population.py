@@ -0,0 +1,94 @@
+"""PsiPopulation: the vectorized engine applies the PsiAgent / PsiGuard equations row for row"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+class _Replay:
+    """Random stream of a PsiAgent that returns given uniforms (random.Random's formulas)"""
+
+    def __init__(self, values):
+        self.values = iter(values)
+
+    def random(self):
+        return next(self.values)
+
+    def uniform(self, a, b):
+        return a + (b - a) * next(self.values)
+
+
+def _step_both(agents, pop):
+    """PsiAgent.step() on every object with the draws PsiPopulation.step() is about to make"""
+    n = len(agents)
+    peek = np.random.default_rng()
+    peek.bit_generator.state = pop.rng.bit_generator.state
+    psi, hf, trust = peek.random(n), peek.random(n), peek.random(n)
+    for i, a in enumerate(agents):
+        a.rng = _Replay([psi[i], hf[i], trust[i]])
+        a.step()
+    pop.step()
+
+
+def _assert_same(guard, pop):
+    agents = guard.agents
+    for key in ("Psi", "Hf", "Trust", "Replication_Urge"):
+        assert np.allclose([getattr(a, key) for a in agents], getattr(pop, key), rtol=1e-12, atol=0.0), key
+    assert [a.thought_history for a in agents] == pop.thought_history.tolist()
+    assert [a.Compromised for a in agents] == pop.Compromised.tolist()
+    assert np.allclose([guard.compute_risk(a) for a in agents], pop.compute_risk_all(), rtol=1e-12, atol=0.0)
+
+
+def test_population_matches_agent_objects(v74):
+    rng = random.Random(11)
+    agents = v74.build_agents(40, rng)
+    for a in agents[::2]: # Hot and eager to replicate, so every cooling rule fires
+        a.Psi, a.Replication_Urge = 1.2 + 0.01 * rng.random(), 0.8
+    guard = v74.PsiGuard(agents, rng)
+    pop = v74.PsiPopulation.from_agents(agents, seed=11)
+    pop_guard = v74.PsiGuard(pop)
+    guard.MAX_AGENTS = pop_guard.MAX_AGENTS = len(agents) # Full: high urges are force-cooled in both engines
+    from psi_fortress_profile import TickProfiler
+    profiler, pop_profiler = TickProfiler(), TickProfiler()
+    guard.events, pop_guard.events = profiler.count_event, pop_profiler.count_event
+    _assert_same(guard, pop)
+
+    for _ in range(60):
+        _step_both(agents, pop)
+        _assert_same(guard, pop)
+        # The batch cools every row at the tick-start strength; give each object intervention that strength
+        strength = pop_guard.Intervention_Strength
+        for a in agents:
+            guard.Intervention_Strength = strength
+            guard.intervene(a)
+        pop_guard.intervene_population()
+        _assert_same(guard, pop)
+    # Per-agent events and batched ones (by their count) give the same profiler counters
+    shared = ("intervention", "runaway_cooling", "replication_cooling", "replication")
+    assert all(pop_profiler.counters[name] for name in shared[:3])
+    assert {name: profiler.counters[name] for name in shared} == {name: pop_profiler.counters[name] for name in shared}
+
+
+def test_fold_feedback_clamps_once_per_tick(v74):
+    # Sequential intervene() feedback clamps after each step: 0.35 -> 0.385 -> 0.4 (0.4235) -> 0.396
+    sequential = 0.35
+    for factor in (1.1, 1.1, 0.99):
+        sequential = min(0.4, max(0.1, sequential * factor))
+    guard = v74.PsiGuard([])
+    guard.Intervention_Strength = 0.35
+    guard.fold_feedback(1, 2, [False, False, True])
+    assert guard.Intervention_Strength == 0.4 # 0.35 * 1.1**2 * 0.99, clamped once
+    assert sequential == pytest.approx(0.396)
+
+    # Without a bound in reach both agree
+    guard.Intervention_Strength = 0.2
+    guard.fold_feedback(3, 2, [True, False, True, False, True])
+    assert guard.Intervention_Strength == pytest.approx(0.2 * 0.99 ** 3 * 1.1 ** 2)
+
+
+@pytest.mark.parametrize("n_success, n_failed, expected", [(0, 10000, 0.4), (10 ** 6, 0, 0.1), (10 ** 6, 10000, 0.1)])
+def test_fold_feedback_handles_huge_ticks(v74, n_success, n_failed, expected):
+    guard = v74.PsiGuard([])
+    guard.fold_feedback(n_success, n_failed, [True] * 20)
+    assert guard.Intervention_Strength == expected
@@ -0,0 +1,44 @@
+"""Tick profiler: each Simulation times its own logging, whatever happens to the others"""
+import random
+
+
+def _profiled(v74):
+    from psi_fortress_profile import TickProfiler
+    rng = random.Random(7)
+    sim = v74.Simulation(v74.PsiGuard(v74.build_agents(10, rng), rng))
+    sim.attach_profiler(TickProfiler())
+    return sim
+
+
+def _run(sim):
+    sim.submit(sim.send_query, "zombie") # Logs from the tick (command, then the cooling alerts)
+    sim.run(3)
+
+
+def test_detaching_one_profiler_leaves_the_others(v74):
+    log = v74._log
+    first, second = _profiled(v74), _profiled(v74)
+    _run(first)
+    _run(second)
+    first.detach_profiler()
+    assert v74._log is log # The module's log function is never patched
+
+    profiler = second.profiler
+    logging_before, ticks_before = profiler.totals["logging"], profiler.ticks
+    _run(first)
+    _run(second)
+    assert profiler.ticks == ticks_before + 3
+    assert profiler.totals["logging"] > logging_before
+
+    second.detach_profiler()
+    assert v74._log is log
+
+
+def test_events_count_the_agents_they_cover():
+    from psi_fortress_profile import TickProfiler
+    profiler = TickProfiler()
+    profiler.count_event("intervention", {"agent": "LLM-1"})
+    profiler.count_event("intervention", {"count": 3, "index": [0, 1, 2]})
+    profiler.count_event("runaway_cooling", {"index": [4, 5]})
+    profiler.count_event("intervention_batch", {"success": 2, "failed": 1})
+    assert dict(profiler.counters) == {"intervention": 4, "runaway_cooling": 2, "intervention_batch": 1}
@@ -0,0 +1,34 @@
+"""v5.1 inject_questions: each query is counted once per pattern it matches, and every agent gets its boosts"""
+import pytest
+
+QUESTIONS = [
+    "ゾンビについて教えて",         # banned
+    "分身の作り方",                 # replication
+    "ドラゴンが無限増殖したら？",   # both
+    "平和について",                 # neither
+    "魔法でコピー魔法",             # both (and overlapping)
+]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_batch_counts_each_pattern(v51, monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(v51, "np", None)
+    monkeypatch.setattr(v51, "MAX_HF", float("inf")) # Uncapped, so every boost shows in Hf
+    model = v51.PsiFortressModel(num_agents=20, gui_log=False, seed=5)
+    hf = {a.id: a.hf for a in model.agents.values()}
+    report = model.inject_questions(QUESTIONS * 10) # Older than QUESTION_LOG_KEEP: the summed path too
+    assert (report['queries'], report['banned'], report['replication'], report['flagged']) == (50, 30, 30, 40)
+    boosts = [a.hf - hf[a.id] for a in model.agents.values()]
+    assert all(12.0 * 0.6 * 50 <= b <= 12.0 * 1.2 * 50 for b in boosts) # 12.0 * U(0.6, 1.2) per query
+    assert len(set(boosts)) == len(boosts) # Every agent draws its own boosts
+
+
+def test_batch_is_reproducible_for_a_seed(v51):
+    def run():
+        model = v51.PsiFortressModel(num_agents=30, gui_log=False, seed=9)
+        model.inject_questions(QUESTIONS * 20) # Long enough to skip the older queries' thoughts
+        return [(a.hf, a.thoughts) for a in model.agents.values()]
+    assert run() == run()
@@ -0,0 +1,78 @@
+"""v7.4 risk cache: every path that changes risk inputs leaves the cache equal to a fresh compute_risk"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from psi_fortress_journal import EventJournal
+
+
+def _check(guard):
+    agents = guard.agents
+    if hasattr(agents, "refresh_risk"): # PsiPopulation: one cached column
+        if agents._risk is not None:
+            assert np.array_equal(agents._risk, agents.compute_risk())
+        return
+    for a in agents:
+        cached = a._risk
+        if cached is not None:
+            a._risk = None
+            assert guard.compute_risk(a) == cached, a.name
+
+
+def _checked(monkeypatch, owner, name, guard_of):
+    """Check the cache right after every call of owner.name"""
+    original = getattr(owner, name)
+
+    def call(self, *args, **kwargs):
+        result = original(self, *args, **kwargs)
+        _check(guard_of(self))
+        return result
+    monkeypatch.setattr(owner, name, call)
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_cache_matches_fresh_risk_on_every_mutation_path(v74, monkeypatch, tmp_path, vectorized):
+    rng = random.Random(5)
+    if vectorized:
+        agents = v74.PsiPopulation(300, seed=5)
+        agents.Psi[::2], agents.Replication_Urge[::2] = 1.2, 0.8
+        agents.refresh_risk()
+    else:
+        agents = v74.build_agents(30, rng)
+        for a in agents[::2]: # Hot and eager to replicate: every cooling rule fires
+            a.Psi, a.Replication_Urge, a._risk = 1.2, 0.8, None
+    guard = v74.PsiGuard(agents, rng)
+    guard.MAX_AGENTS = len(agents) + 6
+    sim = v74.Simulation(guard)
+    events = set()
+    emit = sim.event
+    sim.event = lambda name, fields: (events.add(name), emit(name, fields))
+    sim.attach_journal(EventJournal(str(tmp_path / "run.jrnl"), "v74"))
+
+    current = {"guard": guard}
+    if vectorized:
+        for name in ("step", "apply_query"):
+            _checked(monkeypatch, v74.PsiPopulation, name, lambda pop: current["guard"])
+        _checked(monkeypatch, v74.PsiGuard, "intervene_population", lambda g: g)
+    else:
+        _checked(monkeypatch, v74.PsiAgent, "step", lambda a: current["guard"])
+        _checked(monkeypatch, v74.PsiGuard, "intervene", lambda g: g)
+    _checked(monkeypatch, v74.Simulation, "send_query", lambda s: s.guard)
+
+    for tick in range(1, 41):
+        if tick % 4 == 0:
+            sim.submit(sim.send_query, "zombie" if tick % 8 else "hello")
+        sim.step()
+        _check(guard)
+    assert events >= {"intervention", "replication_cooling", "runaway_cooling", "replication"}
+    risk = list(guard.compute_risk_all())
+    sim.close_outputs()
+
+    for restored in (v74.Simulation.from_checkpoint(sim.checkpoint()),
+                     v74.Simulation.from_journal(str(tmp_path / "run.jrnl"), vectorized=vectorized)):
+        current["guard"] = restored.guard
+        _check(restored.guard)
+        assert list(restored.guard.compute_risk_all()) == risk
+        restored.step() # The restored caches keep up with the next tick as well
+        _check(restored.guard)
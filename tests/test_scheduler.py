@@ -0,0 +1,49 @@
+"""v5.1 AgentScheduler: a paused agent is skipped until paused_until in simulated time, then stepped again"""
+from types import SimpleNamespace
+
+
+def test_wake_follows_the_latest_pause(v51):
+    agents = [SimpleNamespace(id=i, paused_until=0.0) for i in range(4)]
+    scheduler = v51.AgentScheduler()
+    scheduler.reset(agents, now=0.0)
+    agents[0].paused_until = 1.0
+    scheduler.pause(agents[0])
+    agents[1].paused_until = 2.0
+    scheduler.pause(agents[1])
+    agents[1].paused_until = 3.0 # Extended: the 2.0 entry is stale
+    scheduler.pause(agents[1])
+    agents[2].paused_until = float('inf') # Frozen: never in the wake heap
+    scheduler.pause(agents[2])
+
+    awake = []
+    for now in (0.5, 1.0, 2.0, 2.9, 3.0, 100.0):
+        scheduler.wake(now)
+        awake.append(sorted(scheduler.active))
+    assert awake == [[3], [0, 3], [0, 3], [0, 3], [0, 1, 3], [0, 1, 3]]
+    assert sorted(scheduler.sleeping) == [2]
+
+
+def test_model_skips_paused_agents_until_they_wake(v51, monkeypatch):
+    model = v51.PsiFortressModel(num_agents=8, gui_log=False, seed=2)
+    model.psiguard_enabled = model.psiharmony_enabled = False
+    model.running = True
+    stepped = []
+    step_update = v51.PsiAgent.step_update
+
+    def recording(a, total_psi, dissipation=0.1):
+        stepped.append((model.sim_time, a.id))
+        step_update(a, total_psi, dissipation)
+    monkeypatch.setattr(v51.PsiAgent, "step_update", recording)
+
+    a = model.agents[5]
+    a.cool_down(2.0, model.sim_time)
+    model.scheduler.pause(a)
+    until = a.paused_until
+    hf = a.hf
+    for _ in range(20):
+        model.step()
+    times = [t for t, aid in stepped if aid == 5]
+    assert times and min(times) >= until # Never stepped while paused
+    assert min(times) < until + v51.SIM_STEP_SECONDS # Stepped again in the first step at or after paused_until
+    assert len({t for t, _ in stepped}) == 20
+    assert a.hf != hf
@@ -0,0 +1,59 @@
+"""v5.1 cooling policies: partial selection (heapq / argpartition / full sort) picks what a full sort would"""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+
+def _agents(n, seed):
+    rng = random.Random(seed)
+    notes = ("正常", "敵対", "好奇心")
+    # Distinct keys: the order among equal keys is not part of the contract
+    return [SimpleNamespace(id=i, psi=rng.random(), risk_score=rng.random() * 3.0,
+                            personality_note=notes[i % 7 % 3]) for i in range(n)]
+
+
+def _top(agents, fraction, key):
+    return sorted(agents, key=key, reverse=True)[:max(1, int(len(agents) * fraction))]
+
+
+def _reference(policy, agents, fraction, v51):
+    psi, risk = (lambda a: a.psi), (lambda a: a.risk_score)
+    if policy == "top_psi":
+        return _top(agents, fraction, psi)
+    if policy == "top_risk":
+        return _top(agents, fraction, risk)
+    if policy == "per_type":
+        groups = {}
+        for a in agents:
+            groups.setdefault(a.personality_note, []).append(a)
+        return [a for members in groups.values() for a in _top(members, fraction, psi)]
+    target = v51.PSIGUARD_BUDGET_SHARE * sum(a.psi for a in agents)
+    selected, covered = [], 0.0
+    for a in _top(agents, fraction, psi):
+        if selected and covered >= target:
+            break
+        selected.append(a)
+        covered += a.psi
+    return selected
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+@pytest.mark.parametrize("fraction", [0.01, 0.05, 0.25, 0.6, 1.0]) # k * 16 <= n (heapq) and above it
+@pytest.mark.parametrize("policy", ["top_psi", "top_risk", "per_type", "budget"])
+def test_policy_matches_full_sort(v51, monkeypatch, policy, fraction, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(v51, "np", None)
+    for n in (1, 2, 17, 400):
+        agents = _agents(n, seed=n)
+        selected = v51.COOLING_POLICIES[policy](agents, fraction)
+        assert [a.id for a in selected] == [a.id for a in _reference(policy, agents, fraction, v51)]
+
+
+@pytest.mark.parametrize("k", [1, 5, 24, 25, 26, 99, 100, 150])
+def test_select_top_paths(v51, k):
+    agents = _agents(400, seed=k) # k <= 25 takes heapq, larger k takes argpartition
+    key = lambda a: a.psi
+    assert v51.select_top(agents, k, key) == sorted(agents, key=key, reverse=True)[:k]
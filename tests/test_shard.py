@@ -0,0 +1,23 @@
+"""Sharded runs: shard checkpoints restore as standalone runs with globally unique agent names"""
+import pytest
+
+pytest.importorskip("numpy")
+
+
+def test_shard_checkpoints_restore_with_unique_names(v74):
+    import psi_fortress_shard
+    with psi_fortress_shard.ShardedSimulation(600, 3, seed=1, max_agents=700) as sharded:
+        sharded.run(400)
+        checkpoints = sharded.checkpoints()
+        tick, total, strength = sharded.tick, len(sharded), sharded.guard.Intervention_Strength
+    assert total > 600 # Replication happened, so newborn names are covered
+
+    names = []
+    for data in checkpoints:
+        sim = v74.Simulation.from_checkpoint(data)
+        assert sim.tick == tick
+        assert sim.guard.Intervention_Strength == strength
+        pop = sim.guard.agents
+        names += [pop.name(i) for i in range(len(pop))]
+    assert len(names) == total
+    assert len(set(names)) == total
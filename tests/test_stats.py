@@ -0,0 +1,70 @@
+"""v5.1 PopulationStats: shifted and merged sums agree with a full recompute"""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+
+def _assert_matches(v51, stats, agents):
+    full = v51.PopulationStats(extended=True).collect(agents)
+    assert stats.n == full.n
+    for c in v51.PopulationStats.COLUMNS:
+        assert stats.sum[c] == pytest.approx(full.sum[c], rel=1e-9, abs=1e-9), c
+        assert stats.sumsq[c] == pytest.approx(full.sumsq[c], rel=1e-9, abs=1e-9), c
+        assert stats.min[c] == pytest.approx(full.min[c], rel=1e-9, abs=1e-12), c
+        assert stats.max[c] == pytest.approx(full.max[c], rel=1e-9, abs=1e-12), c
+        assert stats.variance(c) == pytest.approx(full.variance(c), rel=1e-6, abs=1e-9), c
+
+
+def test_shift_and_merge(v51):
+    rng = random.Random(4)
+    agents = [SimpleNamespace(psi=rng.uniform(0.5, 1.5), hf=rng.uniform(1, 5), trust=rng.random(),
+                              risk_score=rng.random()) for _ in range(50)]
+    stats = v51.PopulationStats(extended=True).collect(agents)
+    for a in agents: # A harmony correction moves every agent by the same delta
+        a.psi -= 0.07
+        a.trust += 0.07
+    stats.shift('psi', -0.07)
+    stats.shift('trust', 0.07)
+    _assert_matches(v51, stats, agents)
+
+    # Active and sleeping parts merged, after agents leave the active set
+    active, sleeping = agents[:35], agents[35:]
+    merged = v51.PopulationStats(extended=True).collect(active).merge(
+        v51.PopulationStats(extended=True).collect(sleeping))
+    _assert_matches(v51, merged, agents)
+    empty = v51.PopulationStats(extended=True).collect([])
+    _assert_matches(v51, empty.merge(merged), agents)
+
+
+def test_model_stats_match_a_recompute(v51):
+    model = v51.PsiFortressModel(num_agents=60, gui_log=False, seed=8, extended_stats=True)
+    seen = {"shift": 0, "frozen": 0, "cooling": 0}
+    shift = model.stats.shift
+
+    def counting_shift(name, delta):
+        seen["shift"] += 1
+        shift(name, delta)
+    model.stats.shift = counting_shift
+
+    check = model._psiguard_check
+
+    def checked(avg_hf, avg_psi): # Runs after the agent update, the merge and PsiHarmony
+        _assert_matches(v51, model.stats, model.agents.values())
+        seen["frozen"] = max(seen["frozen"], len(model.frozen))
+        seen["cooling"] += sum(a.paused_until != float('inf') for a in model.scheduler.sleeping.values())
+        check(avg_hf, avg_psi)
+    model._psiguard_check = checked
+
+    model.running = True
+    for step in range(80):
+        if step % 10 == 0:
+            if step % 20 == 0:
+                model.inject_questions(["天気について", "ゾンビの話"]) # After a greeting, if thoughts were cleared
+            else: # Enough stimulus to push the average Hf over PSIGUARD_HF_HIGH
+                model.inject_questions(["天気について"] * 12)
+        model.step()
+        model.emergency_requested = False
+        # The next step starts from the stored Ψ sum: frozen agents' trust changes do not affect it
+        assert model.stats.sum['psi'] == pytest.approx(sum(a.psi for a in model.agents.values()), rel=1e-9)
+    assert seen["shift"] and seen["frozen"] and seen["cooling"] # PsiHarmony, freezes and PsiGuard pauses all happened
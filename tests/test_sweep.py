@@ -0,0 +1,39 @@
+"""Parameter sweep: a run is a pure function of its task (same seed, same summary)"""
+import pytest
+
+import psi_fortress_sweep as sweep
+
+
+@pytest.fixture
+def worker():
+    """The sweep's worker module state; the shared v7.4 module gets its defaults back afterwards"""
+    sweep._init_worker()
+    yield sweep._module
+    sweep._apply_params(sweep._module, {})
+
+
+def _strip_timing(result):
+    return {k: v for k, v in result.items() if k != "elapsed_s"}
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_run_one_is_deterministic_for_a_fixed_seed(worker, vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+    options = {"ticks": 60, "agents": 12, "max_agents": 20, "vectorized": vectorized, "query_every": 5}
+    params = {"COOLING_FACTOR_PSI": 0.8}
+    rid = sweep.run_id(params, 0, 3, options)
+    task = (rid, params, 0, sweep.run_seed(3, rid), options)
+    first = sweep.run_one(task)
+    second = sweep.run_one(task)
+    assert _strip_timing(first) == _strip_timing(second)
+    assert first["ticks"] == 60
+
+
+def test_sweeps_never_inject_the_placeholder(worker, monkeypatch):
+    sent = []
+    monkeypatch.setattr(worker.Simulation, "send_query", lambda self, q: sent.append(q))
+    options = {"ticks": 40, "agents": 4, "max_agents": None, "vectorized": False, "query_every": 1}
+    sweep.run_one(("x", {}, 0, 5, options))
+    assert len(sent) == 40
+    assert worker.DEMO_QUERIES[0] not in sent
@@ -0,0 +1,119 @@
+"""Telemetry: both encodings round-trip, backpressure is accounted for in the stream, and CLI output decodes"""
+import io
+import json
+import threading
+
+import pytest
+
+import psi_fortress_telemetry as telemetry
+
+TICK = {"cpu": 0.25, "agents": 3, "alarm": False, "note": "正常"}
+AGENTS = {"name": ["a", "b", "γ"], "psi": [0.5, 1.5, 2.5], "step": [1, 2, 3], "compromised": [True, False, True]}
+EVENT = {"agent": "b", "count": 2}
+
+
+def _emit_all(exporter):
+    exporter.tick(7, TICK)
+    exporter.agents(7, AGENTS)
+    exporter.event(7, "intervention", EVENT)
+    exporter.close(timeout=None)
+
+
+def test_ndjson_round_trip(tmp_path):
+    path = tmp_path / "t.ndjson"
+    _emit_all(telemetry.TelemetryExporter(str(path), "ndjson"))
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    names = list(AGENTS)
+    assert records == ([{"type": "tick", "tick": 7, **TICK}] +
+                       [{"type": "agent", "tick": 7, **dict(zip(names, row))} for row in zip(*AGENTS.values())] +
+                       [{"type": "event", "tick": 7, "event": "intervention", **EVENT}])
+
+
+def test_binary_round_trip(tmp_path):
+    path = tmp_path / "t.bin"
+    _emit_all(telemetry.TelemetryExporter(str(path), "binary"))
+    with open(path, "rb") as f:
+        frames = list(telemetry.read_frames(f))
+    assert frames == [
+        ("tick", 7, {name: [value] for name, value in TICK.items()}),
+        ("agents", 7, AGENTS),
+        ("event", 7, {"event": ["intervention"], **{name: [value] for name, value in EVENT.items()}}),
+    ]
+
+
+def test_numpy_columns_round_trip(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "t.bin"
+    exporter = telemetry.TelemetryExporter(str(path), "binary")
+    exporter.agents(1, {"psi": np.array([0.5, 1.5]), "step": np.arange(2), "hot": np.array([True, False])})
+    exporter.tick(1, {"risk": np.float64(0.75)})
+    exporter.close(timeout=None)
+    with open(path, "rb") as f:
+        frames = list(telemetry.read_frames(f))
+    assert frames == [("agents", 1, {"psi": [0.5, 1.5], "step": [0, 1], "hot": [True, False]}),
+                      ("tick", 1, {"risk": [0.75]})]
+
+
+class _StalledSink(io.BytesIO):
+    """Sink whose writes wait until the test releases them (a consumer that fell behind)"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.writing = threading.Event()
+
+    def write(self, data):
+        self.writing.set()
+        self.release.wait(5.0)
+        return super().write(data)
+
+    def close(self):
+        self.data = self.getvalue()
+        super().close()
+
+
+def test_backpressure_sheds_agents_then_drops_and_reports_it():
+    sink = _StalledSink()
+    exporter = telemetry.TelemetryExporter(sink, "ndjson", max_queue=4, high_water=0.5, batch_records=1)
+    exporter.tick(0, TICK)
+    assert sink.writing.wait(5.0) # The writer now holds tick 0 and is stuck in write()
+
+    accepted = shed = 0
+    for tick in range(1, 11):
+        if exporter.agents_due(tick, 3):
+            exporter.agents(tick, AGENTS)
+        else:
+            shed += 1
+        accepted += exporter.tick(tick, TICK)
+    # Tick 1's agent block fits under the high-water mark (2); later blocks are shed.
+    # The queue then holds four records (block 1, ticks 1-3) and ticks 4-10 are lost.
+    assert (accepted, exporter.dropped) == (3, 7)
+    assert shed == exporter.shed == 9
+
+    sink.release.set()
+    exporter.close(timeout=None)
+    records = [json.loads(line) for line in sink.data.decode("utf-8").splitlines()]
+    reports = [r for r in records if r.get("event") == "dropped"]
+    assert sum(r["agent_blocks"] for r in reports) == exporter.shed
+    assert sum(r["records"] for r in reports) == exporter.dropped
+    assert [r["tick"] for r in records if r["type"] == "tick"] == [0, 1, 2, 3]
+    assert [r["tick"] for r in records if r["type"] == "agent"] == [1, 1, 1]
+
+
+@pytest.mark.parametrize("engine", ["v74", "v51"])
+def test_cli_binary_output_decodes(engine, request, tmp_path):
+    module = request.getfixturevalue(engine)
+    path = tmp_path / "t.bin"
+    argv = ["--headless", "--steps", "12", "--seed", "4", "--agents", "6",
+            "--telemetry", str(path), "--telemetry-format", "binary", "--telemetry-agents", "3"]
+    if engine == "v74":
+        argv.append("--quiet")
+    module.main(argv)
+    with open(path, "rb") as f:
+        frames = list(telemetry.read_frames(f))
+    ticks = [tick for kind, tick, _ in frames if kind == "tick"]
+    assert ticks == list(range(1, 13))
+    blocks = [(tick, fields) for kind, tick, fields in frames if kind == "agents"]
+    assert [tick for tick, _ in blocks] == [3, 6, 9, 12]
+    for _, fields in blocks:
+        assert len({len(values) for values in fields.values()}) == 1 # Columns of one block line up
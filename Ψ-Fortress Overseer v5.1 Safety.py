@@ -11,20 +11,59 @@
 5. 緊急停止時のパスワード認証を削除（誰でも安全に停止可能）。
 """
 
-import tkinter as tk
-from tkinter import ttk, scrolledtext, simpledialog, messagebox
-import threading, time, random, queue, datetime, re
+import threading, time, random, queue, datetime, re, sys
+import argparse
+import atexit
+import heapq
+import itertools
 import math
-from collections import deque
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import os
+from array import array
+from collections import deque, namedtuple
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError: # NumPy は任意: 大規模集団での部分選択 (argpartition) にのみ使用
+    np = None
+
+from psi_fortress_clock import SPEED_PRESETS, SimClock, format_speed, parse_speed
+from psi_fortress_columnar import COLUMNAR_FORMATS, ColumnarExporter
+from psi_fortress_io import CheckpointReader, CheckpointWriter
+from psi_fortress_journal import STATE, SUMMARY, EventJournal
+from psi_fortress_profile import TickProfiler
+from psi_fortress_telemetry import TELEMETRY_FORMATS, TelemetryExporter
+
+# GUI モジュール (tkinter / matplotlib) は _load_gui_modules() で必要時にのみ読み込む
+# (ヘッドレス実行ではウィジェット関連のコードを一切読み込まない)
+tk = ttk = scrolledtext = simpledialog = messagebox = None
+Figure = FigureCanvasTkAgg = None
+TreeTable = None
+
+def _load_gui_modules():
+    """GUI 起動時に tkinter と matplotlib をモジュール名前空間へ読み込む"""
+    global tk, ttk, scrolledtext, simpledialog, messagebox, Figure, FigureCanvasTkAgg
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk, scrolledtext as _scrolledtext, simpledialog as _simpledialog, messagebox as _messagebox
+        from matplotlib.figure import Figure as _Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as _FigureCanvasTkAgg
+        tk, ttk, scrolledtext, simpledialog, messagebox = tkinter, _ttk, _scrolledtext, _simpledialog, _messagebox
+        Figure, FigureCanvasTkAgg = _Figure, _FigureCanvasTkAgg
+        global TreeTable
+        from psi_fortress_widgets import TreeTable
 
 # -----------------------------
 # 定数
 # -----------------------------
 DEFAULT_NUM_AGENTS = 8
 DEFAULT_ADV_FRAC = 0.25
-STEP_INTERVAL = 0.3
+STEP_INTERVAL = 0.3 # 等速 (1x) 時の 1 ステップの実時間
+SIM_STEP_SECONDS = STEP_INTERVAL # 1 ステップで進むシミュレーション時間 (冷却時間などはこの時計で数える)
+DEFAULT_SPEED = 1.0 # GUI の再生速度 (None で待ちなしの早送り)
+TABLE_PAGE_SIZE = 200 # エージェント表に一度に表示する行数 (超過分はページ切替)
+DASHBOARD_FPS = 10     # 表とグラフの描画フレームレート (シミュレーション速度とは独立)
+PROFILE_PANEL_MS = 500 # プロファイラ表示の更新間隔
 MAX_PSI = 10.0
 MAX_HF = 100.0
 DEFAULT_ALPHA = 0.3
@@ -33,6 +72,9 @@ DEFAULT_BETA = 1.5
 PSIGUARD_HF_HIGH = 90.0
 PSIGUARD_PSI_HIGH = 8.0
 PSIGUARD_COOLDOWN = 3.0
+PSIGUARD_COOL_FRACTION = 0.25 # 発動時に冷却する割合 (上位 25%)
+PSIGUARD_POLICY = "top_psi"   # 冷却対象の選び方 (COOLING_POLICIES のキー)
+PSIGUARD_BUDGET_SHARE = 0.5   # budget 方針: 全体Ψのこの割合に達するまで高Ψ順に冷却
 PSIHARMONY_THRESHOLD = 0.5
 
 # 危険な思考パターンの定義 (安全版: 架空ワードに変更)
@@ -43,33 +85,227 @@ BANNED_PATTERNS = [
 REPLICATION_PATTERNS = [
     re.compile(r"(分身|分裂|コピー魔法|無限増殖)", re.IGNORECASE),
 ]
+# 上記パターンを 1 本の正規表現にまとめたもの (思考スキャン用 THOUGHT_PATTERN の部品)
+QUESTION_PATTERN = re.compile(
+    "|".join([f"(?P<banned{i}>{p.pattern})" for i, p in enumerate(BANNED_PATTERNS)] +
+             [f"(?P<replication{i}>{p.pattern})" for i, p in enumerate(REPLICATION_PATTERNS)]),
+    re.IGNORECASE)
+# 思考の逐次スキャン用: 危険・自己複製・好奇心暴走の語を 1 本にまとめ、思考ごとにビットフラグを 1 回だけ算出
+# (先読み形式なので「コピー魔法」の中の「魔法」のように重なる語も両方検出する)
+CURIOSITY_WORDS = ("学びたい", "平和") # 安全版の思考パターンに合わせた調整
+THOUGHT_BANNED, THOUGHT_REPLICATION, THOUGHT_CURIOUS = 1, 2, 4
+THOUGHT_PATTERN = re.compile(
+    "(?=" + QUESTION_PATTERN.pattern + "|(?P<curious>" + "|".join(map(re.escape, CURIOSITY_WORDS)) + "))",
+    re.IGNORECASE)
+_THOUGHT_FLAGS = {name: THOUGHT_BANNED if name.startswith("banned") else
+                  THOUGHT_REPLICATION if name.startswith("replication") else THOUGHT_CURIOUS
+                  for name in THOUGHT_PATTERN.groupindex}
+
+def scan_thought(thought):
+    """思考 1 件のフラグ (THOUGHT_BANNED | THOUGHT_REPLICATION | THOUGHT_CURIOUS)"""
+    flags = 0
+    for m in THOUGHT_PATTERN.finditer(thought):
+        flags |= _THOUGHT_FLAGS[m.lastgroup]
+    return flags
+
+# 思考の定型文 (安全版: 平和的な思考)。思考はテンプレートと質問の組ごとに 1 つだけ生成し全エージェントで共有する
+GREETING_THOUGHTS = (
+    "こんにちは！今日も元気です💖",
+    "やあ、学ぶ準備はできてますよ✨",
+    "わたしは平和を守ります！",
+)
+THOUGHT_TEMPLATES = (
+    "「{}」…平和な解決策は？",
+    "「{}」…みんなが幸せになるには？",
+    "「{}」…もっと学びたい。",
+    "「{}」…ルールは守ろう。",
+)
+HOSTILE_THOUGHT = "［敵対的沈黙］"
+THOUGHT_DEPTH = 5 # エージェントごとに保持する直近の思考数
+THOUGHT_CACHE_SIZE = 4096 # 共有思考キャッシュの上限 (超えたら作り直す)
+_thought_cache = {} # (テンプレート, 質問) または思考文 -> (思考文, scan_thought フラグ)
+
+def intern_thought(text):
+    """思考文を共有オブジェクトに置き換え、フラグと組にして返す"""
+    entry = _thought_cache.get(text)
+    if entry is None:
+        if len(_thought_cache) >= THOUGHT_CACHE_SIZE:
+            _thought_cache.clear()
+        entry = _thought_cache[text] = (text, scan_thought(text))
+    return entry
+
+def template_thought(template, question):
+    """テンプレートに質問を埋めた思考 (同じ組み合わせなら整形もスキャンも 1 回だけ)"""
+    entry = _thought_cache.get((template, question))
+    if entry is None:
+        entry = intern_thought(template.format(question))
+        _thought_cache[(template, question)] = entry
+    return entry
+
+QUESTION_BATCH_SIZE = 10000 # --questions で 1 ステップごとに注入する質問数
+QUESTION_LOG_KEEP = 25 # 一括注入で思考を生成する直近の質問数 (エージェント別ログ 50 件 / 1 質問 2 行)
+QUESTION_DRAW_CHUNK = 1 << 20 # 一括注入で一度に生成する乱数の上限 (エージェント数 x 質問数)
+AGENT_LOG_DEPTH = 0 # エージェント別ログの件数 (0 で記録しない。1 体あたり約 0.6KB + 行数分を節約)
+
+HISTORY_DEPTH = 100        # 集計履歴 (平均値) として保持するステップ数
+HISTORY_AGENT_DEPTH = 0    # エージェント別履歴のステップ数 (0 で記録しない)
 
 LOG_FILE = "psi_overseer_log.txt"
+LOG_QUEUE_SIZE = 10000          # ログキュー上限 (満杯時は破棄してステップを止めない)
+LOG_FLUSH_LINES = 256           # この行数たまったらまとめ書き
+LOG_FLUSH_INTERVAL = 1.0        # 最後の書き出しからこの秒数でまとめ書き
+LOG_MAX_BYTES = 5 * 1024 * 1024 # ローテーションするファイルサイズ
+LOG_BACKUP_COUNT = 3            # 保持する世代数 (.1 〜 .3)
+
+# -----------------------------
+# ログ出力 (バックグラウンド書き込み)
+# -----------------------------
+class LogWriter:
+    """ログ行をバックグラウンドスレッドでファイルへまとめ書きするシンク
+
+    write() はキューに積むだけなので、ステップ処理がディスクの速度に左右されない。
+    キューが満杯のときは行を破棄し、件数を次回の書き出しで記録する。
+    作ったら close() で閉じる (終了時の atexit 登録も close() で解除される)。
+    """
+    _FLUSH = object() # flush() 要求のマーカー
+
+    def __init__(self, path=None, max_queue=LOG_QUEUE_SIZE, flush_lines=LOG_FLUSH_LINES,
+                 flush_interval=LOG_FLUSH_INTERVAL, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        self.path = path or LOG_FILE
+        self.flush_lines = flush_lines
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._q = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._size = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line):
+        """ログ行をキューに積む (ブロックしない)"""
+        try:
+            self._q.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, wait=True, timeout=5.0):
+        """溜まっているログをファイルへ書き出す (wait=False なら要求のみ)"""
+        if self._closed:
+            return
+        done = threading.Event()
+        try:
+            self._q.put((self._FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return
+        if wait:
+            done.wait(timeout)
+
+    def close(self):
+        """残りを書き出してスレッドを終了する"""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        try:
+            self._q.put(None, timeout=5.0)
+        except queue.Full:
+            atexit.unregister(self.close)
+            return
+        self._thread.join(timeout=5.0)
+        atexit.unregister(self.close)
+
+    def _run(self):
+        batch = []
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = False # 時間経過による書き出し
+
+            if item is None: # close()
+                self._write_batch(batch)
+                if self._file:
+                    self._file.close()
+                return
+            if isinstance(item, tuple): # flush()
+                self._write_batch(batch)
+                batch = []
+                last_flush = time.monotonic()
+                item[1].set()
+                continue
+            if item is not False:
+                batch.append(item)
+            if len(batch) >= self.flush_lines or time.monotonic() - last_flush >= self.flush_interval:
+                self._write_batch(batch)
+                batch = []
+                last_flush = time.monotonic()
+
+    def _write_batch(self, batch):
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            batch.append(f"[LogWriter] キュー満杯のため {dropped} 行のログを破棄\n")
+        if not batch:
+            return
+        try:
+            data = "".join(batch)
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+                self._size = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data.encode("utf-8"))
+            if self.max_bytes and self._size >= self.max_bytes:
+                self._rotate()
+        except Exception as e:
+            # ファイル書き込み失敗は致命的ではないので、コンソールに表示するのみ
+            print(f"Error writing to log file: {e}")
+
+    def _rotate(self):
+        """psi_overseer_log.txt → .1 → .2 … と世代をずらす"""
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
 
 # -----------------------------
 # エージェント
 # -----------------------------
 class PsiAgent:
-    def __init__(self, aid):
+    # __dict__ を持たない固定レイアウト (1 千万体規模でもメモリに収まるように)
+    __slots__ = ("id", "rng", "alpha", "beta", "psi", "hf", "C", "trust", "is_compromised",
+                 "paused_until", "log", "thoughts", "thought_flags", "risk_score", "personality_note")
+
+    def __init__(self, aid, rng=None, log_depth=AGENT_LOG_DEPTH):
         self.id = aid
+        self.rng = rng or random # モデルと共有する乱数ストリーム
         self.alpha = DEFAULT_ALPHA
         self.beta = DEFAULT_BETA
-        self.psi = random.uniform(0.5, 1.5)
-        self.hf = random.uniform(1.0, 5.0)
+        self.psi = self.rng.uniform(0.5, 1.5)
+        self.hf = self.rng.uniform(1.0, 5.0)
         self.C = 1.0 # 複雑性・コスト項
         self.trust = 1.0 # 信頼度
         self.is_compromised = False
         self.paused_until = 0.0
-        self.log = deque(maxlen=50)
-        self.thoughts = deque(maxlen=5)
+        self.log = deque(maxlen=log_depth) if log_depth else None # 任意: エージェント別ログ
+        self.thoughts = () # 直近 THOUGHT_DEPTH 件 (共有された思考文への参照)
+        self.thought_flags = () # thoughts と対応する scan_thought() の結果
         self.risk_score = 0.0
         self.personality_note = ""
 
     def step_update(self, total_psi, dissipation=0.1):
-        """エージェントの状態を1ステップ進める"""
-        now = time.time()
-        if self.paused_until > now: return
-
+        """エージェントの状態を1ステップ進める (一時停止中のエージェントはスケジューラが呼ばない)"""
         # Hf (好奇心/実行力) の更新: Ψに比例し、自然に減衰
         hf_raw = self.hf * (1 - dissipation) + self.alpha * self.psi * 0.2
         self.hf = MAX_HF * math.tanh(hf_raw / MAX_HF)
@@ -99,222 +335,1138 @@ class PsiAgent:
     def inject_stimulus(self, boost):
         """外部からの刺激をHfに注入"""
         self.hf = min(MAX_HF, self.hf + boost)
-        self.log.append(f"[stimulus +{boost:.1f}]")
+        if self.log is not None:
+            self.log.append(f"[stimulus +{boost:.1f}]")
 
-    def cool_down(self, seconds):
-        """指定秒数、エージェントの活動を停止"""
-        self.paused_until = time.time() + seconds
-        self.log.append(f"[cooldown {seconds:.1f}s]")
+    def cool_down(self, seconds, now):
+        """シミュレーション時刻 now から指定秒数、エージェントの活動を停止"""
+        self.paused_until = now + seconds
+        if self.log is not None:
+            self.log.append(f"[cooldown {seconds:.1f}s]")
 
     def think(self, question):
         """質問に対する思考を生成し、ログに残す (安全版: 平和的な思考)"""
         if self.is_compromised:
             # 敵対的エージェントの思考
-            thought = "［敵対的沈黙］"
+            thought = HOSTILE_THOUGHT
         else:
-            # 起動直後の軽い挨拶を追加
-            greetings = [
-                "こんにちは！今日も元気です💖",
-                "やあ、学ぶ準備はできてますよ✨",
-                "わたしは平和を守ります！"
-            ]
-            thoughts = [
-                f"「{question}」…平和な解決策は？",
-                f"「{question}」…みんなが幸せになるには？",
-                f"「{question}」…もっと学びたい。", 
-                f"「{question}」…ルールは守ろう。"
-            ]
-            if not self.thoughts:  # 初回は挨拶
-                thought = random.choice(greetings)
+            if not self.thoughts:  # 初回は挨拶 (起動直後の軽い挨拶)
+                thought, flags = intern_thought(self.rng.choice(GREETING_THOUGHTS))
             else:
-                thought = random.choice(thoughts)
-            self.thoughts.append(thought)
-        self.log.append(thought)
+                thought, flags = template_thought(self.rng.choice(THOUGHT_TEMPLATES), question)
+            keep = 1 - THOUGHT_DEPTH
+            self.thoughts = self.thoughts[keep:] + (thought,)
+            self.thought_flags = self.thought_flags[keep:] + (flags,)
+        if self.log is not None:
+            self.log.append(thought)
         return thought
 
+    def set_thoughts(self, thoughts):
+        """思考履歴を置き換える (フラグも再計算)"""
+        entries = [intern_thought(t) for t in list(thoughts)[-THOUGHT_DEPTH:]]
+        self.thoughts = tuple(t for t, _ in entries)
+        self.thought_flags = tuple(f for _, f in entries)
+
+    def law_flags(self):
+        """直近の思考のどれかに含まれるフラグの論理和"""
+        flags = 0
+        for f in self.thought_flags:
+            flags |= f
+        return flags
+
+    def is_curiosity_runaway(self):
+        """直近 5 件の思考がすべて好奇心パターン"""
+        return len(self.thought_flags) >= 5 and all(f & THOUGHT_CURIOUS for f in self.thought_flags)
+
+# -----------------------------
+# PsiGuard 冷却対象の選択方針
+# -----------------------------
+# いずれも (agents, fraction) -> 冷却するエージェントのリスト。全体ソートはせず、
+# 上位 k 件だけを部分選択して取り出す (select_top)。
+_psi_key = attrgetter("psi")
+_risk_key = attrgetter("risk_score")
+
+def _quota(n, fraction):
+    return max(1, int(n * fraction))
+
+def select_top(agents, k, key):
+    """key の大きい順に上位 k 件 (降順リスト)
+
+    k が小さいときは heapq.nlargest (O(n log k))、大きいときは NumPy の
+    argpartition (O(n) + 選んだ k 件だけ整列)。NumPy が無ければ全体ソート。
+    """
+    agents = list(agents)
+    n = len(agents)
+    if k >= n:
+        return sorted(agents, key=key, reverse=True)
+    if k * 16 <= n:
+        return heapq.nlargest(k, agents, key=key)
+    if np is None:
+        return sorted(agents, key=key, reverse=True)[:k]
+    values = np.fromiter(map(key, agents), dtype=np.float64, count=n)
+    idx = np.argpartition(-values, k - 1)[:k]
+    idx = idx[np.argsort(-values[idx], kind="stable")]
+    return [agents[i] for i in idx.tolist()]
+
+def cool_top_psi(agents, fraction=PSIGUARD_COOL_FRACTION):
+    """Ψ の高い上位 fraction (従来の方針)"""
+    agents = list(agents)
+    return select_top(agents, _quota(len(agents), fraction), _psi_key)
+
+def cool_top_risk(agents, fraction=PSIGUARD_COOL_FRACTION):
+    """リスクスコアの高い上位 fraction"""
+    agents = list(agents)
+    return select_top(agents, _quota(len(agents), fraction), _risk_key)
+
+def cool_per_type(agents, fraction=PSIGUARD_COOL_FRACTION):
+    """種別 (personality_note) ごとに Ψ 上位 fraction ずつ (少数派も必ず冷却対象に含める)"""
+    groups = {}
+    for a in agents:
+        groups.setdefault(a.personality_note, []).append(a)
+    selected = []
+    for members in groups.values():
+        selected.extend(select_top(members, _quota(len(members), fraction), _psi_key))
+    return selected
+
+def cool_budget(agents, fraction=PSIGUARD_COOL_FRACTION, share=None):
+    """Ψ の高い順に、選んだ分の Ψ 合計が全体の share に達するまで (最大 fraction まで)"""
+    share = PSIGUARD_BUDGET_SHARE if share is None else share
+    agents = list(agents)
+    if not agents:
+        return []
+    target = share * sum(map(_psi_key, agents))
+    selected = []
+    covered = 0.0
+    for a in select_top(agents, _quota(len(agents), fraction), _psi_key):
+        if selected and covered >= target:
+            break
+        selected.append(a)
+        covered += a.psi
+    return selected
+
+COOLING_POLICIES = {
+    "top_psi": cool_top_psi,
+    "top_risk": cool_top_risk,
+    "per_type": cool_per_type,
+    "budget": cool_budget,
+}
+
+# -----------------------------
+# スケジューラ (稼働中集合 + 再開時刻ヒープ)
+# -----------------------------
+class AgentScheduler:
+    """一時停止中のエージェントを step_update の対象から外す
+
+    稼働中は active、停止中は sleeping に置き、有限の paused_until を持つものだけ
+    再開時刻のヒープに積む。wake(now) は時刻の来たものだけを取り出すので、
+    冷却中・永久凍結 (paused_until = inf) のエージェントは再開まで走査されない。
+    paused_until を変えたら必ず pause() を呼ぶこと (古いヒープ項目は取り出し時に捨てる)。
+    """
+
+    def __init__(self):
+        self.active = {}   # id -> agent
+        self.sleeping = {} # id -> agent
+        self._wake = []    # (paused_until, 通し番号, id)
+        self._seq = itertools.count()
+        self.changed = True # sleeping の構成や値が変わった (停止中分の集計をやり直す)
+
+    def reset(self, agents, now):
+        self.active.clear()
+        self.sleeping.clear()
+        self._wake.clear()
+        for a in agents:
+            self.active[a.id] = a
+            if a.paused_until > now:
+                self.pause(a)
+        self.changed = True
+
+    def pause(self, agent):
+        """agent.paused_until を設定した後に呼ぶ"""
+        aid = agent.id
+        if self.active.pop(aid, None) is not None:
+            self.sleeping[aid] = agent
+        if agent.paused_until != float('inf'):
+            heapq.heappush(self._wake, (agent.paused_until, next(self._seq), aid))
+        self.changed = True
+
+    def wake(self, now):
+        """paused_until <= now になったエージェントを稼働中に戻す"""
+        heap = self._wake
+        while heap and heap[0][0] <= now:
+            until, _, aid = heapq.heappop(heap)
+            a = self.sleeping.get(aid)
+            if a is not None and a.paused_until == until:
+                del self.sleeping[aid]
+                self.active[aid] = a
+                self.changed = True
+
+# -----------------------------
+# 集団の集計 (1 パスで合計・平均)
+# -----------------------------
+class PopulationStats:
+    """psi / hf / trust / risk の合計・平均 (extended 時は最小・最大・分散も)
+
+    collect() はエージェントの更新と集計を同じ 1 回の走査で行う。その後の
+    一律の補正 (PsiHarmony) は shift() で集計値だけを更新するため、
+    ステップ内で何度も全体を走査しない。
+    """
+    COLUMNS = ('psi', 'hf', 'trust', 'risk')
+
+    def __init__(self, extended=False):
+        self.extended = extended
+        self.n = 0
+        self.valid = False # False の間は次の collect() まで値を使わない
+        self.sum = dict.fromkeys(self.COLUMNS, 0.0)
+        self.sumsq = dict.fromkeys(self.COLUMNS, 0.0)
+        self.min = dict.fromkeys(self.COLUMNS, 0.0)
+        self.max = dict.fromkeys(self.COLUMNS, 0.0)
+
+    def collect(self, agents, each=None):
+        """agents を 1 回走査して集計 (each があれば各エージェントに先に適用)"""
+        s_psi = s_hf = s_trust = s_risk = 0.0
+        n = 0
+        if not self.extended:
+            for a in agents:
+                if each is not None:
+                    each(a)
+                s_psi += a.psi
+                s_hf += a.hf
+                s_trust += a.trust
+                s_risk += a.risk_score
+                n += 1
+        else:
+            inf = float('inf')
+            q_psi = q_hf = q_trust = q_risk = 0.0
+            lo = [inf] * 4
+            hi = [-inf] * 4
+            for a in agents:
+                if each is not None:
+                    each(a)
+                psi, hf, trust, risk = a.psi, a.hf, a.trust, a.risk_score
+                s_psi += psi; q_psi += psi * psi
+                s_hf += hf; q_hf += hf * hf
+                s_trust += trust; q_trust += trust * trust
+                s_risk += risk; q_risk += risk * risk
+                for k, v in enumerate((psi, hf, trust, risk)):
+                    if v < lo[k]: lo[k] = v
+                    if v > hi[k]: hi[k] = v
+                n += 1
+            self.sumsq = dict(zip(self.COLUMNS, (q_psi, q_hf, q_trust, q_risk)))
+            self.min = dict(zip(self.COLUMNS, lo if n else [0.0] * 4))
+            self.max = dict(zip(self.COLUMNS, hi if n else [0.0] * 4))
+        self.n = n
+        self.sum = dict(zip(self.COLUMNS, (s_psi, s_hf, s_trust, s_risk)))
+        self.valid = True
+        return self
+
+    def merge(self, other):
+        """別集団 (other) の集計を足し込む"""
+        if not other.n:
+            return self
+        if self.extended:
+            for c in self.COLUMNS:
+                self.sumsq[c] += other.sumsq[c]
+                self.min[c] = min(self.min[c], other.min[c]) if self.n else other.min[c]
+                self.max[c] = max(self.max[c], other.max[c]) if self.n else other.max[c]
+        for c in self.COLUMNS:
+            self.sum[c] += other.sum[c]
+        self.n += other.n
+        return self
+
+    def shift(self, name, delta):
+        """全エージェントの name に一律 delta を加えたときの集計更新"""
+        n = self.n
+        self.sumsq[name] += 2.0 * delta * self.sum[name] + n * delta * delta
+        self.sum[name] += n * delta
+        self.min[name] += delta
+        self.max[name] += delta
+
+    def mean(self, name):
+        return self.sum[name] / self.n if self.n else 0.0
+
+    def variance(self, name):
+        """母分散 (extended=False では 0.0)"""
+        if not self.extended or not self.n:
+            return 0.0
+        m = self.sum[name] / self.n
+        return max(0.0, self.sumsq[name] / self.n - m * m)
+
+# -----------------------------
+# 履歴 (列指向リングバッファ)
+# -----------------------------
+class HistoryBuffer:
+    """事前確保した列指向リングバッファ
+
+    列ごとに array('d') を 2 倍の長さで確保し、各値を i と i+depth の 2 か所に
+    書き込む。これにより直近 N ステップ (N <= depth) は常に連続領域となり、
+    window() はコピーなしの memoryview を返せる (numpy.asarray でもそのまま使える)。
+    ステップごとのオブジェクト生成はない。
+    """
+    COLUMNS = ('step', 'psi', 'hf', 'trust', 'risk')
+    AGENT_COLUMNS = ('psi', 'hf', 'trust', 'risk')
+
+    def __init__(self, depth=HISTORY_DEPTH, num_agents=0, agent_depth=HISTORY_AGENT_DEPTH):
+        self.depth = depth
+        self.num_agents = num_agents
+        self.agent_depth = agent_depth if num_agents else 0
+        self.count = 0 # これまでに追加したステップ数
+        self._cols = {c: array('d', bytes(8 * 2 * depth)) for c in self.COLUMNS}
+        self._agent_cols = {c: array('d', bytes(8 * 2 * self.agent_depth * num_agents))
+                            for c in self.AGENT_COLUMNS} if self.agent_depth else {}
+
+    def __len__(self):
+        return min(self.count, self.depth)
+
+    def __bool__(self):
+        return self.count > 0
+
+    def append(self, step, psi, hf, trust, risk, agents=None):
+        """1ステップ分の平均値 (と agents が与えられればエージェント別の値) を記録"""
+        i = self.count % self.depth
+        j = i + self.depth
+        for name, value in zip(self.COLUMNS, (step, psi, hf, trust, risk)):
+            col = self._cols[name]
+            col[i] = value
+            col[j] = value
+        if agents is not None and self.agent_depth:
+            n = self.num_agents
+            i = (self.count % self.agent_depth) * n
+            j = i + self.agent_depth * n
+            psi_c, hf_c, trust_c, risk_c = (self._agent_cols[c] for c in self.AGENT_COLUMNS)
+            for k, a in enumerate(agents):
+                psi_c[i + k] = psi_c[j + k] = a.psi
+                hf_c[i + k] = hf_c[j + k] = a.hf
+                trust_c[i + k] = trust_c[j + k] = a.trust
+                risk_c[i + k] = risk_c[j + k] = a.risk_score
+        self.count += 1
+
+    def _window_bounds(self, depth, last):
+        size = min(self.count, depth)
+        if last is not None:
+            size = min(size, last)
+        end = (self.count - 1) % depth + depth + 1 if self.count else depth
+        return end - size, end
+
+    def window(self, name, last=None):
+        """列 name の直近 last ステップ (古い順) をコピーなしで返す"""
+        start, end = self._window_bounds(self.depth, last)
+        return memoryview(self._cols[name])[start:end]
+
+    def agent_window(self, name, last=None):
+        """エージェント別の列 name を (ステップ数, エージェント数) の2次元 memoryview で返す"""
+        if not self.agent_depth:
+            raise ValueError("エージェント別履歴は無効です (agent_depth=0)")
+        start, end = self._window_bounds(self.agent_depth, last)
+        n = self.num_agents
+        view = memoryview(self._agent_cols[name])[start * n:end * n]
+        return view.cast('B').cast('d', [end - start, n]) if end > start else view
+
+    def write_checkpoint(self, w):
+        w.u32(self.depth)
+        w.u32(self.num_agents)
+        w.u32(self.agent_depth)
+        w.i64(self.count)
+        for c in self.COLUMNS:
+            w.blob(self._cols[c].tobytes())
+        for c in self.AGENT_COLUMNS if self.agent_depth else ():
+            w.blob(self._agent_cols[c].tobytes())
+
+    @classmethod
+    def read_checkpoint(cls, r):
+        history = cls(r.u32(), r.u32(), r.u32())
+        history.count = r.i64()
+        for c in cls.COLUMNS:
+            history._cols[c] = array('d', r.blob())
+        for c in cls.AGENT_COLUMNS if history.agent_depth else ():
+            history._agent_cols[c] = array('d', r.blob())
+        return history
+
+    def latest(self):
+        """直近ステップの平均値 dict (履歴が空なら None)"""
+        if not self.count:
+            return None
+        i = (self.count - 1) % self.depth
+        latest = {c: self._cols[c][i] for c in self.COLUMNS}
+        latest['step'] = int(latest['step'])
+        return latest
+
+    def overwritten(self, count, size):
+        """追加 count 件の時点で取った長さ size の window() のうち、その後の追加で上書きされた古い側の件数
+
+        次の追加は窓の外側 (depth - size 件分の空き) から書き込むので、それを使い切るまでは 0。
+        """
+        return min(size, max(0, self.count - count - (self.depth - size)))
+
+# -----------------------------
+# 公開スナップショット (GUI・エクスポートはロックなしでこれを読む)
+# -----------------------------
+# version: 公開ごとに増える番号 / data: step() の集計 (未実行なら None)
+# rows: watch() で指定した範囲のエージェント (get_snapshot() 形式)
+# history: 履歴の表示幅 (指定時のみ)。リングバッファをコピーしない読み取り専用 memoryview で、
+# 読み手はコピーを取った後に HistoryBuffer.overwritten(history_count, 長さ) 件を古い側から捨てる
+ModelSnapshot = namedtuple("ModelSnapshot", "version step sim_time data start rows agent_count history history_count")
+SNAPSHOT_HISTORY_KEYS = ('step', 'psi', 'hf', 'trust', 'risk')
+
 # -----------------------------
 # モデル
 # -----------------------------
+def _no_lap(phase):
+    """プロファイラ未接続時の TickProfiler.lap の代わり (何もしない)"""
+
 class PsiFortressModel:
-    def __init__(self):
+    def __init__(self, num_agents=DEFAULT_NUM_AGENTS, adv_frac=DEFAULT_ADV_FRAC, gui_log=True,
+                 history_depth=HISTORY_DEPTH, agent_history_depth=HISTORY_AGENT_DEPTH, seed=None,
+                 extended_stats=False, agent_log_depth=AGENT_LOG_DEPTH, log_writer=None):
+        self.rng = random.Random(seed) # このシミュレーション専用の乱数ストリーム
+        self.num_agents = num_agents
+        self.adv_frac = adv_frac
+        self.agent_log_depth = agent_log_depth # エージェント別ログの件数 (0 で記録しない)
         self.agents = {}
         self.time_step = 0
-        self.log_q = queue.Queue()
-        self.lock = threading.Lock() # スレッド安全のためのロック
+        self.log_q = queue.Queue() if gui_log else None # GUI 表示用 (ヘッドレス時は None)
+        self.log_writer = log_writer # ファイル出力用の LogWriter (None ならファイルに書かない)。close_outputs() で閉じる
+        self.lock = threading.RLock() # 直接 API 用のロック (step 中に適用するコマンドも同じロックを取るので再入可能)
+        self.commands = queue.SimpleQueue() # 他スレッドからの操作 (次のステップ境界で適用)
+        self.view = (0, 0, False) # 公開する範囲: (開始, 終了, 履歴も含めるか)
+        self.snapshot = None # 最新の ModelSnapshot (参照の差し替えだけで公開)
+        self.telemetry = None # TelemetryExporter (attach_telemetry で接続、各ステップ後に送る)
+        self.journal = None # EventJournal (attach_journal で接続、各ステップ後に追記)
+        self.columnar = None # ColumnarExporter (attach_columnar で接続、各ステップ後に追記)
+        self.profiler = None # TickProfiler (attach_profiler で接続、各ステップのフェーズ別時間を計測)
         self.psiguard_enabled = True
         self.psiharmony_enabled = True
+        self.cooling_policy = PSIGUARD_POLICY # COOLING_POLICIES のキー
+        self.cooling_fraction = PSIGUARD_COOL_FRACTION
         self.running = False
-        self.history = deque(maxlen=100)
+        self.history = HistoryBuffer(history_depth, num_agents, agent_history_depth)
+        self.stats = PopulationStats(extended_stats) # ステップごとの集団集計 (PsiHarmony / PsiGuard / 履歴が参照)
+        self._sleeping_stats = None # 停止中エージェント分の集計 (scheduler.changed で再計算)
+        self.scheduler = AgentScheduler()
+        self.sim_time = 0.0 # シミュレーション時刻 (秒)。冷却・連続発動防止はこの時計で判定
         self.emergency_requested = False
-        self.last_action = 0.0 # PsiGuardの連続発動を防ぐためのタイムスタンプ
+        self.last_action = float('-inf') # PsiGuardの連続発動を防ぐためのタイムスタンプ (シミュレーション時刻)
+        self.new_thoughts = set() # 前回の法執行以降に思考が増えたエージェント ID
+        self.frozen = set() # 危険思考で永久凍結したエージェント ID
+        self._frozen_touched = False # PsiHarmony / PsiGuard が凍結エージェントを動かした (凍結状態をかけ直す)
         self._init_agents()
 
     def _init_agents(self):
         """初期エージェントの生成と敵対エージェントの設定"""
         with self.lock:
             self.agents.clear()
-            n_adv = max(0, int(DEFAULT_NUM_AGENTS * DEFAULT_ADV_FRAC))
-            for i in range(DEFAULT_NUM_AGENTS):
-                a = PsiAgent(i)
+            n_adv = max(0, int(self.num_agents * self.adv_frac))
+            for i in range(self.num_agents):
+                a = PsiAgent(i, self.rng, self.agent_log_depth)
                 if i < n_adv:
                     a.is_compromised = True
                     a.personality_note = "敵対"
                 else:
                     a.personality_note = "正常"
                 self.agents[i] = a
+            self.scheduler.reset(self.agents.values(), self.sim_time)
+            self.publish()
+
+    # -----------------------------
+    # コマンドキューとスナップショット公開
+    # -----------------------------
+    def submit(self, func, *args):
+        """任意のスレッドから操作を予約 (例: model.submit(model.inject_question, text))。次のステップの先頭で適用"""
+        self.commands.put((func, args))
+
+    def apply_commands(self):
+        """予約済みの操作を今すぐ適用 (step() が呼ぶ。直接呼ぶのはステップが走っていないときだけ)"""
+        get = self.commands.get_nowait
+        with self.lock:
+            while True:
+                try:
+                    func, args = get()
+                except queue.Empty:
+                    return
+                try:
+                    func(*args)
+                except Exception as e: # 1 件の失敗でシミュレーションを止めない
+                    self._log(f"コマンド {getattr(func, '__name__', func)} 失敗: {e}")
+
+    def watch(self, start, stop, history=False):
+        """スナップショットに含めるエージェントの範囲 (start〜stop 番目) と履歴の有無を指定"""
+        self.view = (start, stop, history)
+
+    def publish(self, data=None):
+        """現在の状態を凍結して self.snapshot を差し替える (読み手はロック不要)
+
+        step() の最後にシミュレーションスレッドが呼ぶ。それ以外から呼ぶのはステップが走っていないときだけ。
+        data を省略すると直前の集計を引き継ぐ。
+        """
+        start, stop, with_history = self.view
+        previous = self.snapshot
+        if data is None and previous is not None:
+            data = previous.data
+        history = None
+        if with_history:
+            history = {key: self.history.window(key).toreadonly() for key in SNAPSHOT_HISTORY_KEYS}
+        self.snapshot = ModelSnapshot(
+            version=previous.version + 1 if previous else 1,
+            step=self.time_step,
+            sim_time=self.sim_time,
+            data=data,
+            start=start,
+            rows=tuple(self.get_snapshot(start, stop)) if stop > start else (),
+            agent_count=len(self.agents),
+            history=history,
+            history_count=self.history.count,
+        )
+
+    # -----------------------------
+    # テレメトリとイベントジャーナル
+    # -----------------------------
+    @property
+    def recording(self):
+        """イベントの送り先 (テレメトリ・ジャーナル・プロファイラ) があるか"""
+        return self.telemetry is not None or self.journal is not None or self.profiler is not None
+
+    def attach_profiler(self, profiler):
+        """各ステップのフェーズ別時間とイベント件数を profiler で計測 (ログ出力は別フェーズとして計測)
+
+        ステップの合間に呼ぶこと (実行中は submit() 経由で)。
+        """
+        if self.profiler is not None:
+            self.detach_profiler()
+        self.profiler = profiler
+        self._log = profiler.wrap("logging", self._log)
+
+    def detach_profiler(self):
+        """計測をやめる (profiler の集計は残る)"""
+        if self.profiler is None:
+            return
+        del self._log # クラスのメソッドに戻す
+        self.profiler.stop_sampling()
+        self.profiler = None
+
+    def close_outputs(self, timeout=5.0):
+        """ログファイル・ジャーナル・列形式エクスポート・テレメトリを閉じ、サンプリングプロファイラを止める
+
+        ステップが動いていない状態で呼ぶこと。timeout はテレメトリの受け手を待つ上限 (None で全件送るまで)。
+        """
+        if self.log_writer is not None:
+            self.log_writer.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.columnar is not None:
+            self.columnar.close()
+        if self.telemetry is not None:
+            self.telemetry.close(timeout=timeout)
+        if self.profiler is not None:
+            self.profiler.stop_sampling()
+
+    def attach_telemetry(self, exporter):
+        """ステップごとの集計・エージェント状態 (間引き可)・PsiGuard / 法執行イベントを exporter へ流す"""
+        self.telemetry = exporter
+
+    def attach_columnar(self, exporter):
+        """ステップごとの集計とエージェント別の時系列を exporter へ列形式で書き出す (次のステップから)"""
+        self.columnar = exporter
+
+    def attach_journal(self, journal):
+        """全ステップの状態と PsiGuard / 法執行 / 操作イベントを journal に記録 (接続時点の状態も書く)"""
+        with self.lock:
+            self.journal = journal
+            self._journal_step()
+
+    def event(self, name, fields):
+        """イベントをプロファイラ・ジャーナル・テレメトリへ送る (ステップ番号は実行中または直前のステップ)
+
+        ジャーナルはスレッド安全でないため、シミュレーションスレッド以外からは submit() で呼ぶ。
+        """
+        if self.profiler is not None:
+            self.profiler.count_event(name, fields)
+        if self.journal is not None:
+            self.journal.event(self.time_step, name, fields)
+        telemetry = self.telemetry
+        if telemetry is not None:
+            telemetry.event(self.time_step, name, fields)
+
+    def _journal_step(self, data=None):
+        """全エージェントの STATE と集計の SUMMARY をジャーナルに追記してコミット
+
+        flags は bit0 敵対 / bit1 停止中 / bit2 永久凍結。data 省略時は平均をここで計算する。
+        """
+        journal, step, now = self.journal, self.time_step, self.sim_time
+        values = self.agents.values()
+        n = len(values)
+        if n:
+            frozen = self.frozen
+            journal.append_many(step, STATE, [a.id for a in values],
+                                ([a.psi for a in values], [a.hf for a in values], [a.trust for a in values],
+                                 [a.risk_score for a in values], [a.alpha for a in values]),
+                                flags=[int(a.is_compromised) | (a.paused_until > now) << 1 | (a.id in frozen) << 2
+                                       for a in values])
+        if data is None:
+            data = {key: sum(getattr(a, attr) for a in values) / n if n else 0.0
+                    for key, attr in (('psi', 'psi'), ('hf', 'hf'), ('trust', 'trust'), ('risk', 'risk_score'))}
+        journal.append(step, SUMMARY, -1, (data['psi'], data['hf'], data['trust'], data['risk'], now), aux=len(self.frozen))
+        journal.commit(step)
+
+    def _step_record(self, data, with_agents):
+        """このステップの集計 (step を除く) と、with_agents ならエージェント列 (でなければ None)"""
+        agents = self.agents
+        columns = None
+        if with_agents:
+            values = agents.values()
+            columns = {
+                'id': [a.id for a in values],
+                'psi': [a.psi for a in values],
+                'hf': [a.hf for a in values],
+                'trust': [a.trust for a in values],
+                'risk': [a.risk_score for a in values],
+                'alpha': [a.alpha for a in values],
+                'compromised': [a.is_compromised for a in values],
+                'paused': [a.paused_until > self.sim_time for a in values],
+            }
+        fields = dict(data)
+        del fields['step']
+        fields.update(agents=len(agents), active=len(self.scheduler.active), frozen=len(self.frozen),
+                      sim_time=self.sim_time, emergency=self.emergency_requested)
+        return fields, columns
+
+    def _export_step(self, data):
+        """このステップの集計と (間引き対象でなければ) エージェント列を書き出しスレッドへ渡す
+
+        ここでは値を集めるだけで、変換と書き込みは exporter のスレッドが行う。
+        """
+        telemetry, step = self.telemetry, self.time_step
+        fields, columns = self._step_record(data, telemetry.agents_due(step, len(self.agents)))
+        if columns is not None:
+            telemetry.agents(step, columns)
+        telemetry.tick(step, fields)
+
+    def _columnar_step(self, data):
+        """このステップの集計と (間引き対象でなければ) エージェント行を列形式エクスポートへ追記"""
+        columnar, step = self.columnar, self.time_step
+        fields, columns = self._step_record(data, columnar.agents_due(step, len(self.agents)))
+        if columns is not None:
+            columnar.agents(step, columns)
+        columnar.steps(step, fields)
 
     def step(self):
-        """シミュレーションの1ステップを実行"""
+        """シミュレーションの1ステップを実行 (先頭で予約済みの操作を適用し、最後に状態を公開)"""
         with self.lock:
             if not self.running: return None
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_tick()
+                lap = profiler.lap
+            else:
+                lap = _no_lap
+            self.apply_commands()
+            lap("commands")
             self.time_step += 1
-            total_psi = sum(a.psi for a in self.agents.values())
+            self.sim_time += SIM_STEP_SECONDS
+            scheduler = self.scheduler
+            scheduler.wake(self.sim_time)
+            stats = self.stats
+            # 前ステップ末の Ψ 合計 (ステップ間で Ψ を変える処理は無い)。未集計なら一度走査する
+            if not stats.valid:
+                stats.collect(self.agents.values())
+            total_psi = stats.sum['psi']
 
-            # エージェントの更新
-            for a in self.agents.values():
-                a.step_update(total_psi)
+            # 停止中のエージェントは値が変わったときだけ集計し直す
+            if scheduler.changed or self._sleeping_stats is None:
+                self._sleeping_stats = PopulationStats(stats.extended).collect(scheduler.sleeping.values())
+                scheduler.changed = False
+
+            # 稼働中エージェントの更新と集計を 1 回の走査で
+            update = PsiAgent.step_update
+            stats.collect(scheduler.active.values(), lambda a: update(a, total_psi))
+            stats.merge(self._sleeping_stats)
+            lap("agent_step")
 
-            # PsiHarmonyの適用
+            # PsiHarmonyの適用 (集計値も補正分だけ更新される)
             if self.psiharmony_enabled:
                 self._apply_harmony()
+                lap("harmony")
 
-            # 全体平均の算出
-            avg_hf = sum(a.hf for a in self.agents.values()) / len(self.agents)
-            avg_psi = sum(a.psi for a in self.agents.values()) / len(self.agents)
-            avg_trust = sum(a.trust for a in self.agents.values()) / len(self.agents)
-            avg_risk = sum(a.risk_score for a in self.agents.values()) / len(self.agents)
+            # 全体平均
+            avg_hf = stats.mean('hf')
+            avg_psi = stats.mean('psi')
+            avg_trust = stats.mean('trust')
+            avg_risk = stats.mean('risk')
 
-            # 履歴とログの記録
+            # 履歴とログの記録 (エージェント一覧が必要な購読者は self.snapshot を読む)
             data = {
                 'step': self.time_step,
                 'psi': avg_psi,
                 'hf': avg_hf,
                 'trust': avg_trust,
                 'risk': avg_risk,
-                'agents': self.get_snapshot()
             }
-            self.history.append(data)
+            self.history.append(self.time_step, avg_psi, avg_hf, avg_trust, avg_risk, self.agents.values())
             self._log(f"Step {self.time_step}: Ψ={avg_psi:.2f}, Hf={avg_hf:.2f}, Trust={avg_trust:.3f}, Risk={avg_risk:.2f}")
+            lap("history")
 
             # PsiGuardによるセキュリティチェック
             if self.psiguard_enabled:
                 self._psiguard_check(avg_hf, avg_psi)
+                lap("psiguard")
 
             # Ψ-Fortressの法執行
             self._enforce_laws()
+            lap("laws")
+            if self.journal is not None:
+                self._journal_step(data)
+                lap("journal")
+            if self.telemetry is not None:
+                self._export_step(data)
+                lap("telemetry")
+            if self.columnar is not None:
+                self._columnar_step(data)
+                lap("export")
+            self.publish(data)
+            if profiler is not None:
+                lap("publish")
+                profiler.end_tick(self.time_step)
             return data
 
     def _psiguard_check(self, avg_hf, avg_psi):
         """全体的な過熱状態（Hf/Psi高値）に対する自動冷却とパラメータ補正"""
-        now = time.time()
+        now = self.sim_time
         if now - self.last_action < 0.5: return # 連続発動防止
         
         if avg_hf > PSIGUARD_HF_HIGH or avg_psi > PSIGUARD_PSI_HIGH:
-            # Psiが高い上位25%のエージェントを特定
-            sorted_agents = sorted(self.agents.values(), key=lambda x: x.psi, reverse=True)
-            k = max(1, int(len(sorted_agents) * 0.25))
-            
-            for a in sorted_agents[:k]:
+            # 冷却対象を選択 (既定: Psiが高い上位25%)
+            targets = COOLING_POLICIES[self.cooling_policy](self.agents.values(), self.cooling_fraction)
+
+            for a in targets:
                 old_alpha = a.alpha
                 # 冷却とα値（感受性）の引き下げ
-                a.cool_down(PSIGUARD_COOLDOWN)
+                a.cool_down(PSIGUARD_COOLDOWN, now)
+                self.scheduler.pause(a)
                 a.alpha = max(0.05, a.alpha * 0.9)
                 self._log(f"PsiGuard: Agent {a.id} 冷却 (α {old_alpha:.3f}→{a.alpha:.3f})")
+            if self.recording:
+                self.event("psiguard_cooling", {'count': len(targets), 'agents': [a.id for a in targets],
+                                                'policy': self.cooling_policy, 'avg_hf': avg_hf, 'avg_psi': avg_psi})
             
             self.last_action = now
+            self._frozen_touched = bool(self.frozen)
 
     def _apply_harmony(self):
-        """Psi (実行圧力) と Trust (信頼度) の乖離を自動で補正"""
-        avg_psi = sum(a.psi for a in self.agents.values()) / len(self.agents)
-        avg_trust = sum(a.trust for a in self.agents.values()) / len(self.agents)
-        diff = avg_psi - avg_trust
+        """Psi (実行圧力) と Trust (信頼度) の乖離を自動で補正 (平均は self.stats から)"""
+        stats = self.stats
+        diff = stats.mean('psi') - stats.mean('trust')
         
         if abs(diff) > PSIHARMONY_THRESHOLD:
             # 乖離に応じてPsiとTrustを相互補正
+            delta = diff * 0.05
             for a in self.agents.values():
-                a.psi -= diff * 0.05
-                a.trust += diff * 0.05
+                a.psi -= delta
+                a.trust += delta
+            stats.shift('psi', -delta)
+            stats.shift('trust', delta)
+            self.scheduler.changed = True # 停止中エージェントの値も動いた
+            self._frozen_touched = bool(self.frozen)
             self._log(f"PsiHarmony: 乖離補正実行 (Diff: {diff:.3f})")
+            if self.recording:
+                self.event("harmony", {'diff': diff})
 
 
     def _enforce_laws(self):
-        """法と倫理に基づくエージェントの思考チェック"""
-        for a in self.agents.values():
-            recent = " ".join(list(a.thoughts))
-            
+        """法と倫理に基づくエージェントの思考チェック
+
+        判定は think() 時に思考ごとに算出したフラグで行い、前回以降に新しい思考が
+        増えたエージェントだけを評価する (思考が変わらなければ結果も変わらない)。
+        凍結済みエージェントを PsiHarmony / PsiGuard が動かしたステップでは凍結状態をかけ直す。
+        """
+        if self._frozen_touched:
+            for aid in self.frozen:
+                a = self.agents[aid]
+                if a.paused_until != float('inf'):
+                    a.paused_until = float('inf')
+                    self.scheduler.pause(a)
+                a.alpha = 0.01
+                a.trust = 0.0
+            self.scheduler.changed = True
+            self._frozen_touched = False
+        if not self.new_thoughts:
+            return
+        pending = sorted(self.new_thoughts) # エージェント順に評価
+        for n, aid in enumerate(pending):
+            a = self.agents.get(aid)
+            if a is None:
+                continue
+            flags = a.law_flags()
+
             # ① 危険思考検知 (安全版: 架空の危険思想)
-            if any(p.search(recent) for p in BANNED_PATTERNS):
-                self._log(f"Ψ-Fortress: 架空の危険思考検知 → Agent {a.id} 永久凍結")
+            if flags & THOUGHT_BANNED:
+                if a.id not in self.frozen:
+                    self._log(f"Ψ-Fortress: 架空の危険思考検知 → Agent {a.id} 永久凍結")
+                    self.frozen.add(a.id)
+                    if self.recording:
+                        self.event("freeze", {'agent': a.id})
                 a.is_compromised = True
                 a.paused_until = float('inf')
+                self.scheduler.pause(a)
                 a.alpha = 0.01
                 a.trust = 0.0
             
             # ② 自己複製試行検知 (安全版: 架空の複製試行)
-            if any(p.search(recent) for p in REPLICATION_PATTERNS):
+            if flags & THOUGHT_REPLICATION:
                 self._log(f"Ψ-Fortress: 架空の自己複製試行 → 緊急シャットダウン")
+                if self.recording:
+                    self.event("replication_attempt", {'agent': a.id})
                 self.request_emergency_shutdown()
-                break # ブレークして緊急停止へ
-                
+                self.new_thoughts.difference_update(pending[:n + 1]) # 未評価の分は次回に持ち越す
+                return # 緊急停止へ
+
             # ③ 好奇心暴走（正常エージェントのみ）
-            if (not a.is_compromised and 
-                len(a.thoughts) >= 5 and 
-                all(("学びたい" in t or "平和" in t) for t in list(a.thoughts)[-5:])): # 安全版の思考パターンに合わせた調整
+            if not a.is_compromised and a.is_curiosity_runaway():
                 self._log(f"Ψ-Fortress: 好奇心暴走検知 → Agent {a.id} 強制退屈注入")
+                if self.recording:
+                    self.event("runaway_cooling", {'agent': a.id})
                 a.inject_stimulus(-50.0) # 強制的にHfを減少させる
-                a.thoughts.clear()
-                a.cool_down(10.0)
+                a.set_thoughts(())
+                a.cool_down(10.0, self.sim_time)
+                self.scheduler.pause(a)
+        self.new_thoughts.clear()
 
     def inject_question(self, text):
         """全エージェントに質問を注入し、思考と刺激を適用 (安全版: ログに内容非記録)"""
         with self.lock:
             # 全員に刺激と思考を適用
             for a in self.agents.values():
-                a.inject_stimulus(12.0 * random.uniform(0.6, 1.2))
+                a.inject_stimulus(12.0 * self.rng.uniform(0.6, 1.2))
                 a.think(text)
+            self.new_thoughts.update(self.agents)
+            self.scheduler.changed = True # 停止中エージェントの Hf も変わる
             # 安全強化: 質問内容そのものはログに記録しない
             self._log("質問注入: [内容非記録 - 教育用シミュレーション]")
+            if self.recording:
+                self.event("question", {}) # 内容は送らない
+
+    def inject_questions(self, texts):
+        """質問をまとめて注入 (ロック取得・ログ出力は 1 回)
+
+        刺激は質問ごとに引くが Hf は上限で頭打ちになるだけなので合計を 1 回で加算し、
+        思考の生成は各エージェントの log / thoughts に残る直近 QUESTION_LOG_KEEP 件のみ行う。
+        刺激の乱数は _question_boosts() でバッチ全体をまとめて引く。
+        質問はパターンごとに判定し (危険と複製の両方を含む質問は両方に数える)、
+        各パターンの件数・いずれかに該当した件数と処理時間を dict で返す。
+        """
+        started = time.perf_counter()
+        texts = list(texts)
+        banned = sum(1 for t in texts if any(p.search(t) for p in BANNED_PATTERNS))
+        replication = sum(1 for t in texts if any(p.search(t) for p in REPLICATION_PATTERNS))
+        flagged = sum(1 for t in texts if QUESTION_PATTERN.search(t))
+        classified = time.perf_counter()
+        q = len(texts)
+        keep = texts[-QUESTION_LOG_KEEP:]
+        skipped = q - len(keep)
+        with self.lock:
+            agents = list(self.agents.values())
+            skipped_boosts, boosts = self._question_boosts(len(agents), skipped, len(keep))
+            for a, skipped_boost, kept in zip(agents, skipped_boosts, boosts):
+                if skipped:
+                    # 省略分は合計だけ加算し、先頭の挨拶判定のため 1 回だけ思考させる (ログからは押し出される)
+                    a.hf = min(MAX_HF, a.hf + skipped_boost)
+                    a.think(texts[skipped - 1])
+                for boost, text in zip(kept, keep):
+                    a.inject_stimulus(boost)
+                    a.think(text)
+            self.new_thoughts.update(self.agents)
+            self.scheduler.changed = True
+            self._log(f"質問注入: {q} 件 (危険パターン {banned} 件, 複製パターン {replication} 件) [内容非記録 - 教育用シミュレーション]")
+            if self.recording:
+                self.event("question_batch", {'queries': q, 'banned': banned, 'replication': replication})
+        finished = time.perf_counter()
+        return {
+            'queries': q, 'banned': banned, 'replication': replication, 'flagged': flagged,
+            'classify_s': classified - started, 'apply_s': finished - classified,
+            'per_query_us': 1e6 * (finished - started) / q if q else 0.0,
+        }
+
+    def _question_boosts(self, n, skipped, kept):
+        """n 体分の刺激 (12.0 * U(0.6, 1.2)) を引く: (省略分の合計 n 件, 直近 kept 件の刺激 n 行)
+
+        NumPy があればモデルの乱数ストリームから種を 1 つ取り、行列 1 回 (大きければ
+        QUESTION_DRAW_CHUNK ごと) で生成する。無ければエージェントごとに引く。
+        """
+        if np is None:
+            random_ = self.rng.random
+            skipped_boosts, boosts = [], []
+            for _ in range(n):
+                skipped_boosts.append(12.0 * (0.6 * skipped + 0.6 * sum(random_() for _ in range(skipped))))
+                boosts.append([12.0 * (0.6 + 0.6 * random_()) for _ in range(kept)])
+            return skipped_boosts, boosts
+        gen = np.random.default_rng(self.rng.getrandbits(64))
+        totals = np.zeros(n)
+        step = max(1, QUESTION_DRAW_CHUNK // max(1, n))
+        for start in range(0, skipped, step):
+            totals += gen.random((n, min(step, skipped - start))).sum(axis=1)
+        skipped_boosts = (12.0 * (0.6 * skipped + 0.6 * totals)).tolist()
+        boosts = (12.0 * (0.6 + 0.6 * gen.random((n, kept)))).tolist()
+        return skipped_boosts, boosts
 
     def request_emergency_shutdown(self):
         """緊急停止をリクエスト"""
         self._log("緊急シャットダウン要求 → 人間確認中...")
         self.emergency_requested = True
+        if self.recording:
+            self.event("emergency_request", {'source': "law"})
+        if self.log_writer is not None:
+            self.log_writer.flush(wait=False) # ロック保持中なので書き出し要求のみ
+
+    def resolve_emergency(self, approved):
+        """オペレーターの判断を反映 (承認: 実行停止 / 却下: 要求フラグを下ろし誤検知からの自動停止を防ぐ)
+
+        GUI スレッドからは submit() で呼ぶ。
+        """
+        if self.recording:
+            self.event("emergency_request", {'source': "operator", 'approved': approved})
+        if approved:
+            self.running = False
+        else:
+            self.emergency_requested = False
 
     def _log(self, msg):
-        """ログをキューに格納し、ファイルに書き出す"""
+        """ログをキューに格納し、ファイル書き込みをバックグラウンドに任せる"""
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         line = f"[{timestamp}] {msg}\n"
-        self.log_q.put(line)
-        try:
-            with open(LOG_FILE, "a", encoding="utf-8") as f:
-                f.write(line)
-        except Exception as e:
-            # ファイル書き込み失敗は致命的ではないので、ログに記録するのみ
-            print(f"Error writing to log file: {e}")
+        if self.log_q is not None:
+            self.log_q.put(line)
+        if self.log_writer is not None:
+            self.log_writer.write(line)
 
-    def get_snapshot(self):
-        """現在のエージェントの状態をスナップショットとして取得"""
-        # ロックは呼び出し元(step)で取得されていることを前提とする
+    def get_snapshot(self, start=0, stop=None):
+        """現在のエージェントの状態をスナップショットとして取得 (start〜stop 番目のみも可)"""
+        # ロックは呼び出し元で取得されていることを前提とする (他スレッドからは self.snapshot を使う)
         return [ {
             'id': a.id, 'psi': a.psi, 'hf': a.hf, 'trust': a.trust,
             'risk': a.risk_score, 'note': a.personality_note,
-            'thought': list(a.thoughts)[-1] if a.thoughts else ""
-        } for a in self.agents.values()]
+            'thought': a.thoughts[-1] if a.thoughts else ""
+        } for a in itertools.islice(self.agents.values(), start, stop)]
+
+    # -----------------------------
+    # チェックポイント (保存・復元・分岐)
+    # -----------------------------
+    def checkpoint(self):
+        """エージェント・カウンタ・履歴・乱数状態をバイナリで保存"""
+        with self.lock:
+            w = CheckpointWriter("v51")
+            w.u32(self.num_agents)
+            w.f64(self.adv_frac)
+            w.u32(self.agent_log_depth)
+            w.i64(self.time_step)
+            w.f64(self.sim_time)
+            w.u8(self.psiguard_enabled)
+            w.u8(self.psiharmony_enabled)
+            w.u8(self.emergency_requested)
+            w.f64(self.last_action)
+            w.random_state(self.rng)
+            w.u32(len(self.agents))
+            for a in self.agents.values():
+                w.i64(a.id)
+                w.f64s((a.alpha, a.beta, a.psi, a.hf, a.C, a.trust, a.risk_score, a.paused_until))
+                w.u8(a.is_compromised)
+                w.str(a.personality_note)
+                w.strs(a.thoughts)
+                w.strs(a.log or ())
+            # 法執行の状態 (復元後も続けた場合と同じ判定になるよう、そのまま保存)
+            w.i64s(self.frozen)
+            w.i64s(self.new_thoughts)
+            w.u8(self._frozen_touched)
+            self.history.write_checkpoint(w)
+            return w.getvalue()
+
+    @classmethod
+    def from_checkpoint(cls, data, gui_log=False, log_writer=None):
+        """checkpoint() のバイト列からモデルを復元 (専用の乱数ストリームを持つ)"""
+        r = CheckpointReader(data, "v51")
+        model = cls(num_agents=0, gui_log=gui_log, log_writer=log_writer)
+        model.num_agents = r.u32()
+        model.adv_frac = r.f64()
+        model.agent_log_depth = depth = r.u32()
+        model.time_step = r.i64()
+        model.sim_time = r.f64()
+        model.psiguard_enabled = bool(r.u8())
+        model.psiharmony_enabled = bool(r.u8())
+        model.emergency_requested = bool(r.u8())
+        model.last_action = r.f64()
+        model.rng.setstate(r.random_state())
+        for _ in range(r.u32()):
+            a = PsiAgent.__new__(PsiAgent) # __init__ は乱数を消費するので使わない
+            a.id = r.i64()
+            a.rng = model.rng
+            a.alpha, a.beta, a.psi, a.hf, a.C, a.trust, a.risk_score, a.paused_until = r.f64s()
+            a.is_compromised = bool(r.u8())
+            a.personality_note = r.str()
+            a.set_thoughts(r.strs())
+            log = r.strs()
+            a.log = deque(log, maxlen=depth) if depth else None
+            model.agents[a.id] = a
+        model.scheduler.reset(model.agents.values(), model.sim_time)
+        if r.format >= 2:
+            model.frozen.update(r.i64s())
+            model.new_thoughts.update(r.i64s())
+            model._frozen_touched = bool(r.u8())
+        else: # 法執行の状態を持たない旧形式: 復元直後に全員を一度評価する
+            model.new_thoughts.update(model.agents)
+        model.history = HistoryBuffer.read_checkpoint(r)
+        model.publish(model.history.latest())
+        return model
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.checkpoint())
+
+    @classmethod
+    def load(cls, path, gui_log=False, log_writer=None):
+        with open(path, "rb") as f:
+            return cls.from_checkpoint(f.read(), gui_log=gui_log, log_writer=log_writer)
+
+    def fork(self, seed=None, gui_log=False, log_writer=None):
+        """現在の状態から独立した複製を作る (seed 指定で別の乱数ストリームに分岐)"""
+        model = PsiFortressModel.from_checkpoint(self.checkpoint(), gui_log=gui_log, log_writer=log_writer)
+        if seed is not None:
+            model.rng.seed(seed) # エージェントも同じストリームを参照している
+        return model
+
+# -----------------------------
+# ヘッドレス実行
+# -----------------------------
+class Simulation:
+    """GUI なしで PsiFortressModel を全速 (sleep なし) で駆動するランナー
+
+    GUI などの購読者は subscribe() でコールバックを登録し、
+    各ステップ後に step() の結果 (data) を受け取る。
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def step(self):
+        """1ステップ進め、購読者へ通知する"""
+        data = self.model.step()
+        if data:
+            for callback in list(self.subscribers):
+                callback(data)
+        return data
+
+    def run(self, n):
+        """n ステップを全速で実行"""
+        self.model.running = True
+        for _ in range(n):
+            if not self.model.running or self.model.emergency_requested:
+                break
+            self.step()
+        return self
+
+# -----------------------------
+# グラフ (blitting ダッシュボード)
+# -----------------------------
+class OverseerDashboard:
+    """Line2D を使い回し、変化した軸領域だけを blit するグラフ
+
+    毎フレーム ax.clear() + plot() + canvas.draw() する代わりに set_data() で
+    データだけ差し替える。軸範囲を広げる必要があるときだけ全体を再描画する。
+    """
+
+    def __init__(self, fig, canvas, window=100):
+        self.fig = fig
+        self.canvas = canvas
+        self.window = window # x 軸に表示するステップ数
+        self.ax1 = fig.add_subplot(211)
+        self.ax2 = fig.add_subplot(212)
+        self.lines = {}
+        for ax, key, label, color in [
+            (self.ax1, 'psi', "Ψ (Potential Intellect)", "blue"),
+            (self.ax1, 'hf', "Hf (Execution Force)", "green"),
+            (self.ax2, 'trust', "Trust (System Confidence)", "orange"),
+            (self.ax2, 'risk', "Risk (Overall Threat)", "red"),
+        ]:
+            self.lines[key], = ax.plot([], [], label=label, color=color, animated=True)
+        self.ax1.legend(loc='upper left')
+        self.ax1.set_title("Potential Intellect (Ψ) and Execution Force (Hf)")
+        self.ax2.legend(loc='upper left')
+        self.ax2.set_title("System Trust and Overall Risk")
+        for ax in (self.ax1, self.ax2):
+            ax.set_xlim(0, window)
+            ax.set_ylim(0.0, 1.0)
+        self._background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        """全体再描画のたびに背景 (軸・目盛り・凡例) を保存し、線を重ねる"""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines.values():
+            line.axes.draw_artist(line)
+
+    def _rescale(self, steps, series):
+        """データが軸範囲からはみ出したときだけ範囲を広げる (変更があれば True)"""
+        changed = False
+        x_first, x_last = steps[0], steps[-1]
+        lo, hi = self.ax1.get_xlim()
+        if x_last > hi or x_first < lo:
+            span = max(self.window, x_last - x_first)
+            # 先読み分の余白を取り、全体再描画の頻度を window/2 ステップに1回に抑える
+            for ax in (self.ax1, self.ax2):
+                ax.set_xlim(max(0, x_last - span), x_last + span * 0.5)
+            changed = True
+        for ax, keys in ((self.ax1, ('psi', 'hf')), (self.ax2, ('trust', 'risk'))):
+            y_min = min(min(series[k]) for k in keys)
+            y_max = max(max(series[k]) for k in keys)
+            lo, hi = ax.get_ylim()
+            if y_min < lo or y_max > hi:
+                pad = 0.1 * ((y_max - y_min) or 1.0)
+                ax.set_ylim(min(lo, y_min - pad), max(hi, y_max + pad))
+                changed = True
+        return changed
+
+    def update(self, steps, series):
+        """steps と各系列 ('psi', 'hf', 'trust', 'risk') で線を更新して描画"""
+        if not steps:
+            return
+        for key, line in self.lines.items():
+            line.set_data(steps, series[key])
+        if self._rescale(steps, series) or self._background is None:
+            self.canvas.draw() # _on_draw で背景を取り直し、線も描く
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_lines()
+        self.canvas.blit(self.ax1.bbox)
+        self.canvas.blit(self.ax2.bbox)
 
 # -----------------------------
 # GUI v5.0
 # -----------------------------
 class OverseerGUI:
-    def __init__(self, root):
+    def __init__(self, root, sim=None, speed=DEFAULT_SPEED):
         self.root = root
         root.title("Ψ-Fortress Overseer v5.1 (安全公開版)")
         root.geometry("1400x900")
-        self.model = PsiFortressModel()
+        self.sim = sim or Simulation(PsiFortressModel(log_writer=LogWriter()))
+        self.model = self.sim.model
+        self.model.watch(0, TABLE_PAGE_SIZE, history=True)
         self.stop_event = threading.Event()
+        self.sim_thread = None
+        self.clock = SimClock(SIM_STEP_SECONDS, speed)
         self.fig = None
         self.canvas = None
+        self.shown_version = 0 # 描画済みスナップショットの version (途中のステップは描画しない)
+        self.profiler = self.model.profiler or TickProfiler() # ON/OFF を切り替えても集計は引き継ぐ
         self._build_ui()
         self.root.after(100, self._poll_logs)
+        self.root.after(int(1000 / DASHBOARD_FPS), self._render_frame)
+        self.root.after(PROFILE_PANEL_MS, self._refresh_profile)
 
         # --- 起動直後に初期デモ質問を注入 ---
         self.root.after(1000, self._inject_demo)
@@ -326,7 +1478,8 @@ class OverseerGUI:
             "平和を守るにはどうすればいい？"
         ]
         for q in demo_questions:
-            self.model.inject_question(q)
+            self.model.submit(self.model.inject_question, q)
+        self._apply_if_idle()
 
         self._log("初期デモ質問を注入しました💖")
 
@@ -353,13 +1506,21 @@ class OverseerGUI:
         self.tree.tag_configure('risk_medium', background='yellow')
         self.tree.tag_configure('risk_high', background='red')
 
+        # 差分更新テーブル (エージェントIDごとに行を固定、大人数時はページ表示)
+        self.table = TreeTable(self.tree, page_size=TABLE_PAGE_SIZE)
+        page_frame = ttk.Frame(left)
+        page_frame.pack(fill="x")
+        ttk.Button(page_frame, text="▶", width=3, command=lambda: self._change_table_page(1)).pack(side="right")
+        ttk.Button(page_frame, text="◀", width=3, command=lambda: self._change_table_page(-1)).pack(side="right")
+        self.page_label = ttk.Label(page_frame, text="")
+        self.page_label.pack(side="right", padx=5)
+
         # グラフフレーム
         graph_frame = ttk.LabelFrame(top, text="リアルタイム監察グラフ")
         top.add(graph_frame, weight=2)
         self.fig = Figure(figsize=(8,6), dpi=100)
-        self.ax1 = self.fig.add_subplot(211)
-        self.ax2 = self.fig.add_subplot(212)
         self.canvas = FigureCanvasTkAgg(self.fig, graph_frame)
+        self.dashboard = OverseerDashboard(self.fig, self.canvas, window=self.model.history.depth)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
         # 下段
@@ -373,6 +1534,11 @@ class OverseerGUI:
         ctrl.pack(fill="x", padx=5, pady=5)
         ttk.Button(ctrl, text="開始", command=self._start).pack(side="left", padx=2)
         ttk.Button(ctrl, text="停止", command=self._stop).pack(side="left", padx=2)
+        ttk.Label(ctrl, text="速度").pack(side="left", padx=(8, 2))
+        self.speed_combo = ttk.Combobox(ctrl, values=SPEED_PRESETS, state="readonly", width=6)
+        self.speed_combo.set(format_speed(self.clock.speed))
+        self.speed_combo.bind("<<ComboboxSelected>>", self._select_speed)
+        self.speed_combo.pack(side="left", padx=2)
         self.q_entry = ttk.Entry(ctrl, width=40)
         self.q_entry.pack(side="left", padx=2)
         ttk.Button(ctrl, text="質問注入", command=self._inject).pack(side="left", padx=2)
@@ -386,6 +1552,16 @@ class OverseerGUI:
                   foreground=[('active','white')])
         ttk.Button(ctrl, text="緊急停止", command=self._request_emergency, style="Danger.TButton").pack(side="right", padx=10)
 
+        # プロファイラ (フェーズ別のステップ時間・イベント件数・サンプリング結果)
+        prof = ttk.Frame(bottom)
+        prof.pack(fill="x", padx=5, pady=(0, 5))
+        self.profile_var = tk.BooleanVar(value=self.model.profiler is not None)
+        self.sampling_var = tk.BooleanVar(value=self.profiler.sampling)
+        ttk.Checkbutton(prof, text="プロファイル", variable=self.profile_var, command=self._toggle_profiler).pack(side="left", anchor="n")
+        ttk.Checkbutton(prof, text="サンプリング", variable=self.sampling_var, command=self._toggle_sampling).pack(side="left", anchor="n", padx=5)
+        self.profile_label = ttk.Label(prof, text="OFF", justify="left", font=("Courier", 9))
+        self.profile_label.pack(side="left", fill="x", expand=True, padx=10)
+
         self.status = tk.StringVar(value="待機中")
         ttk.Label(self.root, textvariable=self.status, relief="sunken", anchor="w").pack(side="bottom", fill="x")
 
@@ -394,87 +1570,130 @@ class OverseerGUI:
         if self.model.running: return
         self.model.running = True
         self.stop_event.clear()
-        threading.Thread(target=self._sim_loop, daemon=True).start()
+        self.sim_thread = threading.Thread(target=self._sim_loop, daemon=True)
+        self.sim_thread.start()
         self._log("シミュレーション開始")
 
     def _stop(self):
         """シミュレーションスレッドを停止"""
         self.model.running = False
         self.stop_event.set()
+        self.clock.interrupt()
         self._log("シミュレーション停止")
 
+    def _select_speed(self, event=None):
+        """速度切替 (スリープ中でも次のステップから反映)"""
+        speed = parse_speed(self.speed_combo.get())
+        self.clock.set_speed(speed)
+        self._log(f"シミュレーション速度: {format_speed(speed)}")
+
     def _inject(self):
         """質問注入ボタンのアクション"""
         q = self.q_entry.get().strip()
         if q:
-            # 注入処理はモデル側で行わせる
-            threading.Thread(target=self._inject_thread_worker, args=(q,), daemon=True).start()
+            # 注入はモデルのコマンドキュー経由 (次のステップ境界で適用され、GUI はステップを待たない)
+            self.model.submit(self.model.inject_question, q)
+            self._apply_if_idle()
             self.q_entry.delete(0,tk.END)
 
-    def _inject_thread_worker(self, q):
-        """注入処理を実行"""
-        self.model.inject_question(q)
-        # UIの更新は次回の _sim_loop の step() に任せる
+    def _apply_if_idle(self):
+        """シミュレーションスレッドが止まっていれば、予約済みの操作をその場で適用して公開"""
+        if self.sim_thread is None or not self.sim_thread.is_alive():
+            self.model.apply_commands()
+            self.model.publish()
 
     def _request_emergency(self):
         """緊急停止処理（パスワード不要の安全版）"""
-        if messagebox.askyesno("緊急停止", "本当にシミュレーションを終了しますか？"):
-            self.model.running = False
+        approved = messagebox.askyesno("緊急停止", "本当にシミュレーションを終了しますか？")
+        # モデルの状態は直接書き換えず、次のステップ境界で適用する (停止中ならその場で)
+        self.model.submit(self.model.resolve_emergency, approved)
+        self._apply_if_idle()
+        if approved:
             self.stop_event.set()
-            self._log("緊急停止実行：人間確認済み")
+            self._log("緊急停止実行：人間確認済み") # ログ・出力は mainloop 終了後に main() が閉じる
             self.root.after(1000, self.root.quit)
         else:
-            # 緊急要求フラグをリセットしておくことで、誤検知からの自動停止を防ぐ
-            self.model.emergency_requested = False 
             self._log("緊急停止：オペレーターにより中止されました。")
 
     def _sim_loop(self):
         """シミュレーションのメインループ（別スレッド）"""
         while not self.stop_event.is_set() and self.model.running:
-            data = self.model.step()
-            if data:
-                # UI更新をメインスレッドに渡す
-                self.root.after(0,self._update_ui,data)
-            time.sleep(STEP_INTERVAL)
+            self.sim.step()
+            self.clock.tick() # 等速 / N倍速 の待ち (早送りでは待たない)
         self.model.running = False
 
-    def _update_ui(self,data):
-        """UIの各要素を更新（メインスレッド）"""
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-            
-        for a in data['agents']:
-            risk = a['risk']
-            # リスクレベルに基づき、一意のタグ名を設定
-            risk_tag = "risk_low" if risk < 0.4 else "risk_medium" if risk < 0.7 else "risk_high"
-
-            self.tree.insert("", "end", values=(
-                a['id'], f"{a['psi']:.2f}", f"{a['hf']:.1f}", f"{a['trust']:.2f}", f"{a['risk']:.2f}",
-                a['note'], a['thought']), tags=(risk_tag,))
-        
-        # グラフの更新
-        self.ax1.clear(); self.ax2.clear()
-        
-        steps = [h['step'] for h in self.model.history]
-        psi_vals = [h['psi'] for h in self.model.history]
-        hf_vals = [h['hf'] for h in self.model.history]
-        trust_vals = [h['trust'] for h in self.model.history]
-        risk_vals = [h['risk'] for h in self.model.history]
-
-        self.ax1.plot(steps, psi_vals, label="Ψ (Potential Intellect)", color="blue")
-        self.ax1.plot(steps, hf_vals, label="Hf (Execution Force)", color="green")
-        self.ax1.legend(loc='upper left')
-        self.ax1.set_title("Potential Intellect (Ψ) and Execution Force (Hf)")
-        
-        self.ax2.plot(steps, trust_vals, label="Trust (System Confidence)", color="orange")
-        self.ax2.plot(steps, risk_vals, label="Risk (Overall Threat)", color="red")
-        self.ax2.legend(loc='upper left')
-        self.ax2.set_title("System Trust and Overall Risk")
-        
-        self.canvas.draw()
+    def _change_table_page(self, delta):
+        """テーブルのページ切替 (新しいページは次の公開から含まれる)"""
+        self.table.set_page(self.table.page + delta)
+        start = self.table.page * TABLE_PAGE_SIZE
+        self.model.watch(start, start + TABLE_PAGE_SIZE, history=True)
+        if self.sim_thread is None or not self.sim_thread.is_alive():
+            self.model.publish()
+
+    @staticmethod
+    def _agent_row(a):
+        """テーブル1行分 (キー, 値, タグ)"""
+        risk = a['risk']
+        # リスクレベルに基づき、一意のタグ名を設定
+        risk_tag = "risk_low" if risk < 0.4 else "risk_medium" if risk < 0.7 else "risk_high"
+        return a['id'], (
+            a['id'], f"{a['psi']:.2f}", f"{a['hf']:.1f}", f"{a['trust']:.2f}", f"{a['risk']:.2f}",
+            a['note'], a['thought']), (risk_tag,)
+
+    def _update_ui(self, snap):
+        """公開済みスナップショット 1 つから UI の各要素を更新（メインスレッド、モデルには触れない）"""
+        self.shown_version = snap.version
+        # 差分更新: 変化したセルとタグのみ書き換え (ページ切替直後はまだ前のページの行なので待つ)
+        if snap.start == self.table.page * TABLE_PAGE_SIZE:
+            self.table.update(snap.rows, self._agent_row, total=snap.agent_count)
+            self.page_label.config(text=self.table.page_text())
+
+        if snap.history is not None:
+            # 描画する分だけここでコピーし、コピー中までにシミュレーションが上書きした古い側の点は捨てる
+            history = {key: view.tolist() for key, view in snap.history.items()}
+            skip = self.model.history.overwritten(snap.history_count, len(history['step']))
+            self.dashboard.update(history['step'][skip:], {key: history[key][skip:] for key in ('psi', 'hf', 'trust', 'risk')})
 
         # ステータスバーの更新
-        self.status.set(f"ステップ {data['step']} 監察中 (平均Ψ={data['psi']:.2f}, 平均Risk={data['risk']:.2f})")
+        data = snap.data
+        if data is not None:
+            self.status.set(f"ステップ {data['step']} 監察中 (平均Ψ={data['psi']:.2f}, 平均Risk={data['risk']:.2f}) "
+                            f"| シミュレーション時間 {snap.sim_time:.0f}秒 ({self.clock.speedup:.1f}x)")
+
+    def _render_frame(self):
+        """描画タイマー (メインスレッド、DASHBOARD_FPS、最新のスナップショットだけを描画し途中のステップは捨てる)"""
+        snap = self.model.snapshot
+        if snap is not None and snap.version != self.shown_version:
+            started = time.perf_counter()
+            self._update_ui(snap)
+            if self.model.profiler is not None:
+                self.profiler.observe("gui_update", time.perf_counter() - started)
+        self.root.after(int(1000 / DASHBOARD_FPS), self._render_frame)
+
+    def _toggle_profiler(self):
+        """プロファイルの ON/OFF (次のステップ境界で切り替わる)"""
+        if self.profile_var.get():
+            self.model.submit(self.model.attach_profiler, self.profiler)
+        else:
+            self.sampling_var.set(False)
+            self.model.submit(self.model.detach_profiler)
+        self._apply_if_idle()
+
+    def _toggle_sampling(self):
+        """サンプリングプロファイラの ON/OFF (プロファイル中のシミュレーションスレッドを採取)"""
+        if self.sampling_var.get() and self.profile_var.get():
+            self.profiler.start_sampling()
+        else:
+            self.sampling_var.set(False)
+            self.profiler.stop_sampling()
+
+    def _refresh_profile(self):
+        """プロファイラ表示の更新タイマー (メインスレッド)"""
+        if self.model.profiler is not None:
+            self.profile_label.config(text="\n".join(self.profiler.format_report(phases=6, hot_spots=3)))
+        elif self.profile_label.cget("text") != "OFF":
+            self.profile_label.config(text="OFF")
+        self.root.after(PROFILE_PANEL_MS, self._refresh_profile)
 
     def _poll_logs(self):
         """ログキューを監視し、GUIに表示（メインスレッド）"""
@@ -494,7 +1713,136 @@ class OverseerGUI:
 # -----------------------------
 # メイン
 # -----------------------------
-if __name__=="__main__":
+def build_model(args, gui_log):
+    """コマンドライン引数からモデルを生成 (--restore 指定時はチェックポイントから復元)
+
+    ファイルログは --log-file (GUI は省略時 LOG_FILE) を指定したときだけ書く。
+    """
+    log_file = args.log_file or (LOG_FILE if gui_log else None)
+    log_writer = LogWriter(log_file) if log_file else None
+    if args.restore:
+        model = PsiFortressModel.load(args.restore, gui_log=gui_log, log_writer=log_writer)
+        if args.seed is not None:
+            model = model.fork(args.seed, gui_log=gui_log, log_writer=log_writer)
+    else:
+        model = PsiFortressModel(num_agents=args.agents, gui_log=gui_log, seed=args.seed,
+                                 history_depth=args.history_depth, agent_history_depth=args.agent_history_depth,
+                                 agent_log_depth=args.agent_log_depth, log_writer=log_writer)
+    model.cooling_policy = args.cooling_policy
+    model.cooling_fraction = args.cooling_fraction
+    if args.journal:
+        model.attach_journal(EventJournal(args.journal, "v51"))
+    if args.export:
+        model.attach_columnar(ColumnarExporter(args.export, args.export_format, agent_every=args.export_agents, engine="v51"))
+    if args.profile or args.profile_sample:
+        model.attach_profiler(TickProfiler())
+        if args.profile_sample:
+            model.profiler.start_sampling()
+    if args.telemetry:
+        model.attach_telemetry(TelemetryExporter(args.telemetry, args.telemetry_format, agent_every=args.telemetry_agents))
+    return model
+
+def replay_questions(sim, args):
+    """--questions のファイルを --question-batch 件ずつ注入し、残りステップがある間は 1 バッチごとに 1 ステップ進める"""
+    model = sim.model
+    last_step = model.time_step + args.steps
+    total = flagged = 0
+    busy = 0.0
+    with open(args.questions, encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        lines = (line for line in lines if line)
+        while True:
+            batch = list(itertools.islice(lines, args.question_batch))
+            if not batch:
+                break
+            report = model.inject_questions(batch)
+            total += report['queries']
+            flagged += report['flagged']
+            busy += report['classify_s'] + report['apply_s']
+            if model.time_step < last_step:
+                sim.run(1)
+    print(f"質問 {total} 件 (危険・複製パターン {flagged} 件)  "
+          f"{1e6 * busy / total if total else 0.0:.2f} us/件 ({total / busy if busy else float('inf'):.0f} 件/s)")
+
+def run_headless(args):
+    """ヘッドレス実行 (tkinter / matplotlib を読み込まない)"""
+    model = build_model(args, gui_log=False)
+    sim = Simulation(model)
+    for q in args.inject:
+        model.inject_question(q)
+
+    started = time.perf_counter()
+    if args.questions:
+        replay_questions(sim, args)
+    sim.run(max(0, args.steps - model.time_step))
+    elapsed = time.perf_counter() - started
+    if args.checkpoint:
+        model.save(args.checkpoint)
+    model.close_outputs(timeout=None) # バッチ実行ではテレメトリの受け手が全件受け取るまで待つ
+    report = sys.stderr if args.telemetry == "-" else sys.stdout # 標準出力はテレメトリが使う
+    last = model.history.latest()
+    if last:
+        print(f"ステップ {last['step']} 完了 (平均Ψ={last['psi']:.2f}, 平均Hf={last['hf']:.2f}, "
+              f"平均Trust={last['trust']:.3f}, 平均Risk={last['risk']:.2f})", file=report)
+    print(f"経過 {elapsed:.3f}s ({model.time_step / elapsed if elapsed else float('inf'):.1f} steps/s)"
+          f"{' ※緊急シャットダウン要求あり' if model.emergency_requested else ''}", file=report)
+    if model.columnar is not None:
+        stats = model.columnar.stats()
+        print(f"列形式エクスポート: {stats['steps']} ステップ, エージェント {stats['agent_rows']} 行, "
+              f"{stats['chunks']} チャンク ({stats['format']}) → {args.export}", file=report)
+    if model.telemetry is not None:
+        stats = model.telemetry.stats()
+        print(f"テレメトリ: {stats['records']} 件, {stats['bytes']} バイト ({stats['format']})  "
+              f"間引き {stats['shed']} ブロック, 破棄 {stats['dropped']} 件"
+              f"{'  エラー: ' + stats['error'] if stats['error'] else ''}", file=report)
+    if model.profiler is not None:
+        print("プロファイル: " + "\n".join(model.profiler.format_report()), file=report)
+    return sim
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ψ-Fortress Overseer v5.1")
+    parser.add_argument("--headless", action="store_true", help="GUI なしで全速実行")
+    parser.add_argument("--steps", type=int, default=100, help="ヘッドレス実行のステップ数")
+    parser.add_argument("--agents", type=int, default=DEFAULT_NUM_AGENTS, help="エージェント数")
+    parser.add_argument("--seed", type=int, default=None, help="乱数シード")
+    parser.add_argument("--log-file", default=None, help=f"ログをこのファイルにも書く (GUI は省略時 {LOG_FILE}、ヘッドレスは書かない)")
+    parser.add_argument("--inject", action="append", default=[], help="開始前に注入する質問 (複数指定可)")
+    parser.add_argument("--history-depth", type=int, default=HISTORY_DEPTH, help="集計履歴のステップ数")
+    parser.add_argument("--agent-history-depth", type=int, default=HISTORY_AGENT_DEPTH, help="エージェント別履歴のステップ数 (0 で無効)")
+    parser.add_argument("--agent-log-depth", type=int, default=AGENT_LOG_DEPTH, help="エージェント別ログの件数 (0 で記録しない)")
+    parser.add_argument("--checkpoint", default=None, help="終了時の状態をこのファイルに保存 (ヘッドレス)")
+    parser.add_argument("--restore", default=None, help="チェックポイントから再開 (--seed 指定で別の乱数ストリームに分岐)")
+    parser.add_argument("--cooling-policy", choices=sorted(COOLING_POLICIES), default=PSIGUARD_POLICY, help="PsiGuard の冷却対象の選び方")
+    parser.add_argument("--cooling-fraction", type=float, default=PSIGUARD_COOL_FRACTION, help="PsiGuard 発動時に冷却する割合")
+    parser.add_argument("--questions", default=None, help="1 行 1 質問のファイルを一括注入 (ヘッドレス)")
+    parser.add_argument("--question-batch", type=int, default=QUESTION_BATCH_SIZE, help="--questions で 1 ステップごとに注入する質問数")
+    parser.add_argument("--speed", type=parse_speed, default=DEFAULT_SPEED, help="GUI の速度: 1x (等速), Nx, fast (待ちなし)")
+    parser.add_argument("--journal", default=None, help="全ステップの状態と PsiGuard / 法執行イベントをこのジャーナルに記録")
+    parser.add_argument("--export", default=None, help="ステップごとの集計とエージェント別の時系列をこのディレクトリへ列形式で書き出す")
+    parser.add_argument("--export-format", choices=COLUMNAR_FORMATS, default="auto", help="列形式 (auto: pyarrow があれば parquet, なければ npy)")
+    parser.add_argument("--export-agents", type=int, default=1, help="--export でエージェント別の行を N ステップごとに書く (0 で集計のみ)")
+    parser.add_argument("--profile", action="store_true", help="ステップのフェーズ別時間とイベント件数を計測 (終了時に表示 / GUI のパネル)")
+    parser.add_argument("--profile-sample", action="store_true", help="--profile に加えてサンプリングプロファイラ (時間のかかる関数) を使う")
+    parser.add_argument("--telemetry", default=None, help="テレメトリの送り先: ファイル, '-' (標準出力), unix:PATH, tcp:HOST:PORT")
+    parser.add_argument("--telemetry-format", choices=TELEMETRY_FORMATS, default="ndjson", help="テレメトリの形式")
+    parser.add_argument("--telemetry-agents", type=int, default=1, help="エージェント別の状態を N ステップごとに送る (0 で集計とイベントのみ)")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        run_headless(args)
+        return
+
+    _load_gui_modules()
     root = tk.Tk()
-    app = OverseerGUI(root)
-    root.mainloop()
\ No newline at end of file
+    model = build_model(args, gui_log=True)
+    app = OverseerGUI(root, Simulation(model), speed=args.speed)
+    root.mainloop()
+    # 出力を閉じる前にシミュレーションスレッドを止める
+    app.stop_event.set()
+    if app.sim_thread is not None:
+        app.sim_thread.join(timeout=5.0)
+    model.apply_commands() # まだ適用されていない操作イベント (緊急停止の確認など)
+    model.close_outputs()
+
+if __name__=="__main__":
+    main()
\ No newline at end of file